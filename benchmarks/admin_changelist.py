@@ -0,0 +1,146 @@
+"""Measures the PoI admin changelist on a large table: queries and latency.
+
+Seeds a throwaway SQLite database with PoIs carrying a long description and
+a list of ratings, logs into the admin and requests the changelist plain,
+searched, filtered and paginated, in two modes:
+
+* ``full``: Django's stock changelist, loading whole rows and averaging the
+  ratings in Python, with the unfiltered count of ``show_full_result_count``
+  and the model ordering (``created_at``, then ``-pk`` added by Django);
+* ``lean``: ``LeanChangeList``, loading the displayed columns only with the
+  average computed by the database, in the ``(created_at, id)`` order of
+  ``poi_created_at_idx``.
+
+Reports the number of queries and the median latency of each request.
+
+Usage:
+    python -m benchmarks.admin_changelist --rows 1000000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from benchmarks.sqlite_import import _setup_django
+
+REQUESTS: dict[str, dict[str, str | int]] = {
+    "list": {},
+    "middle page": {},
+    "search": {"q": "PoI 4242"},
+    "filter": {"category__id__exact": 7},
+    "search+filter": {"q": "PoI 4242", "category__id__exact": 7},
+}
+URL = "/admin/point_of_interest/poi/"
+
+
+def _seed(rows: int, categories: int, batch_size: int = 20_000) -> None:
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from point_of_interest.models import POI, Category
+
+    Category.objects.bulk_create(
+        Category(name=f"category-{index}") for index in range(categories)
+    )
+    category_ids = list(Category.objects.values_list("pk", flat=True))
+    fields = sorted(
+        POI._meta.concrete_fields, key=lambda field: field.name == "category"
+    )
+    columns = ", ".join(f'"{field.column}"' for field in fields)
+    sql = (
+        f'INSERT INTO "{POI._meta.db_table}" ({columns})'
+        f" VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    rng = random.Random(0)
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        for offset in range(0, rows, batch_size):
+            params = []
+            for index in range(offset, min(rows, offset + batch_size)):
+                values = {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "external_id": f"E{index}",
+                    "name": f"PoI {index}",
+                    "latitude": rng.uniform(-90, 90),
+                    "longitude": rng.uniform(-180, 180),
+                    "category": rng.choice(category_ids),
+                    "ratings": [
+                        round(rng.uniform(0, 5), 2) for _ in range(rng.randint(0, 40))
+                    ],
+                    "description": "Lorem ipsum dolor sit amet. " * 20,
+                    "created_at": now + timedelta(milliseconds=index),
+                    "updated_at": now,
+                }
+                params.append(
+                    [
+                        field.get_db_prep_save(values[field.name], connection)
+                        for field in fields
+                    ]
+                )
+            with transaction.atomic():
+                cursor.executemany(sql, params)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        _setup_django(Path(tmp) / "admin.sqlite3")
+        from django.contrib.admin.views.main import ChangeList
+        from django.contrib.auth.models import User
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test import Client
+        from django.test.utils import CaptureQueriesContext
+
+        from point_of_interest.admin import PointOfInterestAdmin
+
+        call_command("migrate", verbosity=0)
+        start = time.perf_counter()
+        _seed(args.rows, args.categories)
+        print(f"{args.rows:,} PoIs seeded in {time.perf_counter() - start:.0f} s")
+        client = Client()
+        client.force_login(User.objects.create_superuser("bench", "", "bench"))
+
+        REQUESTS["middle page"]["p"] = max(
+            1, args.rows // PointOfInterestAdmin.list_per_page // 2
+        )
+        modes = {
+            "full": {
+                "get_changelist": lambda self, request, **kwargs: ChangeList,
+                "show_full_result_count": True,
+                "ordering": None,
+            },
+            "lean": {
+                name: getattr(PointOfInterestAdmin, name)
+                for name in ("get_changelist", "show_full_result_count", "ordering")
+            },
+        }
+        for mode, attributes in modes.items():
+            for name, value in attributes.items():
+                setattr(PointOfInterestAdmin, name, value)
+            for name, params in REQUESTS.items():
+                timings = []
+                for _ in range(args.repeat):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = client.get(URL, params)
+                        timings.append(time.perf_counter() - start)
+                    assert response.status_code == 200, response.status_code
+                print(
+                    f"{mode:>5} {name:>14}: {len(queries):2} queries"
+                    f" | median {statistics.median(timings) * 1000:8.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
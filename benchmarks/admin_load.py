@@ -0,0 +1,343 @@
+"""Load-tests the PoI and import history admins over HTTP, reporting JSON.
+
+Starts gunicorn (``core.wsgi``, as in Docker Compose) on the database of the
+DB_* variables, unless ``--url`` points to a server already running on it,
+and logs concurrent clients into the admin as a load-test superuser. Each
+client then requests, for ``--duration`` seconds, a weighted mix of:
+
+* ``changelist`` / ``deep page``: the PoI changelist, first and a late page;
+* ``search uuid`` / ``search external_id`` / ``search name``: the admin search
+  by internal id, numeric external id and words of a name;
+* ``category filter``: the changelist filtered by a category;
+* ``change view``: the change form of a PoI;
+* ``imports`` / ``imports filter`` / ``import change view``: the same for the
+  import history.
+
+The search terms, categories and records come from a sample of the database.
+Prints the p50/p95/p99 latency, throughput and error count, per scenario and
+overall, as JSON. Seed a large database first with ``seed_pois``.
+
+Usage:
+    DB_NAME=/tmp/load.sqlite3 python manage.py seed_pois 10000000 --imports 5000
+    DB_NAME=/tmp/load.sqlite3 python -m benchmarks.admin_load --clients 16 --workers 4
+    python -m benchmarks.admin_load --url http://localhost:8000 --duration 120
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+POI_URL = "/admin/point_of_interest/poi/"
+IMPORTS_URL = "/admin/point_of_interest/historicalimportdata/"
+USERNAME = "loadtest"
+# Scenario: relative weight in the default mix.
+WEIGHTS = {
+    "changelist": 4,
+    "deep page": 1,
+    "search uuid": 2,
+    "search external_id": 2,
+    "search name": 2,
+    "category filter": 3,
+    "change view": 3,
+    "imports": 1,
+    "imports filter": 1,
+    "import change view": 1,
+}
+
+
+def _setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("ALL_HOSTS", "*")
+    os.environ.setdefault("ALL_ORIGINS", "http://localhost")
+    import django
+
+    django.setup()
+
+
+def _prepare(password: str, size: int, seed: int) -> dict[str, Any]:
+    """Creates the load-test superuser and samples the request parameters."""
+    _setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connections
+
+    from point_of_interest.admin import PointOfInterestAdmin
+    from point_of_interest.models import POI, Category, HistoricalImportData
+
+    user = User.objects.filter(username=USERNAME).first() or User(
+        username=USERNAME, is_staff=True, is_superuser=True
+    )
+    user.set_password(password)
+    user.save()
+
+    rng = random.Random(seed)
+    count = POI.objects.count()
+    if not count:
+        raise SystemExit("No PoIs to load-test: run `manage.py seed_pois` first.")
+    # Seeded PoIs have the numeric external ids 1..count: a unique index lookup
+    # per id instead of an OFFSET scan.
+    numbers = [str(rng.randint(1, count)) for _ in range(size)]
+    pois = list(
+        POI.objects.filter(external_id__in=numbers).values_list(
+            "id", "external_id", "name"
+        )
+    ) or list(POI.objects.values_list("id", "external_id", "name")[:size])
+    sample = {
+        "pages": max(1, count // PointOfInterestAdmin.list_per_page),
+        "ids": [str(pk) for pk, _, _ in pois],
+        "external_ids": [external_id for _, external_id, _ in pois],
+        "names": [" ".join(name.split()[:2]) for _, _, name in pois],
+        "categories": list(Category.objects.values_list("pk", flat=True)[:1000]),
+        "imports": [
+            str(pk)
+            for pk in HistoricalImportData.objects.values_list("pk", flat=True)[:size]
+        ],
+    }
+    connections.close_all()
+    return sample
+
+
+def _request(scenario: str, sample: dict[str, Any], rng: random.Random) -> str | None:
+    """Returns the path of a request of the scenario, or None without data."""
+    match scenario:
+        case "changelist":
+            return POI_URL
+        case "deep page":
+            return f"{POI_URL}?p={rng.randint(sample['pages'] // 2, sample['pages'])}"
+        case "search uuid":
+            values, path = sample["ids"], POI_URL + "?q={}"
+        case "search external_id":
+            values, path = sample["external_ids"], POI_URL + "?q={}"
+        case "search name":
+            values, path = sample["names"], POI_URL + "?q={}"
+        case "category filter":
+            values, path = sample["categories"], POI_URL + "?category__id__exact={}"
+        case "change view":
+            values, path = sample["ids"], POI_URL + "{}/change/"
+        case "imports":
+            return IMPORTS_URL
+        case "imports filter":
+            return f"{IMPORTS_URL}?status__exact={rng.choice(['succeeded', 'failed'])}"
+        case "import change view":
+            values, path = sample["imports"], IMPORTS_URL + "{}/change/"
+    if not values:
+        return None
+    return path.format(urllib.parse.quote(str(rng.choice(values))))
+
+
+def _login(base_url: str, password: str) -> urllib.request.OpenerDirector:
+    """Returns an opener holding the session of the load-test user."""
+    cookies = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+    login_url = f"{base_url}/admin/login/"
+    page = opener.open(login_url, timeout=60).read().decode()
+    match = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page)
+    if match is None:
+        raise SystemExit(f"No CSRF token on {login_url}.")
+    token = match.group(1)
+    data = urllib.parse.urlencode(
+        {
+            "username": USERNAME,
+            "password": password,
+            "csrfmiddlewaretoken": token,
+            "next": "/admin/",
+        }
+    ).encode()
+    request = urllib.request.Request(login_url, data, headers={"Referer": login_url})
+    opener.open(request, timeout=60).read()
+    if not any(cookie.name == "sessionid" for cookie in cookies):
+        raise SystemExit(f"Could not log into {login_url} as {USERNAME}.")
+    return opener
+
+
+def _client(
+    base_url: str,
+    password: str,
+    sample: dict[str, Any],
+    scenarios: dict[str, int],
+    seed: int,
+    barrier: threading.Barrier,
+    timings: dict[str, list[float]],
+    errors: dict[str, int],
+    window: list[float],
+) -> None:
+    """Requests scenarios until the end of the window, recording its responses."""
+    rng = random.Random(seed)
+    opener = _login(base_url, password)
+    names, weights = list(scenarios), list(scenarios.values())
+    barrier.wait()
+    while time.perf_counter() < window[1]:
+        scenario = rng.choices(names, weights)[0]
+        path = _request(scenario, sample, rng)
+        if path is None:
+            continue
+        start = time.perf_counter()
+        try:
+            with opener.open(base_url + path, timeout=120) as response:
+                response.read()
+                # An expired session is redirected to the login page.
+                failed = response.status != 200 or "/login/" in response.url
+        except (urllib.error.URLError, OSError):
+            failed = True
+        end = time.perf_counter()
+        if start < window[0]:
+            continue
+        timings[scenario].append(end - start)
+        if failed:
+            errors[scenario] += 1
+
+
+def _summary(timings: list[float], errors: int, seconds: float) -> dict[str, Any]:
+    if len(timings) > 1:
+        cuts = statistics.quantiles(timings, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = timings[0] if timings else 0.0
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput_rps": round(len(timings) / seconds, 2),
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port: int = probe.getsockname()[1]
+        return port
+
+
+def _start_gunicorn(workers: int, threads: int) -> tuple[subprocess.Popen[bytes], str]:
+    """Starts gunicorn on a free port, returning it once it serves requests."""
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "core.wsgi:application",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+            "--threads",
+            str(threads),
+            "--timeout",
+            "300",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=dict(os.environ),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("gunicorn exited; is it installed (requirements/base)?")
+        try:
+            urllib.request.urlopen(f"{base_url}/admin/login/", timeout=5).read()
+            return server, base_url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("gunicorn did not start within 60 s.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="Base URL of a running server on the same database."
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=(os.cpu_count() or 1) * 2 + 1)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=WEIGHTS, default=list(WEIGHTS)
+    )
+    parser.add_argument("--sample", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the report here.")
+    args = parser.parse_args()
+
+    password = secrets.token_urlsafe(16)
+    sample = _prepare(password, args.sample, args.seed)
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        server, base_url = _start_gunicorn(args.workers, args.threads)
+    scenarios = {name: WEIGHTS[name] for name in args.scenarios}
+    timings: dict[str, list[float]] = {name: [] for name in scenarios}
+    errors = dict.fromkeys(scenarios, 0)
+    window = [0.0, 0.0]
+
+    def open_window() -> None:
+        start = time.perf_counter()
+        window[:] = [start + args.warmup, start + args.warmup + args.duration]
+
+    # The window opens once every client is logged in.
+    barrier = threading.Barrier(args.clients + 1, action=open_window)
+    clients = [
+        threading.Thread(
+            target=_client,
+            args=(base_url, password, sample, scenarios, args.seed + index),
+            kwargs={
+                "barrier": barrier,
+                "timings": timings,
+                "errors": errors,
+                "window": window,
+            },
+        )
+        for index in range(args.clients)
+    ]
+    try:
+        for client in clients:
+            client.start()
+        barrier.wait()
+        for client in clients:
+            client.join()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    everything = [timing for values in timings.values() for timing in values]
+    report = {
+        "server": base_url if args.url else f"gunicorn x{args.workers}",
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "pois_sampled": len(sample["ids"]),
+        "total": _summary(everything, sum(errors.values()), args.duration),
+        "scenarios": {
+            name: _summary(timings[name], errors[name], args.duration)
+            for name in scenarios
+        },
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
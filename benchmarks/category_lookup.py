@@ -0,0 +1,161 @@
+"""Compares the PoI table with inline category strings against the lookup table.
+
+Builds both layouts in throwaway SQLite databases with the same synthetic rows
+and reports table/index sizes and the time of a category filter.
+
+Usage:
+    python -m benchmarks.category_lookup --rows 1000000 --categories 300
+"""
+
+import argparse
+import random
+import sqlite3
+import string
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+INLINE_SCHEMA = """
+CREATE TABLE point_of_interest (
+    id CHAR(32) PRIMARY KEY,
+    external_id VARCHAR(128) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    category VARCHAR(64) NOT NULL
+);
+CREATE INDEX poi_category_db_index ON point_of_interest (category);
+CREATE INDEX poi_category_meta_index ON point_of_interest (category);
+"""
+
+LOOKUP_SCHEMA = """
+CREATE TABLE poi_category (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(64) NOT NULL UNIQUE
+);
+CREATE TABLE point_of_interest (
+    id CHAR(32) PRIMARY KEY,
+    external_id VARCHAR(128) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES poi_category (id)
+);
+CREATE INDEX poi_category_id ON point_of_interest (category_id);
+"""
+
+
+def _category_names(count: int) -> list[str]:
+    rng = random.Random(0)
+    return [
+        "-".join("".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(2))
+        for _ in range(count)
+    ]
+
+
+def _rows(
+    count: int, categories: list[str]
+) -> Iterator[tuple[str, str, str, float, float, str]]:
+    rng = random.Random(1)
+    for i in range(count):
+        yield (
+            uuid.UUID(int=rng.getrandbits(128)).hex,
+            str(i),
+            f"PoI {i}",
+            rng.uniform(-90, 90),
+            rng.uniform(-180, 180),
+            rng.choice(categories),
+        )
+
+
+def _sizes(conn: sqlite3.Connection) -> dict[str, int]:
+    return dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+
+
+def _time_filter(conn: sqlite3.Connection, sql: str, param: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, [param]).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_inline(path: Path, rows: int, categories: list[str]) -> sqlite3.Connection:
+    """Builds the layout with a category string on every row."""
+    conn = sqlite3.connect(path)
+    conn.executescript(INLINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO point_of_interest VALUES (?, ?, ?, ?, ?, ?)",
+        _rows(rows, categories),
+    )
+    conn.commit()
+    return conn
+
+
+def build_lookup(path: Path, rows: int, categories: list[str]) -> sqlite3.Connection:
+    """Builds the layout with an integer key into the category table."""
+    conn = sqlite3.connect(path)
+    conn.executescript(LOOKUP_SCHEMA)
+    conn.executemany(
+        "INSERT INTO poi_category (name) VALUES (?)", [(c,) for c in categories]
+    )
+    ids = dict(conn.execute("SELECT name, id FROM poi_category"))
+    conn.executemany(
+        "INSERT INTO point_of_interest VALUES (?, ?, ?, ?, ?, ?)",
+        (row[:5] + (ids[row[5]],) for row in _rows(rows, categories)),
+    )
+    conn.commit()
+    return conn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    categories = _category_names(args.categories)
+    target = categories[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        inline = build_inline(Path(tmp) / "inline.sqlite3", args.rows, categories)
+        lookup = build_lookup(Path(tmp) / "lookup.sqlite3", args.rows, categories)
+        queries = {
+            inline: "FROM point_of_interest p WHERE p.category = ?",
+            lookup: "FROM point_of_interest p JOIN poi_category c "
+            "ON c.id = p.category_id WHERE c.name = ?",
+        }
+        results = {
+            layout: (
+                _sizes(conn),
+                _time_filter(
+                    conn, f"SELECT p.id, p.name {queries[conn]}", target, args.repeat
+                ),
+                _time_filter(
+                    conn, f"SELECT COUNT(*) {queries[conn]}", target, args.repeat
+                ),
+            )
+            for layout, conn in (("inline", inline), ("lookup", lookup))
+        }
+        inline.close()
+        lookup.close()
+
+    print(f"{args.rows:,} rows, {args.categories} categories")
+    for layout, (sizes, fetch, count) in results.items():
+        table = sizes.get("point_of_interest", 0)
+        indexes = sum(
+            size for name, size in sizes.items() if name.startswith("poi_category_")
+        )
+        lookup_table = sizes.get("poi_category", 0)
+        print(
+            f"{layout:>7}: table {table / 2**20:8.1f} MiB | category indexes "
+            f"{indexes / 2**20:6.1f} MiB | lookup table {lookup_table / 2**10:6.1f} KiB"
+            f" | filter {fetch * 1000:6.2f} ms | count {count * 1000:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
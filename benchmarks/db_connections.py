@@ -0,0 +1,172 @@
+"""Measures admin latency and throughput with per-request vs reused connections.
+
+Runs every mode in a fresh process configured only through the DB_* variables
+of ``core.settings``; concurrent clients (threads, one connection each, like
+gunicorn threads) log into the admin and fetch the PoI changelist (or --url).
+
+* ``per-request``: DB_CONN_MAX_AGE=0, a new connection for every request;
+* ``persistent``: DB_CONN_MAX_AGE=60 with health checks;
+* ``pool``: DB_POOL=1, psycopg connection pool (Postgres only).
+
+SQLite is used unless DB_ENGINE and the other DB_* variables point to
+Postgres, in which case the three modes run against that database.
+
+Usage:
+    python -m benchmarks.db_connections --clients 8 --requests 200
+    python -m benchmarks.db_connections --url /api/pois/   # lighter requests
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+MODES = {
+    "per-request": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "0"},
+    "persistent": {"DB_CONN_MAX_AGE": "60", "DB_POOL": "0"},
+    "pool": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "1"},
+}
+ADMIN_URL = "/admin/point_of_interest/poi/"
+
+
+def _setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("ALL_HOSTS", "*")
+    os.environ.setdefault("ALL_ORIGINS", "http://localhost")
+    import django
+
+    django.setup()
+
+
+def _prepare(rows: int) -> None:
+    """Migrates the database and seeds an admin user and some PoIs."""
+    _setup_django()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    from point_of_interest.models import POI, Category
+
+    call_command("migrate", verbosity=0)
+    User.objects.filter(username="bench").delete()
+    User.objects.create_superuser("bench", "bench@example.com", "bench")
+    if not POI.objects.exists():
+        category = Category.objects.get_or_create(name="bench")[0]
+        POI.objects.bulk_create(
+            POI(
+                external_id=f"B{i}",
+                name=f"PoI {i}",
+                latitude=0,
+                longitude=0,
+                category=category,
+                ratings=[4],
+            )
+            for i in range(rows)
+        )
+
+
+def _client_loop(
+    url: str, requests: int, timings: list[float], barrier: threading.Barrier
+) -> None:
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from django.test import Client
+
+    client = Client()
+    client.force_login(User.objects.get(username="bench"))
+    connections.close_all()
+    barrier.wait()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    connections.close_all()
+
+
+def _run_mode(url: str, clients: int, requests: int) -> dict[str, float]:
+    """Runs the load in this process and returns its latency summary."""
+    _setup_django()
+    timings: list[float] = []
+    barrier = threading.Barrier(clients + 1)
+    threads = [
+        threading.Thread(target=_client_loop, args=(url, requests, timings, barrier))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return {
+        "median": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95) - 1],
+        "throughput": len(timings) / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--url", default=ADMIN_URL)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.url, args.clients, args.requests)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("DB_NAME", str(Path(tmp) / "connections.sqlite3"))
+        env.setdefault("ALL_HOSTS", "*")
+        env.setdefault("ALL_ORIGINS", "http://localhost")
+        # Every request must reach the database.
+        env["CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+        os.environ.update(env)
+        _prepare(args.rows)
+        postgres = env.get("DB_ENGINE", "").endswith("postgresql")
+
+        print(f"{args.clients} clients x {args.requests} requests to {args.url}")
+        for mode, variables in MODES.items():
+            if mode == "pool" and not postgres:
+                continue
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.db_connections",
+                    "--mode",
+                    mode,
+                    "--clients",
+                    str(args.clients),
+                    "--requests",
+                    str(args.requests),
+                    "--url",
+                    args.url,
+                ],
+                env={**env, **variables},
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:>11}: median {result['median'] * 1000:7.2f} ms"
+                f" | p95 {result['p95'] * 1000:7.2f} ms"
+                f" | {result['throughput']:7.1f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
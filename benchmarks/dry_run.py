@@ -0,0 +1,71 @@
+"""Compares --dry-run validation with parsing alone and with a real import.
+
+Generates a synthetic CSV file and reports, for each mode, the time and the
+throughput:
+
+* ``parse``: reading the file with the CSV reader alone (the lower bound);
+* ``dry-run xN``: ``FeedValidator`` with N worker processes;
+* ``import``: ``ImportBuilder`` into a throwaway SQLite database.
+
+Usage:
+    python -m benchmarks.dry_run --rows 1000000 --workers 1 4
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable
+
+from benchmarks.sqlite_import import _setup_django, _use_database, _write_csv
+
+
+def _parse(csv_path: Path) -> None:
+    from pyarrow import csv as pa_csv
+
+    pa_csv.read_csv(csv_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1]
+    )
+    parser.add_argument("--skip-import", action="store_true")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "pois.csv"
+        _write_csv(csv_path, args.rows, categories=300)
+        _setup_django(tmp / "setup.sqlite3")
+
+        from point_of_interest.services import ImportBuilder
+        from point_of_interest.validation import FeedValidator
+
+        modes: list[tuple[str, Callable[[], object]]] = [
+            ("parse", lambda: _parse(csv_path))
+        ]
+        for workers in dict.fromkeys(args.workers):
+            validator = FeedValidator([csv_path], workers=workers)
+            modes.append((f"dry-run x{workers}", validator.run))
+        if not args.skip_import:
+            _use_database(tmp / "import.sqlite3")
+            modes.append(("import", lambda: ImportBuilder([csv_path]).run()))
+
+        size = csv_path.stat().st_size / 2**20
+        print(f"{args.rows:,} rows, {size:.0f} MiB, {os.cpu_count()} CPUs")
+        for mode, run in modes:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{mode:>12}: {elapsed:7.2f} s | {args.rows / elapsed:11,.0f} rows/s"
+                f" | {size / elapsed:7.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measures the near-duplicate scan of ``find_duplicate_pois`` on synthetic PoIs.
+
+Generates PoIs spread over the world (or one city with ``--city``), a share of
+them copied a few metres away with a slightly different name, and runs
+``DuplicateFinder`` over the rows sorted by latitude, as the command streams
+them from the database. Reports the scan time, the throughput, the peak memory
+allocated by the scan and the share of the planted duplicates found.
+
+Usage:
+    python -m benchmarks.duplicates --rows 1000000 --duplicates 0.05
+    python -m benchmarks.duplicates --rows 1000000 --city
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from uuid import UUID, uuid4
+
+from benchmarks.sqlite_import import _setup_django
+
+WORDS = ["Central", "Station", "Museum", "Cafe", "Park", "Market", "Hotel", "Bakery"]
+# (pk, external_id, name, latitude, longitude), as read by find_duplicate_pois.
+Row = tuple[UUID, str, str, float, float]
+
+
+def _rows(
+    count: int, duplicates: float, seed: int, city: bool
+) -> tuple[list[Row], set[frozenset[UUID]]]:
+    rng = random.Random(seed)
+    # A 22 km x 22 km box, or the inhabited latitudes of the whole world.
+    latitudes, longitudes = (
+        ((48.8, 49.0), (2.2, 2.5)) if city else ((-60, 60), (-180, 180))
+    )
+    rows: list[Row] = []
+    planted: set[frozenset[UUID]] = set()
+    for index in range(count):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
+        latitude = rng.uniform(*latitudes)
+        longitude = rng.uniform(*longitudes)
+        rows.append((uuid4(), str(index), name, latitude, longitude))
+        if rng.random() < duplicates:
+            copy = (
+                uuid4(),
+                f"dup-{index}",
+                name.upper() + ".",
+                latitude + rng.uniform(-1e-4, 1e-4),
+                longitude + rng.uniform(-1e-4, 1e-4),
+            )
+            rows.append(copy)
+            planted.add(frozenset((rows[-2][0], copy[0])))
+    rows.sort(key=lambda row: row[3])
+    return rows, planted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--duplicates", type=float, default=0.05)
+    parser.add_argument("--radius", type=float, default=50.0)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--city", action="store_true", help="Pack the PoIs in one city-sized area."
+    )
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        _setup_django(Path(tmp) / "setup.sqlite3")
+        from point_of_interest.duplicates import DuplicateFinder
+
+        rows, planted = _rows(args.rows, args.duplicates, args.seed, args.city)
+        finder = DuplicateFinder(radius=args.radius, chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        found = {
+            frozenset((candidate.a[0], candidate.b[0]))
+            for candidate in finder.scan(iter(rows))
+        }
+        elapsed = time.perf_counter() - start
+        # Traced separately: tracemalloc slows the scan down several times.
+        tracemalloc.start()
+        for _ in finder.scan(iter(rows)):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{len(rows):,} PoIs: {elapsed:.2f} s | {len(rows) / elapsed:,.0f} PoIs/s"
+        f" | scan peak {peak / 2**20:.0f} MiB"
+        f" | {len(found):,} pairs, {len(found & planted) / len(planted):.1%}"
+        " of the planted duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
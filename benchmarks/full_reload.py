@@ -0,0 +1,86 @@
+"""Compares an in-place re-import with a full reload through a shadow table.
+
+Loads a synthetic file into a throwaway SQLite database, then imports a second
+version of it (every row changed) both in place and with ``full_reload``,
+reporting the total time, the duration of the swap (the table renames) and the
+size of the resulting PoI table.
+
+Usage:
+    python -m benchmarks.full_reload --rows 50000
+"""
+
+import argparse
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any
+
+from benchmarks.sqlite_import import _setup_django, _use_database, _write_csv
+
+
+def _table_size() -> int:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = 'point_of_interest' "
+            "OR name IN (SELECT name FROM sqlite_master "
+            "WHERE tbl_name = 'point_of_interest' AND type = 'index')"
+        )
+        return int(cursor.fetchone()[0])
+
+
+def _timed(module: ModuleType, name: str, timings: list[float]) -> None:
+    """Wraps a module function so each call records its duration."""
+    function = getattr(module, name)
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.append(time.perf_counter() - start)
+
+    setattr(module, name, wrapper)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        first, second = tmp / "first.csv", tmp / "second.csv"
+        _write_csv(first, args.rows, categories=300)
+        _write_csv(second, args.rows, categories=250)
+        _setup_django(tmp / "setup.sqlite3")
+
+        from point_of_interest import reload
+        from point_of_interest.services import ImportBuilder
+
+        renames: list[float] = []
+        _timed(reload, "_rename_tables", renames)
+
+        print(f"{args.rows:,} rows, every one changed by the second import")
+        for mode in ("in place", "full reload"):
+            _use_database(tmp / f"{mode.replace(' ', '_')}.sqlite3")
+            ImportBuilder([first], batch_size=args.batch_size).run()
+            start = time.perf_counter()
+            ImportBuilder(
+                [second], batch_size=args.batch_size, full_reload=mode != "in place"
+            ).run()
+            elapsed = time.perf_counter() - start
+            line = (
+                f"{mode:>11}: {elapsed:7.2f} s | table + indexes "
+                f"{_table_size() / 2**20:6.1f} MiB"
+            )
+            if renames:
+                line += f" | swap {renames[-1] * 1000:.2f} ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
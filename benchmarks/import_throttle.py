@@ -0,0 +1,116 @@
+"""Measures read latency on the database while an import writes to it.
+
+Imports a synthetic CSV file into a fresh SQLite database in a background
+thread while the main thread runs the first page of the PoI changelist query
+in a loop, on its own connection, as the admin would during a nightly load.
+Each mode uses a different write budget:
+
+* ``unthrottled``: no limit, one transaction per chunk;
+* ``rows/s``: ``--rows-per-second`` rows per second, one transaction per batch;
+* ``latency``: back-offs while a transaction takes over ``--max-commit-latency``.
+
+Reports the import throughput, the time it spent throttled and the median
+and 95th percentile latency of the reads.
+
+Usage:
+    python -m benchmarks.import_throttle --rows 100000 --rows-per-second 2000
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks.sqlite_import import _setup_django, _use_database, _write_csv
+
+if TYPE_CHECKING:
+    from point_of_interest.schemas import ImportStats
+    from point_of_interest.throttle import WriteThrottle
+
+
+def _read_loop(done: threading.Event, latencies: list[float]) -> None:
+    """Runs the changelist query until the import is done, on its own connection."""
+    from django.db import connections
+
+    from point_of_interest.models import POI
+
+    try:
+        while not done.is_set():
+            start = time.perf_counter()
+            list(
+                POI.objects.order_by("created_at", "id").values_list("id", "name")[:100]
+            )
+            POI.objects.filter(category__name="category-7").count()
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+    finally:
+        connections.close_all()
+
+
+def _run(
+    database: Path, csv_path: Path, batch_size: int, throttle: "WriteThrottle"
+) -> tuple[float, "ImportStats", list[float]]:
+    from django.db import connection
+
+    from point_of_interest.services import ImportBuilder
+
+    _use_database(database)
+    latencies: list[float] = []
+    done = threading.Event()
+    reader = threading.Thread(target=_read_loop, args=(done, latencies))
+    reader.start()
+    try:
+        start = time.perf_counter()
+        stats = ImportBuilder(
+            [csv_path], batch_size=batch_size, throttle=throttle
+        ).run()
+        elapsed = time.perf_counter() - start
+    finally:
+        done.set()
+        reader.join()
+    connection.close()
+    return elapsed, stats, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--rows-per-second", type=float, default=2_000)
+    parser.add_argument("--max-commit-latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "pois.csv"
+        _write_csv(csv_path, args.rows, args.categories)
+        _setup_django(tmp / "setup.sqlite3")
+        from point_of_interest.throttle import WriteThrottle
+
+        modes = {
+            "unthrottled": WriteThrottle(),
+            "rows/s": WriteThrottle(max_rows_per_second=args.rows_per_second),
+            "latency": WriteThrottle(max_commit_latency=args.max_commit_latency),
+        }
+        print(f"{args.rows:,} rows, batch size {args.batch_size:,}")
+        for index, (mode, throttle) in enumerate(modes.items()):
+            elapsed, stats, latencies = _run(
+                tmp / f"import-{index}.sqlite3", csv_path, args.batch_size, throttle
+            )
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+            print(
+                f"{mode:>11}: {args.rows / elapsed:8,.0f} rows/s"
+                f" | throttled {stats.throttled_seconds:5.1f} s"
+                f" ({stats.backoffs} back-offs)"
+                f" | reads: median {statistics.median(latencies or [0]) * 1000:6.1f} ms"
+                f", p95 {p95 * 1000:6.1f} ms ({len(latencies)} reads)"
+            )
+
+
+if __name__ == "__main__":
+    main()
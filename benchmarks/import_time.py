@@ -0,0 +1,118 @@
+"""Measures the startup import time and memory of the project entry points.
+
+Every scenario runs in a fresh interpreter started with ``python -X importtime``:
+
+* ``manage.py``: Django setup and the management command classes, as
+  ``manage.py import_poi_file`` / ``run_import_worker`` load them;
+* ``core.wsgi``: the WSGI application and the URL configuration, as a
+  gunicorn worker boots.
+
+It reports the total import time, the peak RSS and whether pandas, NumPy or
+pyarrow were imported. With ``--max-ms`` / ``--max-rss-mb`` it exits with an
+error when a scenario goes over the limit or loads one of those, so it can
+guard the startup cost in CI.
+
+Usage:
+    python -m benchmarks.import_time --repeat 5
+    python -m benchmarks.import_time --max-ms 400 --max-rss-mb 80
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+
+_SETUP = """
+import django
+django.setup()
+"""
+SCENARIOS = {
+    "manage.py": _SETUP
+    + """
+from django.core.management import get_commands, load_command_class
+for name in ("import_poi_file", "run_import_worker", "rollback_full_reload"):
+    load_command_class(get_commands()[name], name)
+""",
+    "core.wsgi": """
+import core.wsgi
+from django.urls import get_resolver
+get_resolver().url_patterns
+""",
+}
+_REPORT = """
+import json, resource, sys
+print(json.dumps({
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy": sorted(m for m in %r if m in sys.modules),
+}))
+""" % (
+    HEAVY_MODULES,
+)
+
+
+def _run(code: str) -> dict[str, Any]:
+    """Runs code in a fresh interpreter, returning its import time and peak RSS."""
+    root = Path(__file__).resolve().parent.parent
+    env = {
+        "DJANGO_SETTINGS_MODULE": "core.settings",
+        "ALL_HOSTS": "*",
+        "ALL_ORIGINS": "http://localhost",
+        **os.environ,
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + _REPORT],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only the top-level imports: the nested ones are in their cumulative.
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "ms": total / 1000,
+        "rss_mb": report["rss"] / 1024,
+        "heavy": report["heavy"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float)
+    parser.add_argument("--max-rss-mb", type=float)
+    args = parser.parse_args()
+
+    failed = False
+    for name, code in SCENARIOS.items():
+        runs = [_run(code) for _ in range(args.repeat)]
+        ms = statistics.median(run["ms"] for run in runs)
+        rss = statistics.median(run["rss_mb"] for run in runs)
+        heavy = runs[-1]["heavy"]
+        print(
+            f"{name:>10}: imports {ms:7.1f} ms | peak RSS {rss:6.1f} MiB"
+            f" | heavy modules: {', '.join(heavy) or 'none'}"
+        )
+        if args.max_ms is not None or args.max_rss_mb is not None:
+            failed |= bool(heavy)
+        failed |= args.max_ms is not None and ms > args.max_ms
+        failed |= args.max_rss_mb is not None and rss > args.max_rss_mb
+    if failed:
+        sys.exit("Startup budget exceeded.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Measures the latency of the map cluster endpoint at country scale.
+
+Seeds a throwaway SQLite database with PoIs spread over a country-sized box,
+builds the cluster aggregates and times viewport queries at every zoom level
+with the Django test client (response caching disabled).
+
+Usage:
+    python -m benchmarks.map_clusters --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Germany, roughly.
+COUNTRY_BBOX = (5.9, 47.3, 15.0, 55.1)
+
+
+def _setup_django(database: Path) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("ALL_HOSTS", "*")
+    os.environ.setdefault("ALL_ORIGINS", "http://localhost")
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = database
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+    django.setup()
+
+
+def _seed(rows: int, categories: int) -> None:
+    """Inserts the PoIs with raw SQL, then builds the aggregates from scratch."""
+    from django.db import connection, transaction
+
+    from point_of_interest.aggregates import rebuild_map_clusters
+    from point_of_interest.models import POI, Category
+
+    Category.objects.bulk_create(
+        [Category(name=f"category-{i}") for i in range(categories)]
+    )
+    ids = list(Category.objects.values_list("pk", flat=True))
+    min_lon, min_lat, max_lon, max_lat = COUNTRY_BBOX
+    rng = random.Random(0)
+    # A few dense "cities" plus uniform background noise.
+    cities = [
+        (rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon))
+        for _ in range(50)
+    ]
+
+    def coordinates() -> tuple[float, float]:
+        if rng.random() < 0.7:
+            lat, lon = rng.choice(cities)
+            return rng.gauss(lat, 0.05), rng.gauss(lon, 0.08)
+        return rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)
+
+    table = POI._meta.db_table
+    sql = (
+        f"INSERT INTO {table} (id, external_id, name, latitude, longitude, "
+        "category_id, ratings, description, created_at, updated_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, '[]', '', datetime(), datetime())"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        batch = []
+        for i in range(rows):
+            batch.append(
+                (uuid.uuid4().hex, str(i), f"PoI {i}", *coordinates(), rng.choice(ids))
+            )
+            if len(batch) == 50_000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+    rebuild_map_clusters(chunk_size=50_000)
+
+
+def _viewport(zoom: int, rng: random.Random) -> str:
+    """Returns a random ~1280x800 px viewport inside the country at a zoom level."""
+    min_lon, min_lat, max_lon, max_lat = COUNTRY_BBOX
+    width = min(360.0 * 5 / 2**zoom, max_lon - min_lon)
+    height = min(width * 0.6, max_lat - min_lat)
+    lon = rng.uniform(min_lon, max_lon - width)
+    lat = rng.uniform(min_lat, max_lat - height)
+    return f"{lon},{lat},{lon + width},{lat + height}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _setup_django(Path(tmp) / "clusters.sqlite3")
+        from django.contrib.auth.models import User
+        from django.core.management import call_command
+        from django.test import Client
+
+        from point_of_interest.aggregates import CLUSTER_ZOOMS
+        from point_of_interest.models import MapCluster
+
+        call_command("migrate", verbosity=0)
+        start = time.perf_counter()
+        _seed(args.rows, args.categories)
+        print(
+            f"{args.rows:,} PoIs, {MapCluster.objects.count():,} cluster rows "
+            f"(seed + rebuild {time.perf_counter() - start:.1f}s)"
+        )
+
+        client = Client()
+        client.force_login(User.objects.create_user("bench"))
+        rng = random.Random(1)
+        for zoom in CLUSTER_ZOOMS:
+            timings = []
+            clusters = 0
+            for _ in range(args.queries):
+                params: dict[str, str | int] = {
+                    "zoom": zoom,
+                    "bbox": _viewport(zoom, rng),
+                }
+                start = time.perf_counter()
+                response = client.get("/api/clusters/", params)
+                timings.append(time.perf_counter() - start)
+                clusters += len(response.json()["clusters"])
+            timings.sort()
+            print(
+                f"zoom {zoom:>2}: median {statistics.median(timings) * 1000:7.2f} ms"
+                f" | p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.2f} ms"
+                f" | {clusters / args.queries:8.1f} clusters/viewport"
+            )
+
+
+if __name__ == "__main__":
+    main()
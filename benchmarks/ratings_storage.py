@@ -0,0 +1,118 @@
+"""Compares JSON lists with packed 16-bit ratings for the PoI ``ratings`` column.
+
+Writes the same synthetic rating lists with each model field (``JSONField``,
+as stored before, and ``RatingsField``) into a fresh SQLite file, through the
+fields' own ``get_db_prep_save``, and reports for each layout:
+
+* the average size of the stored value and the file size per row;
+* the bulk-write throughput (encoding and ``executemany``);
+* the read throughput (loading every value back with ``from_db_value`` and
+  averaging it, as the admin and the API do).
+
+Timings are the best of ``--repeat`` runs.
+
+Usage:
+    python -m benchmarks.ratings_storage --rows 200000 --mean-ratings 20
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from benchmarks.sqlite_import import _setup_django
+
+
+def _run(
+    path: Path,
+    field: Any,
+    lists: list[list[float]],
+    batch_size: int,
+) -> dict[str, float]:
+    from django.db import connections
+
+    from point_of_interest.models import average_rating
+
+    connection = connections["default"]
+    path.unlink(missing_ok=True)
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute(
+        f"CREATE TABLE ratings (id INTEGER PRIMARY KEY,"
+        f" ratings {field.db_type(connection)} NOT NULL)"
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(lists), batch_size):
+        batch = lists[offset : offset + batch_size]
+        db.execute("BEGIN")
+        db.executemany(
+            "INSERT INTO ratings (id, ratings) VALUES (?, ?)",
+            [
+                (offset + index, field.get_db_prep_save(value, connection))
+                for index, value in enumerate(batch)
+            ],
+        )
+        db.execute("COMMIT")
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for (value,) in db.execute("SELECT ratings FROM ratings"):
+        average_rating(field.from_db_value(value, None, connection))
+    read = time.perf_counter() - start
+
+    value_bytes = db.execute("SELECT AVG(length(ratings)) FROM ratings").fetchone()[0]
+    db.close()
+    return {
+        "value": value_bytes,
+        "row": path.stat().st_size / len(lists),
+        "write": len(lists) / write,
+        "read": len(lists) / read,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--mean-ratings", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    lists = [
+        [
+            round(rng.uniform(0, 5), 2)
+            for _ in range(rng.randint(0, args.mean_ratings * 2))
+        ]
+        for _ in range(args.rows)
+    ]
+
+    with TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _setup_django(tmp / "setup.sqlite3")
+        from django.db import models
+
+        from point_of_interest.fields import RatingsField
+
+        layouts = {"json": models.JSONField(), "packed": RatingsField()}
+        runs: dict[str, list[dict[str, float]]] = {name: [] for name in layouts}
+        for _ in range(args.repeat):
+            for name, field in layouts.items():
+                runs[name].append(
+                    _run(tmp / f"{name}.sqlite3", field, lists, args.batch_size)
+                )
+
+    print(f"{args.rows:,} rows, {args.mean_ratings} ratings per row on average")
+    for name, results in runs.items():
+        print(
+            f"{name:>7}: value {results[0]['value']:6.1f} B"
+            f" | {results[0]['row']:6.1f} B/row on disk"
+            f" | write {max(r['write'] for r in results):9,.0f} rows/s"
+            f" | read {max(r['read'] for r in results):9,.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
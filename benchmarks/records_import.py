@@ -0,0 +1,119 @@
+"""Measures importing in-memory records against writing them to a file first.
+
+A service holding PoIs in memory (dicts keyed like a JSON feed) imports them
+into a fresh SQLite database either the old way, dumping them to a temporary
+JSON Lines file for ``ImportBuilder``, or by passing them to
+``import_records``, from a list, a generator and an async generator.
+Reports the end-to-end rows per second, the time to the first committed batch
+and the number of progress events received.
+
+Usage:
+    python -m benchmarks.records_import --rows 200000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+)
+
+from benchmarks.sqlite_import import _setup_django, _use_database
+
+if TYPE_CHECKING:
+    from point_of_interest.schemas import ImportEvent
+
+# The in-memory sources of records that import_records() accepts.
+Records = Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]]
+
+
+def _records(rows: int, categories: int) -> Iterator[dict[str, Any]]:
+    rng = random.Random(0)
+    for index in range(rows):
+        yield {
+            "id": f"E{index}",
+            "name": f"PoI {index}",
+            "coordinates": [
+                round(rng.uniform(-90, 90), 6),
+                round(rng.uniform(-180, 180), 6),
+            ],
+            "category": f"category-{rng.randrange(categories)}",
+            "ratings": [round(rng.uniform(0, 5), 1) for _ in range(rng.randint(0, 5))],
+        }
+
+
+async def _arecords(rows: int, categories: int) -> AsyncIterator[dict[str, Any]]:
+    for record in _records(rows, categories):
+        yield record
+
+
+def _run(
+    mode: str, database: Path, rows: int, categories: int, tmp: Path
+) -> tuple[float, float, int]:
+    from django.db import connection
+
+    from point_of_interest.enums import ImportEventType
+    from point_of_interest.services import ImportBuilder, import_records
+
+    _use_database(database)
+    events: list[tuple[float, str]] = []
+    start = time.perf_counter()
+
+    def on_event(event: "ImportEvent") -> None:
+        events.append((time.perf_counter(), event.type))
+
+    if mode == "temp file":
+        path = tmp / "records.jsonl"
+        with path.open("w", encoding="utf-8") as handle:
+            for record in _records(rows, categories):
+                handle.write(json.dumps(record) + "\n")
+        for event in ImportBuilder([path]).events():
+            on_event(event)
+        path.unlink()
+    else:
+        sources: dict[str, Callable[[], Records]] = {
+            "list": lambda: list(_records(rows, categories)),
+            "generator": lambda: _records(rows, categories),
+            "async generator": lambda: _arecords(rows, categories),
+        }
+        import_records(sources[mode](), "jsonl", on_event=on_event)
+    elapsed = time.perf_counter() - start
+    first_batch = next(
+        (at - start for at, kind in events if kind == ImportEventType.BATCH), elapsed
+    )
+    connection.close()
+    return elapsed, first_batch, len(events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--categories", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _setup_django(tmp / "setup.sqlite3")
+        print(f"{args.rows:,} records")
+        modes = ("temp file", "list", "generator", "async generator")
+        for index, mode in enumerate(modes):
+            elapsed, first_batch, events = _run(
+                mode, tmp / f"import-{index}.sqlite3", args.rows, args.categories, tmp
+            )
+            print(
+                f"{mode:>15}: {args.rows / elapsed:8,.0f} rows/s"
+                f" | first batch after {first_batch:6.2f} s | {events} events"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Measures a CSV import into SQLite with and without the bulk-load settings.
+
+Imports the same synthetic file into fresh throwaway databases in three modes:
+
+* ``baseline``: SQLite defaults and the two redundant external_id indexes
+  dropped by migration 0007 recreated, i.e. the schema and settings before
+  the import profile existed;
+* ``profile``: the IMPORT_SQLITE_PRAGMAS profile;
+* ``bulk-load``: the profile plus deferred secondary index maintenance.
+
+Usage:
+    python -m benchmarks.sqlite_import --rows 200000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# Indexes on external_id that existed next to the unique constraint before
+# migration 0007.
+REDUNDANT_INDEXES = (
+    "point_of_interest_external_id_2c7fb55e",
+    "point_of_in_externa_96d9fb_idx",
+)
+
+
+def _setup_django(database: Path) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("ALL_HOSTS", "*")
+    os.environ.setdefault("ALL_ORIGINS", "http://localhost")
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = database
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+    django.setup()
+
+
+def _write_csv(path: Path, rows: int, categories: int) -> None:
+    rng = random.Random(0)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            [
+                "poi_id",
+                "poi_name",
+                "poi_latitude",
+                "poi_longitude",
+                "poi_category",
+                "poi_ratings",
+            ]
+        )
+        for i in range(rows):
+            ratings = ",".join(
+                f"{rng.uniform(0, 5):.1f}" for _ in range(rng.randint(0, 5))
+            )
+            writer.writerow(
+                [
+                    f"E{i}",
+                    f"PoI {i}",
+                    f"{rng.uniform(-90, 90):.6f}",
+                    f"{rng.uniform(-180, 180):.6f}",
+                    f"category-{rng.randrange(categories)}",
+                    ratings,
+                ]
+            )
+
+
+def _use_database(database: Path) -> None:
+    """Points the default connection to a fresh, migrated database."""
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    connection.settings_dict["NAME"] = database
+    call_command("migrate", verbosity=0)
+
+
+def _run(mode: str, database: Path, csv_path: Path, batch_size: int) -> float:
+    from django.conf import settings
+    from django.db import connection
+
+    from point_of_interest.services import ImportBuilder
+
+    pragmas = settings.IMPORT_SQLITE_PRAGMAS
+    _use_database(database)
+    if mode == "baseline":
+        settings.IMPORT_SQLITE_PRAGMAS = {}
+        with connection.cursor() as cursor:
+            for name in REDUNDANT_INDEXES:
+                cursor.execute(
+                    f'CREATE INDEX "{name}" ON point_of_interest (external_id)'
+                )
+    try:
+        start = time.perf_counter()
+        ImportBuilder(
+            [csv_path], batch_size=batch_size, bulk_load=mode == "bulk-load"
+        ).run()
+        return time.perf_counter() - start
+    finally:
+        settings.IMPORT_SQLITE_PRAGMAS = pragmas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "pois.csv"
+        _write_csv(csv_path, args.rows, args.categories)
+        _setup_django(tmp / "setup.sqlite3")
+
+        print(f"{args.rows:,} rows, batch size {args.batch_size:,}")
+        results = {}
+        for mode in ("baseline", "profile", "bulk-load"):
+            elapsed = _run(mode, tmp / f"{mode}.sqlite3", csv_path, args.batch_size)
+            results[mode] = elapsed
+            print(
+                f"{mode:>9}: {elapsed:7.2f} s | {args.rows / elapsed:9,.0f} rows/s"
+                f" | {results['baseline'] / elapsed:4.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Measures the memory of ``import_poi_file`` reading stdin against a file.
+
+For each format and number of rows, a synthetic feed is imported into a
+fresh SQLite database by ``manage.py import_poi_file`` in a new interpreter,
+either from its file or piped to stdin by ``cat`` (``- --format ...``).
+Reports the rows per second and the peak RSS of the importer, which depends on
+``--chunksize`` but should not grow with the number of rows.
+
+Usage:
+    python -m benchmarks.stream_import --rows 50000 200000
+    python -m benchmarks.stream_import --formats jsonl --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator
+
+from benchmarks.sqlite_import import _setup_django
+
+FORMATS = ("csv", "jsonl", "xml")
+_CHILD = """
+import json, resource, sys, time
+import django
+django.setup()
+from django.core.management import call_command
+start = time.perf_counter()
+call_command(
+    "import_poi_file", sys.argv[1], "--format", sys.argv[2], "--chunksize", sys.argv[3],
+    stdout=sys.stderr,
+)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def _feed(input_format: str, rows: int, categories: int = 300) -> Iterator[bytes]:
+    """Yields a synthetic feed in the given format, a block of lines at a time."""
+    rng = random.Random(0)
+    if input_format == "csv":
+        yield b"poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+    elif input_format == "xml":
+        yield b"<pois>\n"
+    lines = []
+    for index in range(rows):
+        latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        category = f"category-{rng.randrange(categories)}"
+        ratings = [round(rng.uniform(0, 5), 1) for _ in range(rng.randint(0, 5))]
+        if input_format == "csv":
+            line = (
+                f"E{index},PoI {index},{latitude:.6f},{longitude:.6f},{category},"
+                f'"{",".join(map(str, ratings))}"'
+            )
+        elif input_format == "jsonl":
+            line = json.dumps(
+                {
+                    "id": f"E{index}",
+                    "name": f"PoI {index}",
+                    "coordinates": [round(latitude, 6), round(longitude, 6)],
+                    "category": category,
+                    "ratings": ratings,
+                }
+            )
+        else:
+            line = (
+                f"<poi><pid>E{index}</pid><pname>PoI {index}</pname>"
+                f"<platitude>{latitude:.6f}</platitude>"
+                f"<plongitude>{longitude:.6f}</plongitude>"
+                f"<pcategory>{category}</pcategory>"
+                f"<pratings>{'|'.join(map(str, ratings))}</pratings></poi>"
+            )
+        lines.append(line)
+        if len(lines) == 10_000:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+    if input_format == "xml":
+        yield b"</pois>\n"
+
+
+def _import(
+    env: dict[str, str], input_format: str, path: Path, chunksize: int, pipe: bool
+) -> dict[str, Any]:
+    """Imports a feed file in a new interpreter, from its path or piped by cat."""
+    feeder = None
+    if pipe:
+        feeder = subprocess.Popen(["cat", str(path)], stdout=subprocess.PIPE)
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, "-" if pipe else str(path), input_format]
+        + [str(chunksize)],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+        stdin=feeder.stdout if feeder else subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    if feeder is not None:
+        if feeder.stdout is not None:
+            feeder.stdout.close()
+        feeder.wait()
+    result: dict[str, Any] = json.loads(output)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--chunksize", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = tmp / "template.sqlite3"
+        _setup_django(template)
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        env = {
+            **os.environ,
+            "DB_NAME": str(tmp / "import.sqlite3"),
+            "CACHE_BACKEND": "django.core.cache.backends.dummy.DummyCache",
+            # The SQLite page cache and memory map of the import profile grow
+            # with the database; keep them small to measure the importer.
+            "IMPORT_SQLITE_CACHE_MB": "8",
+            "IMPORT_SQLITE_MMAP_MB": "0",
+        }
+
+        for input_format in args.formats:
+            for rows in args.rows:
+                path = tmp / f"feed.{input_format}"
+                with path.open("wb") as handle:
+                    handle.writelines(_feed(input_format, rows))
+                size = path.stat().st_size / 2**20
+                for mode in ("file", "stdin"):
+                    shutil.copy(template, env["DB_NAME"])
+                    result = _import(
+                        env, input_format, path, args.chunksize, pipe=mode == "stdin"
+                    )
+                    print(
+                        f"{input_format:>5} {rows:>9,} rows ({size:5.0f} MiB) {mode:>5}:"
+                        f" {rows / result['seconds']:8,.0f} rows/s"
+                        f" | peak RSS {result['rss'] / 1024:6.1f} MiB"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Database routing between the primary database and its read replicas.
+
+Only the reads explicitly marked with ``replica_reads`` (admin changelists and
+the read API) go to a replica; everything else, writes and the importer
+included, stays on the primary.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+# Apps whose tables are read from the replicas; auth and sessions always use
+# the primary, so a just-created user or session is never missing.
+REPLICA_APPS = {"point_of_interest"}
+PIN_COOKIE_NAME = "db_pin_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Replica alias serving the reads of the current context, if any.
+_replica: ContextVar[str | None] = ContextVar("replica", default=None)
+# Whether the current request must read its own recent writes.
+_pinned: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Sends the reads made in the block (or decorated view) to a read replica.
+
+    One replica is picked per block, so its reads see a single replica state.
+    Does nothing when no replica is configured or the request is pinned to
+    the primary.
+    """
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    alias = None if _pinned.get() or not replicas else random.choice(replicas)
+    token = _replica.set(alias)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Routes the reads made inside ``replica_reads`` to a replica."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        if model._meta.app_label in REPLICA_APPS:
+            return _replica.get()
+        return None
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        """Replicas receive the schema from the primary, never migrate them."""
+        return db not in getattr(settings, "DATABASE_REPLICAS", [])
+
+
+class ReplicaPinningMiddleware:
+    """Pins a client to the primary for a while after it writes.
+
+    A successful unsafe request (e.g. saving a PoI in the admin) sets a short
+    lived cookie; while it is present the client's reads skip the replicas,
+    so it never sees a page missing its own change because of replication
+    lag. DB_REPLICA_PIN_SECONDS=0 disables it.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = _pinned.set(PIN_COOKIE_NAME in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        seconds = getattr(settings, "DB_REPLICA_PIN_SECONDS", 0)
+        if (
+            seconds
+            and getattr(settings, "DATABASE_REPLICAS", [])
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE_NAME, "1", max_age=seconds, httponly=True, samesite="Lax"
+            )
+        return response
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 from pathlib import Path
+from typing import Any
+
 from django.core.management.utils import get_random_secret_key
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,6 +55,7 @@ INSTALLED_APPS += APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.db_routers.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -84,12 +87,102 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-DATABASES = {
+# SQLite by default; DB_ENGINE=django.db.backends.postgresql (with psycopg
+# installed) switches to Postgres. Connections are kept open between requests
+# for DB_CONN_MAX_AGE seconds (0 closes them after every request) and checked
+# before being reused, so a dropped connection never fails a request.
+DB_ENGINE = os.getenv("DB_ENGINE", "django.db.backends.sqlite3")
+DATABASES: dict[str, dict[str, Any]] = {
+    "default": {
+        "ENGINE": DB_ENGINE,
+        "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+        "USER": os.getenv("DB_USER", ""),
+        "PASSWORD": os.getenv("DB_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", ""),
+        "PORT": os.getenv("DB_PORT", ""),
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": bool(int(os.getenv("DB_CONN_HEALTH_CHECKS", 1))),
+        "OPTIONS": {},
+    }
+}
+# Postgres only: a psycopg connection pool per process (needs psycopg[pool]).
+# The pool replaces persistent connections, so CONN_MAX_AGE must stay 0.
+if DB_ENGINE == "django.db.backends.postgresql" and int(os.getenv("DB_POOL", 0)):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+        "timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+    }
+
+# Read replicas: comma-separated hosts (database files for SQLite) with the
+# same engine and credentials as the primary. They serve the admin changelists
+# and the read API; after a write, the client reads from the primary for
+# DB_REPLICA_PIN_SECONDS (0 disables it) to always see its own changes.
+for number, location in enumerate(
+    filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1
+):
+    replica = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    replica["NAME" if DB_ENGINE.endswith("sqlite3") else "HOST"] = location.strip()
+    DATABASES[f"replica_{number}"] = replica
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["core.db_routers.PrimaryReplicaRouter"]
+DB_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", 10))
+
+# SQLite pragmas applied to the import connection while an import runs (other
+# databases ignore them). journal_mode persists in the database file, so once
+# switched to WAL the admin keeps reading while imports write.
+IMPORT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": os.getenv("IMPORT_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": -int(os.getenv("IMPORT_SQLITE_CACHE_MB", 256)) * 1024,
+    "mmap_size": int(os.getenv("IMPORT_SQLITE_MMAP_MB", 1024)) * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# Write budget of the importer on a shared database (0 disables a limit):
+# rows and transactions per second, and back-offs while a write transaction
+# takes longer than IMPORT_MAX_COMMIT_LATENCY seconds or the health probe
+# (replication lag of the read replicas, in seconds) exceeds
+# IMPORT_MAX_REPLICA_LAG.
+IMPORT_MAX_ROWS_PER_SECOND = float(os.getenv("IMPORT_MAX_ROWS_PER_SECOND", 0))
+IMPORT_MAX_TRANSACTIONS_PER_SECOND = float(
+    os.getenv("IMPORT_MAX_TRANSACTIONS_PER_SECOND", 0)
+)
+IMPORT_MAX_COMMIT_LATENCY = float(os.getenv("IMPORT_MAX_COMMIT_LATENCY", 0))
+IMPORT_MAX_REPLICA_LAG = float(os.getenv("IMPORT_MAX_REPLICA_LAG", 0))
+IMPORT_HEALTH_PROBE = os.getenv(
+    "IMPORT_HEALTH_PROBE", "point_of_interest.throttle.replica_lag"
+)
+# Seconds the health probe may hold an import back in a row before it fails.
+IMPORT_MAX_HEALTH_WAIT = float(os.getenv("IMPORT_MAX_HEALTH_WAIT", 600))
+# Seconds without progress after which a running import job is considered
+# abandoned by its worker (crashed or killed) and put back in the queue.
+IMPORT_JOB_STALE_SECONDS = float(os.getenv("IMPORT_JOB_STALE_SECONDS", 900))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The read API and the importer must share the cache backend (e.g. Redis or
+# Memcached) for imports to invalidate API responses across processes.
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "admin-pois-manager-data"),
     }
 }
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 300))
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 100))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 1000))
+# The read API answers logged-in users and clients sending one of these tokens
+# as "Authorization: Bearer <token>"; API_PUBLIC=1 opens it to everybody.
+API_TOKENS = [token for token in os.getenv("API_TOKENS", "").split(",") if token]
+API_PUBLIC = bool(int(os.getenv("API_PUBLIC", 0)))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +224,12 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = "media"
 FIXTURE_DIRS = [os.path.join(BASE_DIR, "fixtures")]
 
+# Directory from which the admin can queue imports of files already on the server
+IMPORT_SERVER_ROOT = os.getenv("IMPORT_SERVER_ROOT", os.path.join(BASE_DIR, "data"))
+# Private directory for files uploaded through the admin; kept out of MEDIA_ROOT,
+# which the proxy serves publicly
+IMPORT_UPLOAD_ROOT = os.getenv("IMPORT_UPLOAD_ROOT", os.path.join(BASE_DIR, "uploads"))
+
 # Logging
 # https://docs.djangoproject.com/en/5.2/topics/logging/
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,41 +1,420 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Sequence
 from uuid import UUID
 
-from django.contrib import admin
-from django.db.models import QuerySet
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path, reverse
+from django.utils.html import format_html
+from django.utils.safestring import SafeString
+
+from core.db_routers import SAFE_METHODS, replica_reads
+from point_of_interest.enums import DuplicateStatus, ImportStatus
+from point_of_interest.fields import RatingsAverage
+from point_of_interest.forms import ImportJobForm
+from point_of_interest.history import poi_version_before, poi_versions
+from point_of_interest.models import (
+    POI,
+    Category,
+    CategoryStats,
+    DuplicateCandidate,
+    HistoricalImportData,
+    POIChange,
+)
+from point_of_interest.services import stale_import_jobs
+from point_of_interest.utils import get_lookup_params
+
+if TYPE_CHECKING:
+    from django.contrib.admin.options import _FieldGroups
+
+    _ModelAdmin = admin.ModelAdmin[Any]
+else:
+    _ModelAdmin = admin.ModelAdmin
+
+
+class ReplicaChangelistMixin(_ModelAdmin):
+    """Serves the changelist (listing, filters and search) from a read replica.
+
+    Only safe requests are routed: bulk actions are posted to the changelist
+    too and must read what they are about to change from the primary.
+    """
+
+    def changelist_view(
+        self, request: HttpRequest, extra_context: dict[str, Any] | None = None
+    ) -> HttpResponse:
+        if request.method not in SAFE_METHODS:
+            return super().changelist_view(request, extra_context)
+        with replica_reads():
+            response = super().changelist_view(request, extra_context)
+            # Template responses run their queries when rendered.
+            if hasattr(response, "render"):
+                response.render()
+        return response
+
+
+class LeanChangeList(ChangeList):
+    """Change list fetching only the columns the listing displays.
+
+    Safe requests load ``changelist_only`` of the model admin plus its
+    ``changelist_annotations``, values computed by the database. Bulk actions
+    are posted to the changelist and get the full rows to act on.
+    """
+
+    model_admin: LeanChangelistMixin
+
+    def get_queryset(
+        self, request: HttpRequest, exclude_parameters: list[str | None] | None = None
+    ) -> QuerySet[Any]:
+        queryset = super().get_queryset(request, exclude_parameters)
+        if request.method not in SAFE_METHODS:
+            return queryset
+        return queryset.only(*self.model_admin.changelist_only).annotate(
+            **self.model_admin.changelist_annotations()
+        )
 
-from point_of_interest.models import POI, HistoricalImportData
-from point_of_interest.utils import validate_uuid
+
+class LeanChangelistMixin(_ModelAdmin):
+    """Lists the model with ``LeanChangeList``; ``changelist_only`` names the fields."""
+
+    changelist_only: Sequence[str] = ()
+
+    def changelist_annotations(self) -> Dict[str, Any]:
+        """Returns the values the database computes for the listing, by name."""
+        return {}
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> type[ChangeList]:
+        return LeanChangeList
 
 
 @admin.register(HistoricalImportData)
-class HistoricalImportDataAdmin(admin.ModelAdmin):
-    list_display = ("id", "source", "filename", "timestamp")
-    list_filter = ["source"]
+class HistoricalImportDataAdmin(
+    LeanChangelistMixin, ReplicaChangelistMixin, _ModelAdmin
+):
+    list_display = (
+        "id",
+        "source",
+        "filename",
+        "status",
+        "progress_display",
+        "rows_rejected",
+        "rows_per_second",
+        "eta",
+        "timestamp",
+    )
+    list_filter = ["source", "status"]
     search_fields = ["source"]
     readonly_fields = ["timestamp"]
     list_per_page = 50
+    actions = ["requeue_imports"]
+    # The displayed columns; progress and ETA are formatted from them.
+    changelist_only = (
+        "id",
+        "source",
+        "filename",
+        "status",
+        "rows_processed",
+        "rows_total",
+        "rows_rejected",
+        "rows_per_second",
+        "eta_seconds",
+        "timestamp",
+    )
+
+    @admin.display(description="Progress")
+    def progress_display(self, obj: HistoricalImportData) -> str:
+        """Displays the processed rows, against the estimated total when known."""
+        if not obj.rows_total:
+            return f"{obj.rows_processed:,}"
+        percent = min(100, obj.rows_processed * 100 // obj.rows_total)
+        return f"{obj.rows_processed:,} / {obj.rows_total:,} ({percent}%)"
+
+    def get_form(
+        self,
+        request: HttpRequest,
+        obj: HistoricalImportData | None = None,
+        change: bool = False,
+        **kwargs: Any,
+    ) -> type[forms.ModelForm[HistoricalImportData]]:
+        """Adding a record queues an import job; existing records are read-only."""
+        kwargs["form"] = ImportJobForm if obj is None else forms.ModelForm
+        return super().get_form(request, obj, change, **kwargs)
+
+    def get_fields(
+        self, request: HttpRequest, obj: HistoricalImportData | None = None
+    ) -> _FieldGroups:
+        """Shows only the job inputs on the add form."""
+        if obj is None:
+            return ["file", "path"]
+        return super().get_fields(request, obj)
+
+    def get_readonly_fields(
+        self, request: HttpRequest, obj: HistoricalImportData | None = None
+    ) -> list[str] | tuple[str, ...]:
+        """Makes every field of an existing record read-only."""
+        if obj is None:
+            return self.readonly_fields
+        return [field.name for field in self.model._meta.fields]
+
+    @admin.action(description="Re-queue selected failed or stale imports")
+    def requeue_imports(
+        self, request: HttpRequest, queryset: QuerySet[HistoricalImportData]
+    ) -> None:
+        """Puts failed jobs, and running ones abandoned by their worker, back in the queue."""
+        stale = stale_import_jobs(settings.IMPORT_JOB_STALE_SECONDS)
+        count = (
+            queryset.filter(
+                Q(status=ImportStatus.FAILED) | Q(pk__in=stale.values("pk"))
+            )
+            .exclude(file="", path="")
+            .update(status=ImportStatus.PENDING, error="", heartbeat_at=None)
+        )
+        self.message_user(request, f"{count} import(s) queued.", messages.SUCCESS)
+
+
+@admin.register(Category)
+class CategoryAdmin(_ModelAdmin):
+    list_display = ("id", "name")
+    search_fields = ("name",)
+    list_per_page = 50
+
+
+@admin.register(CategoryStats)
+class CategoryStatsAdmin(_ModelAdmin):
+    """Read-only view of the per-category summary table, never scanning the PoIs."""
+
+    list_display = (
+        "category",
+        "poi_count",
+        "rating_count",
+        "avg_rating_display",
+        *CategoryStats.HISTOGRAM_FIELDS,
+    )
+    list_select_related = ["category"]
+    search_fields = ("category__name",)
+    ordering = ["-poi_count"]
+    list_per_page = 50
+
+    @admin.display(description="Avg. rating")
+    def avg_rating_display(self, obj: CategoryStats) -> float | None:
+        """Displays the average of every rating of the category."""
+        return obj.avg_rating
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: CategoryStats | None = None
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+        self, request: HttpRequest, obj: CategoryStats | None = None
+    ) -> bool:
+        return False
 
 
 @admin.register(POI)
-class PointOfInterestAdmin(admin.ModelAdmin):
+class PointOfInterestAdmin(LeanChangelistMixin, ReplicaChangelistMixin, _ModelAdmin):
     list_display = ("id", "name", "external_id", "category", "avg_rating_display")
     list_filter = ["category"]
+    list_select_related = ["category"]
+    autocomplete_fields = ["category"]
     search_fields = ("external_id", "name")
     readonly_fields = ("created_at", "updated_at")
     list_per_page = 50
+    # Matches poi_created_at_idx; Django would otherwise append -pk to the
+    # model ordering, which the database can only get by sorting every row.
+    ordering = ("created_at", "id")
+    # Searches and filters count their matches only, not the whole table again.
+    show_full_result_count = False
+    # Neither the description nor the ratings: the average comes from the database.
+    changelist_only = ("id", "name", "external_id", "category", "category__name")
+    changes_per_page = 50
+
+    def changelist_annotations(self) -> Dict[str, Any]:
+        return {"avg_rating_value": RatingsAverage("ratings")}
 
     @admin.display(ordering=None, description="Avg. rating")
     def avg_rating_display(self, obj: POI):
         """Displays the average rating value for the POI instance."""
+        if hasattr(obj, "avg_rating_value"):
+            return obj.avg_rating_value
         return obj.avg_rating
 
+    def get_urls(self) -> list[URLPattern]:
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "<path:object_id>/changes/",
+                self.admin_site.admin_view(self.changes_view),
+                name="%s_%s_changes" % info,
+            ),
+        ] + super().get_urls()
+
+    def changes_view(
+        self,
+        request: HttpRequest,
+        object_id: str,
+        extra_context: dict[str, Any] | None = None,
+    ) -> HttpResponse:
+        """Lists the recorded changes of a PoI, ``changes_per_page`` at a time.
+
+        ``?version=<change id>`` also shows every field as it was right before
+        that change. Django's own history view (the admin log) is left as is.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            self.message_user(
+                request,
+                f"{self.opts.verbose_name} with ID “{unquote(object_id)}” doesn’t"
+                " exist. Perhaps it was deleted?",
+                messages.WARNING,
+            )
+            return HttpResponseRedirect(
+                reverse("admin:index", current_app=self.admin_site.name)
+            )
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+        paginator = Paginator(
+            POIChange.objects.filter(poi_id=obj.pk).order_by("-id"),
+            self.changes_per_page,
+        )
+        page = paginator.get_page(request.GET.get("p"))
+        versions = poi_versions(
+            obj, skip=(page.number - 1) * paginator.per_page, count=paginator.per_page
+        )
+        shown = [values for _, after, before in versions for values in (after, before)]
+        version = None
+        if request.GET.get("version", "").isdigit():
+            version = POIChange.objects.filter(
+                poi_id=obj.pk, pk=request.GET["version"]
+            ).first()
+        if version is not None:
+            shown.append(poi_version_before(obj, version))
+        categories = dict(
+            Category.objects.filter(
+                pk__in={values["category_id"] for values in shown}
+            ).values_list("pk", "name")
+        )
+
+        def display(name: str, value: Any) -> Any:
+            return categories.get(value, value) if name == "category_id" else value
+
+        changes = [
+            {
+                "change": change,
+                "fields": [
+                    (name, display(name, before[name]), display(name, after[name]))
+                    for name in change.diff
+                ],
+            }
+            for change, after, before in versions
+        ]
+        context = {
+            **self.admin_site.each_context(request),
+            "title": f"Change history: {obj}",
+            "subtitle": None,
+            "object": obj,
+            "opts": self.opts,
+            "changes": changes,
+            "page": page,
+            "version": (
+                None
+                if version is None
+                else {
+                    "change": version,
+                    "values": [
+                        (name, display(name, value))
+                        for name, value in shown[-1].items()
+                    ],
+                }
+            ),
+            **(extra_context or {}),
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, "admin/point_of_interest/poi/changes.html", context
+        )
+
     def get_search_results(self, request, queryset: QuerySet, search_term: str):
         """Search by UUID (internal id) or exact external_id (int), or fallback to default."""
         term_fmt = search_term.strip()
         qs, use_distinct = super().get_search_results(request, queryset, term_fmt)
-        if validate_uuid(term_fmt):
-            reference_id = UUID(term_fmt)
-            qs = queryset.filter(pk=reference_id)
-        elif term_fmt.isdigit():
-            qs = queryset.filter(external_id=term_fmt)
+        lookup = get_lookup_params(term_fmt)
+        if lookup is not None:
+            qs = queryset.filter(**lookup)
         return qs, use_distinct
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(ReplicaChangelistMixin, _ModelAdmin):
+    """Review queue of the pairs found by ``find_duplicate_pois``, best first."""
+
+    list_display = (
+        "poi_a_link",
+        "poi_b_link",
+        "distance",
+        "name_similarity",
+        "score",
+        "status",
+        "detected_at",
+    )
+    list_filter = ["status"]
+    search_fields = ("name_a", "name_b", "=external_id_a", "=external_id_b")
+    ordering = ["-score"]
+    list_per_page = 50
+    actions = ["confirm_duplicates", "dismiss_duplicates"]
+
+    def _poi_link(self, pk: UUID, name: str, external_id: str) -> SafeString:
+        url = reverse("admin:point_of_interest_poi_change", args=[pk])
+        return format_html('<a href="{}">{}</a> ({})', url, name, external_id)
+
+    @admin.display(description="PoI A", ordering="name_a")
+    def poi_a_link(self, obj: DuplicateCandidate) -> SafeString:
+        """Links to the first PoI of the pair."""
+        return self._poi_link(obj.poi_a, obj.name_a, obj.external_id_a)
+
+    @admin.display(description="PoI B", ordering="name_b")
+    def poi_b_link(self, obj: DuplicateCandidate) -> SafeString:
+        """Links to the second PoI of the pair."""
+        return self._poi_link(obj.poi_b, obj.name_b, obj.external_id_b)
+
+    def get_readonly_fields(
+        self, request: HttpRequest, obj: DuplicateCandidate | None = None
+    ) -> list[str]:
+        """Only the review status can be edited."""
+        return [
+            field.name for field in self.model._meta.fields if field.name != "status"
+        ]
+
+    @admin.action(
+        description="Mark selected pairs as duplicates", permissions=["change"]
+    )
+    def confirm_duplicates(
+        self, request: HttpRequest, queryset: QuerySet[DuplicateCandidate]
+    ) -> None:
+        """Confirms the selected pairs; new scans keep them."""
+        count = queryset.update(status=DuplicateStatus.CONFIRMED)
+        self.message_user(request, f"{count} pair(s) confirmed.", messages.SUCCESS)
+
+    @admin.action(
+        description="Mark selected pairs as not duplicates", permissions=["change"]
+    )
+    def dismiss_duplicates(
+        self, request: HttpRequest, queryset: QuerySet[DuplicateCandidate]
+    ) -> None:
+        """Dismisses the selected pairs; new scans do not report them again."""
+        count = queryset.update(status=DuplicateStatus.DISMISSED)
+        self.message_user(request, f"{count} pair(s) dismissed.", messages.SUCCESS)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
@@ -0,0 +1,337 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Type
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, Model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from point_of_interest.fields import Ratings
+from point_of_interest.history import HISTORY_FIELDS
+from point_of_interest.models import POI, CategoryStats, MapCluster
+
+# PoI columns the summary tables are computed from; the importer and the sync
+# deletion read them back for the rows they overwrite or remove.
+TRACKED_FIELDS = ("category_id", "ratings", "latitude", "longitude")
+HISTOGRAM_BUCKETS = len(CategoryStats.HISTOGRAM_FIELDS)
+
+# Map zoom levels with precomputed clusters, and how many levels finer than the
+# map tiles the cluster grid is (3 -> 8x8 cells per tile).
+CLUSTER_ZOOMS = (2, 4, 6, 8, 10, 12)
+CLUSTER_CELL_BITS = 3
+MAX_LATITUDE = 85.05112878
+
+# (zoom, category, x, y)
+ClusterKey = Tuple[int, int, int, int]
+
+
+def clean_ratings(ratings: Any) -> List[float]:
+    """Returns the numeric ratings clamped between 0 and 5, skipping invalid ones."""
+    if isinstance(ratings, Ratings):
+        return ratings.tolist()
+    if not isinstance(ratings, (list, tuple)):
+        return []
+    values = []
+    for value in ratings:
+        try:
+            values.append(min(5.0, max(0.0, float(value))))
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+@dataclass(slots=True)
+class CategoryDelta:
+    """Change to apply to the statistics of a single category."""
+
+    pois: int = 0
+    rating_count: int = 0
+    rating_sum: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * HISTOGRAM_BUCKETS)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.pois or self.rating_count or self.rating_sum or any(self.histogram)
+        )
+
+
+class CategoryStatsDelta:
+    """Accumulates the changes of a batch of PoI writes per category."""
+
+    def __init__(self) -> None:
+        self._deltas: Dict[int, CategoryDelta] = defaultdict(CategoryDelta)
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def add(self, category_id: int, ratings: Any, sign: int = 1) -> None:
+        """Counts a PoI in (sign=1) or out of (sign=-1) its category."""
+        delta = self._deltas[category_id]
+        values = clean_ratings(ratings)
+        delta.pois += sign
+        delta.rating_count += sign * len(values)
+        delta.rating_sum += sign * sum(values)
+        histogram = delta.histogram
+        for value in values:
+            histogram[min(int(value), HISTOGRAM_BUCKETS - 1)] += sign
+
+    def to_stats(self, model: Type[Model] = CategoryStats) -> List[Model]:
+        """Returns the accumulated values as new rows of a CategoryStats model."""
+        return [
+            model(
+                category_id=category_id,
+                poi_count=delta.pois,
+                rating_count=delta.rating_count,
+                rating_sum=delta.rating_sum,
+                **dict(zip(CategoryStats.HISTOGRAM_FIELDS, delta.histogram)),
+            )
+            for category_id, delta in self._deltas.items()
+        ]
+
+    def apply(self) -> None:
+        """Adds the accumulated deltas to the stored statistics and resets them.
+
+        Uses relative ``UPDATE``s (one per touched category), so concurrent
+        imports never overwrite each other's changes.
+        """
+        deltas = {pk: delta for pk, delta in self._deltas.items() if delta}
+        self._deltas.clear()
+        if not deltas:
+            return
+        CategoryStats.objects.bulk_create(
+            [CategoryStats(category_id=pk) for pk in deltas], ignore_conflicts=True
+        )
+        for pk, delta in deltas.items():
+            histogram = {
+                name: F(name) + count
+                for name, count in zip(CategoryStats.HISTOGRAM_FIELDS, delta.histogram)
+                if count
+            }
+            CategoryStats.objects.filter(pk=pk).update(
+                poi_count=F("poi_count") + delta.pois,
+                rating_count=F("rating_count") + delta.rating_count,
+                rating_sum=F("rating_sum") + delta.rating_sum,
+                **histogram,
+            )
+
+
+def mercator_fractions(latitude: float, longitude: float) -> Tuple[float, float]:
+    """Projects a coordinate to Web Mercator, as fractions of the map width/height."""
+    latitude = min(MAX_LATITUDE, max(-MAX_LATITUDE, latitude))
+    sin = math.sin(math.radians(latitude))
+    fx = (longitude + 180.0) / 360.0
+    fy = 0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    return min(max(fx, 0.0), 1.0), min(max(fy, 0.0), 1.0)
+
+
+def cluster_cell(zoom: int, fx: float, fy: float) -> Tuple[int, int]:
+    """Returns the x/y of the cluster cell holding the given Mercator fractions."""
+    size = 1 << (zoom + CLUSTER_CELL_BITS)
+    return min(int(fx * size), size - 1), min(int(fy * size), size - 1)
+
+
+class MapClusterDelta:
+    """Accumulates the changes of a batch of PoI writes per map cluster cell."""
+
+    def __init__(self) -> None:
+        self._cells: Dict[ClusterKey, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def add(
+        self, category_id: int, latitude: float, longitude: float, sign: int = 1
+    ) -> None:
+        """Counts a PoI in (sign=1) or out of (sign=-1) its cell at every zoom.
+
+        Each PoI is counted twice per zoom: in its category and in the totals
+        of the cell (``MapCluster.ALL_CATEGORIES``).
+        """
+        if not (math.isfinite(latitude) and math.isfinite(longitude)):
+            return
+        fx, fy = mercator_fractions(latitude, longitude)
+        cells = self._cells
+        lat = sign * latitude
+        lon = sign * longitude
+        for zoom in CLUSTER_ZOOMS:
+            x, y = cluster_cell(zoom, fx, fy)
+            for category in (category_id, MapCluster.ALL_CATEGORIES):
+                key = (zoom, category, x, y)
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [sign, lat, lon]
+                else:
+                    cell[0] += sign
+                    cell[1] += lat
+                    cell[2] += lon
+
+    def to_clusters(self, model: Type[Model] = MapCluster) -> List[Model]:
+        """Returns the accumulated values as new rows of a MapCluster model."""
+        return [
+            model(
+                zoom=zoom,
+                category=category,
+                x=x,
+                y=y,
+                count=count,
+                latitude_sum=lat,
+                longitude_sum=lon,
+            )
+            for (zoom, category, x, y), (count, lat, lon) in self._cells.items()
+        ]
+
+    def apply(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Adds the accumulated deltas to the stored cells and resets them.
+
+        A single ``INSERT ... ON CONFLICT DO UPDATE`` statement, executed for
+        every touched cell, increments the existing rows and creates the
+        missing ones, so concurrent imports never lose each other's changes.
+        Cells emptied by deletions are kept with a zero count.
+        """
+        params = [
+            (*key, count, lat, lon)
+            for key, (count, lat, lon) in self._cells.items()
+            if count or lat or lon
+        ]
+        self._cells.clear()
+        if not params:
+            return
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        meta = MapCluster._meta
+        table = quote(meta.db_table)
+        key = ["zoom", "category", "x", "y"]
+        sums = ["count", "latitude_sum", "longitude_sum"]
+        concrete = {field.name: field for field in meta.concrete_fields}
+        columns = [quote(str(concrete[name].column)) for name in key + sums]
+        increments = ", ".join(
+            f"{column} = {table}.{column} + EXCLUDED.{column}"
+            for column in columns[len(key) :]
+        )
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({', '.join(columns[: len(key)])}) DO UPDATE SET {increments}"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+
+class AggregateDelta:
+    """Changes of a batch of PoI writes to every summary table."""
+
+    def __init__(self) -> None:
+        self.categories = CategoryStatsDelta()
+        self.clusters = MapClusterDelta()
+
+    def add(self, row: Mapping[str, Any], sign: int = 1) -> None:
+        """Counts a PoI, given its TRACKED_FIELDS values, in the summaries."""
+        self.categories.add(row["category_id"], row["ratings"], sign)
+        self.clusters.add(row["category_id"], row["latitude"], row["longitude"], sign)
+
+    def remove(self, row: Mapping[str, Any]) -> None:
+        """Removes a PoI, given its previous TRACKED_FIELDS values, from the summaries."""
+        self.add(row, -1)
+
+    def update(self, rows: Iterable[Mapping[str, Any]], sign: int = 1) -> None:
+        """Counts every row of an iterable in (or out of) the summaries."""
+        for row in rows:
+            self.add(row, sign)
+
+    def apply(self) -> None:
+        """Writes the accumulated changes to every summary table."""
+        self.categories.apply()
+        self.clusters.apply()
+
+
+@transaction.atomic
+def rebuild_category_stats(
+    chunk_size: int = 10_000,
+    source: Type[Model] = POI,
+    target: Type[Model] = CategoryStats,
+) -> int:
+    """Recomputes the per-category statistics from a full scan of the PoIs.
+    Args:
+        chunk_size (int): Number of PoIs fetched per query.
+        source (Type[Model]): PoI model to scan (a full reload passes the
+            copy of its shadow table).
+        target (Type[Model]): CategoryStats model whose rows are replaced.
+    Returns:
+        int: The number of categories with statistics.
+    """
+    delta = CategoryStatsDelta()
+    rows = source._default_manager.values_list("category_id", "ratings").iterator(
+        chunk_size=chunk_size
+    )
+    for category_id, ratings in rows:
+        delta.add(category_id, ratings)
+    target._default_manager.all().delete()
+    target._default_manager.bulk_create(delta.to_stats(target), batch_size=chunk_size)
+    return len(delta)
+
+
+@transaction.atomic
+def rebuild_map_clusters(
+    chunk_size: int = 10_000,
+    source: Type[Model] = POI,
+    target: Type[Model] = MapCluster,
+) -> int:
+    """Recomputes the map clusters from a full scan of the PoIs.
+    Args:
+        chunk_size (int): Number of PoIs fetched per query.
+        source (Type[Model]): PoI model to scan.
+        target (Type[Model]): MapCluster model whose rows are replaced.
+    Returns:
+        int: The number of cluster cells.
+    """
+    delta = MapClusterDelta()
+    rows = source._default_manager.values_list(
+        "category_id", "latitude", "longitude"
+    ).iterator(chunk_size=chunk_size)
+    for category_id, latitude, longitude in rows:
+        delta.add(category_id, latitude, longitude)
+    target._default_manager.all().delete()
+    target._default_manager.bulk_create(
+        delta.to_clusters(target), batch_size=chunk_size
+    )
+    return len(delta)
+
+
+def _tracked_values(instance: POI) -> Dict[str, Any]:
+    return {name: getattr(instance, name) for name in TRACKED_FIELDS}
+
+
+@receiver(pre_save, sender=POI)
+def _remember_previous_values(sender: type[POI], instance: POI, **kwargs: Any) -> None:
+    """Keeps the stored values of a PoI edited one by one (e.g. in the admin).
+
+    Reads the HISTORY_FIELDS, which include the TRACKED_FIELDS, so the change
+    history shares this query.
+    """
+    previous = None
+    if not instance._state.adding and not kwargs.get("raw"):
+        previous = POI.objects.filter(pk=instance.pk).values(*HISTORY_FIELDS).first()
+    instance._previous_values = previous
+
+
+@receiver(post_save, sender=POI)
+def _count_saved_poi(sender: type[POI], instance: POI, **kwargs: Any) -> None:
+    """Applies the change of a single saved PoI to the summaries."""
+    if kwargs.get("raw"):
+        return
+    delta = AggregateDelta()
+    previous = getattr(instance, "_previous_values", None)
+    if previous is not None:
+        delta.remove(previous)
+    delta.add(_tracked_values(instance))
+    delta.apply()
+
+
+@receiver(post_delete, sender=POI)
+def _count_deleted_poi(sender: type[POI], instance: POI, **kwargs: Any) -> None:
+    """Removes a single deleted PoI from the summaries."""
+    delta = AggregateDelta()
+    delta.remove(_tracked_values(instance))
+    delta.apply()
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class PointOfInterestConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "point_of_interest"
+
+    def ready(self) -> None:
+        # Connects the signals keeping the summary tables, the change history
+        # and the API data version up to date.
+        from point_of_interest import aggregates, caching, history  # noqa: F401
@@ -0,0 +1,197 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models
+
+# Pragmas SQLite refuses to change inside a transaction.
+SQLITE_OUTSIDE_TRANSACTION_PRAGMAS = {"journal_mode", "synchronous", "temp_store"}
+# Pragmas kept after the import instead of being restored.
+SQLITE_PERSISTENT_PRAGMAS = {"journal_mode"}
+
+
+@contextmanager
+def import_db_profile(using: str = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """Applies IMPORT_SQLITE_PRAGMAS to the import connection, restoring them at exit.
+
+    Does nothing on other databases. Pragmas that SQLite only accepts outside
+    a transaction are skipped when the import runs inside one.
+    """
+    connection = connections[using]
+    pragmas = getattr(settings, "IMPORT_SQLITE_PRAGMAS", {})
+    if connection.vendor != "sqlite" or not pragmas:
+        yield
+        return
+    connection.ensure_connection()
+    previous: Dict[str, object] = {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if (
+                connection.in_atomic_block
+                and name in SQLITE_OUTSIDE_TRANSACTION_PRAGMAS
+            ):
+                continue
+            cursor.execute(f"PRAGMA {name}")
+            current = cursor.fetchone()
+            # In-memory databases report no value for some pragmas (mmap_size).
+            if current is not None:
+                previous[name] = current[0]
+            cursor.execute(f"PRAGMA {name} = {value}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for name, value in previous.items():
+                if name in SQLITE_PERSISTENT_PRAGMAS:
+                    continue
+                if (
+                    connection.in_atomic_block
+                    and name in SQLITE_OUTSIDE_TRANSACTION_PRAGMAS
+                ):
+                    continue
+                cursor.execute(f"PRAGMA {name} = {value}")
+
+
+class SecondaryIndexes:
+    """Drops the non-unique indexes of a model during a bulk load and recreates them.
+
+    The index definitions come from the model (``Meta.indexes`` and fields
+    with ``db_index``, plus the pattern-matching twin PostgreSQL adds to text
+    fields), not from the database, so ``restore`` also recreates indexes left
+    missing by an interrupted load. Indexes are matched by name; those a full
+    reload left with the names of its shadow table are matched by their
+    columns and kind. Dropped indexes are recreated under the names they had.
+    Unique constraints, needed by the upserts, are never touched.
+    """
+
+    # Suffix of the pattern-matching (LIKE) index of a PostgreSQL text field.
+    LIKE_SUFFIX = "_like"
+
+    def __init__(
+        self, model: Type[models.Model], using: str = DEFAULT_DB_ALIAS
+    ) -> None:
+        self.model = model
+        self.using = using
+        self.connection = connections[using]
+        # {defined index name: name of the dropped index}
+        self._dropped: Dict[str, str] = {}
+
+    def _pattern_opclass(self, field: "models.Field[Any, Any]") -> str | None:
+        """Returns the operator class of the LIKE index PostgreSQL gives a field."""
+        if self.connection.vendor != "postgresql":
+            return None
+        db_type = field.db_type(self.connection) or ""
+        if "[" in db_type or field.db_parameters(self.connection).get("collation"):
+            return None
+        if db_type.startswith("varchar"):
+            return "varchar_pattern_ops"
+        if db_type.startswith("text"):
+            return "text_pattern_ops"
+        return None
+
+    def _indexes(self) -> List[models.Index]:
+        """Returns the secondary indexes the model defines."""
+        opts = self.model._meta
+        supports_expressions = self.connection.features.supports_expression_indexes
+        indexes = [
+            index
+            for index in opts.indexes
+            if not index.contains_expressions or supports_expressions
+        ]
+        for field in opts.local_fields:
+            # db_index is missing from the Django type stubs.
+            if not getattr(field, "db_index", False) or field.unique:
+                continue
+            index = models.Index(fields=[field.name])
+            index.set_name_with_model(self.model)
+            indexes.append(index)
+            opclass = self._pattern_opclass(field)
+            if opclass is not None:
+                indexes.append(
+                    models.Index(
+                        fields=[field.name],
+                        name=index.name.removesuffix("_idx") + self.LIKE_SUFFIX,
+                        opclasses=[opclass],
+                    )
+                )
+        return indexes
+
+    def _columns(self, index: models.Index) -> Tuple[str, ...]:
+        columns = {field.name: field.column for field in self.model._meta.local_fields}
+        return tuple(str(columns[name]) for name, _ in index.fields_orders)
+
+    def _existing(self) -> Dict[str, Tuple[str, ...]]:
+        """Returns {index name: indexed columns} for the indexes in the database."""
+        with self.connection.cursor() as cursor:
+            constraints = self.connection.introspection.get_constraints(
+                cursor, self.model._meta.db_table
+            )
+        return {
+            name: tuple(info["columns"])
+            for name, info in constraints.items()
+            if info["index"] and not info["unique"] and not info["primary_key"]
+        }
+
+    def _matches(self, indexes: List[models.Index]) -> Dict[str, str]:
+        """Returns {defined index name: existing index name} for the indexes found."""
+        existing = self._existing()
+        matches = {
+            index.name: index.name for index in indexes if index.name in existing
+        }
+        unclaimed = {
+            name: columns
+            for name, columns in existing.items()
+            if name not in matches.values()
+        }
+        for index in indexes:
+            if index.name in matches:
+                continue
+            like = index.name.endswith(self.LIKE_SUFFIX)
+            for name, columns in unclaimed.items():
+                if (
+                    columns == self._columns(index)
+                    and name.endswith(self.LIKE_SUFFIX) == like
+                ):
+                    matches[index.name] = name
+                    del unclaimed[name]
+                    break
+        return matches
+
+    def drop(self) -> List[str]:
+        """Drops the model's secondary indexes. Returns their names."""
+        matches = self._matches(self._indexes())
+        quote = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            for name in matches.values():
+                cursor.execute(f"DROP INDEX {quote(name)}")
+        self._dropped.update(matches)
+        return list(matches.values())
+
+    def restore(self) -> List[str]:
+        """Creates the missing secondary indexes of the model.
+
+        Returns:
+            List[str]: The names of the indexes created.
+        """
+        indexes = self._indexes()
+        matches = self._matches(indexes)
+        editor = self.connection.SchemaEditorClass(self.connection)
+        created = []
+        with self.connection.cursor() as cursor:
+            for index in indexes:
+                if index.name in matches:
+                    continue
+                named = index.clone()
+                named.name = self._dropped.pop(index.name, index.name)
+                cursor.execute(str(named.create_sql(self.model, editor)))
+                created.append(named.name)
+        return created
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Drops the indexes for the duration of the block, rebuilding them at exit."""
+        self.drop()
+        try:
+            yield
+        finally:
+            self.restore()
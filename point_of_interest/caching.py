@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from point_of_interest.models import POI, Category, DataVersion
+
+DATA_VERSION_ID = 1
+
+
+def get_data_version() -> str:
+    """Returns the current PoI data version, used to key API responses and ETags.
+
+    The version is read from the database, so every process serves the same
+    ETags until the data changes.
+    """
+    version = (
+        DataVersion.objects.filter(pk=DATA_VERSION_ID)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return str(version or 0)
+
+
+def bump_data_version() -> None:
+    """Invalidates every cached API response by moving to a new data version."""
+    bumped = DataVersion.objects.filter(pk=DATA_VERSION_ID).update(
+        version=F("version") + 1
+    )
+    if not bumped:
+        DataVersion.objects.get_or_create(pk=DATA_VERSION_ID, defaults={"version": 1})
+
+
+@receiver(post_save, sender=POI)
+@receiver(post_delete, sender=POI)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def _bump_on_commit(sender: type[POI | Category], **kwargs: Any) -> None:
+    """Moves to a new data version once a PoI or category edited one by one
+    (e.g. in the admin) is committed."""
+    if not kwargs.get("raw"):
+        transaction.on_commit(bump_data_version)
@@ -0,0 +1,302 @@
+"""
+Near-duplicate PoI detection: the same place sent under different external ids.
+
+PoIs are streamed ordered by latitude and hashed into a grid: bands
+``radius`` metres high, cut into cells at least ``radius`` metres wide (wider
+in degrees of longitude towards the poles). Only PoIs in the same or a
+neighbouring cell are compared, block by block, with NumPy: the distance in
+metres and the Jaccard similarity of the character trigrams of their names,
+estimated from 256-bit signatures. Memory only holds the current block and the
+last two bands of cells, whatever the size of the table. PoIs on both sides of
+the antimeridian are not compared.
+"""
+
+import math
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Generator, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core.db_routers import replica_reads
+from point_of_interest.enums import DuplicateStatus
+from point_of_interest.models import POI, DuplicateCandidate
+
+METERS_PER_DEGREE = 6_371_008.8 * math.pi / 180
+# Name signatures: 4 x 64 bits, one bit per hashed trigram.
+SIGNATURE_WORDS = 4
+SIGNATURE_BITS = SIGNATURE_WORDS * 64
+# Upper bound of the candidate pairs compared at once.
+PAIR_BLOCK = 1 << 21
+# Cell keys: (band << CELL_SHIFT) + column, the column always below 2**32.
+CELL_SHIFT = 32
+
+_WORD_SEPARATORS = re.compile(r"[\W_]+")
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+# (pk, external_id, name, latitude, longitude)
+Row = Tuple[Any, str, str, float, float]
+
+
+def name_signature(name: str) -> List[int]:
+    """Returns the trigram signature of a name, ignoring case, accents and punctuation."""
+    text = name or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _WORD_SEPARATORS.sub(" ", text.lower()).strip()
+    padded = f"  {text} ".encode()
+    words = [0] * SIGNATURE_WORDS
+    for index in range(len(padded) - 2):
+        bit = zlib.crc32(padded[index : index + 3]) % SIGNATURE_BITS
+        words[bit >> 6] |= 1 << (bit & 63)
+    return words
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Counts the bits set in each row of a (n, SIGNATURE_WORDS) uint64 array."""
+    counts: np.ndarray
+    if hasattr(np, "bitwise_count"):
+        counts = np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    else:
+        counts = _POPCOUNT[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+    return counts
+
+
+def _expand(lo: np.ndarray, hi: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yields (i, j) index arrays for every j in [lo[i], hi[i]), PAIR_BLOCK at a time."""
+    counts = np.maximum(hi - lo, 0)
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        base = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, base + PAIR_BLOCK, "right")), start + 1)
+        block = counts[start:stop]
+        total = int(block.sum())
+        if total:
+            i = np.repeat(np.arange(start, stop), block)
+            offsets = np.repeat(lo[start:stop] - (np.cumsum(block) - block), block)
+            yield i, offsets + np.arange(total)
+        start = stop
+
+
+def _neighbours(
+    left: np.ndarray, right: np.ndarray, dx: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yields (a, b) row index arrays of the pairs where ``right[b] == left[a] + dx``.
+
+    Within one set of keys (``left is right``) and ``dx == 0`` each pair comes
+    once, with ``a < b``.
+    """
+    order = np.argsort(right, kind="stable")
+    keys = right[order]
+    target = left + dx
+    lo = np.searchsorted(keys, target, "left")
+    hi = np.searchsorted(keys, target, "right")
+    for a, j in _expand(lo, hi):
+        b = order[j]
+        if left is right and dx == 0:
+            keep = a < b
+            a, b = a[keep], b[keep]
+        yield a, b
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """A pair of PoIs that may be the same place."""
+
+    a: Row
+    b: Row
+    distance: float
+    name_similarity: float
+    score: float
+
+
+class DuplicateFinder:
+    """Finds near-duplicate PoIs in a stream of rows ordered by latitude.
+
+    A pair is a candidate when the PoIs are at most ``radius`` metres apart
+    and the trigram similarity of their names is at least ``min_similarity``.
+    Its score is the similarity, decreased linearly with the distance down to
+    half of it at ``radius``.
+    """
+
+    def __init__(
+        self,
+        *,
+        radius: float = 50.0,
+        min_similarity: float = 0.5,
+        chunk_size: int = 50_000,
+    ) -> None:
+        self.radius = float(radius)
+        self.min_similarity = float(min_similarity)
+        self.chunk_size = int(chunk_size)
+
+    def scan(self, rows: Iterable[Row]) -> Iterator[Candidate]:
+        """Yields the candidate pairs of the rows, which must be sorted by latitude."""
+        carry: List[Row] = []
+        chunk: List[Row] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                carry = yield from self._scan_block(carry, chunk)
+                chunk = []
+        if chunk:
+            yield from self._scan_block(carry, chunk)
+
+    def _keys(self, band: np.ndarray, longitude: np.ndarray, span: int) -> np.ndarray:
+        """Returns the cell keys of rows in bands ``band`` to ``band + span - 1``.
+
+        The cells of those bands share one longitude width: the radius at their
+        poleward edge, where degrees of longitude are the shortest, so PoIs
+        within the radius are never more than one cell apart.
+        """
+        edge = np.maximum(np.abs(band), np.abs(band + span)) * self.radius
+        cos = np.cos(np.radians(np.minimum(edge / METERS_PER_DEGREE, 90)))
+        width = np.minimum(
+            self.radius / (METERS_PER_DEGREE * np.maximum(cos, 1e-9)), 360
+        )
+        keys: np.ndarray = (band << CELL_SHIFT) + np.floor(
+            (longitude + 180) / width
+        ).astype(np.int64)
+        return keys
+
+    def _scan_block(
+        self, carry: List[Row], fresh: List[Row]
+    ) -> Generator[Candidate, None, List[Row]]:
+        """Compares the rows of a block, returning the rows kept for the next one.
+
+        ``carry`` holds the last two cell bands of the previous block: pairs
+        made only of carried rows were already compared.
+        """
+        rows = carry + fresh
+        latitude = np.fromiter((row[3] for row in rows), float, len(rows))
+        longitude = np.fromiter((row[4] for row in rows), float, len(rows))
+        band = np.floor(latitude * METERS_PER_DEGREE / self.radius).astype(np.int64)
+        is_fresh = np.arange(len(rows)) >= len(carry)
+
+        same = self._keys(band, longitude, 1)
+        # The cells of a band and of the next one, keyed by the lower band.
+        lower = self._keys(band, longitude, 2)
+        upper = self._keys(band - 1, longitude, 2)
+        neighbours = chain(
+            _neighbours(same, same, 0),
+            _neighbours(same, same, 1),
+            *(_neighbours(lower, upper, dx) for dx in (-1, 0, 1)),
+        )
+        pairs = []
+        for a, b in neighbours:
+            keep = is_fresh[a] | is_fresh[b]
+            pairs.append(self._near(latitude, longitude, a[keep], b[keep]))
+        if pairs:
+            yield from self._compare(rows, *map(np.concatenate, zip(*pairs)))
+
+        last_band = band.max()
+        return [row for row, row_band in zip(rows, band) if row_band >= last_band - 1]
+
+    def _near(
+        self,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        a: np.ndarray,
+        b: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the (a, b) pairs of row indices within the radius, with their distance."""
+        mean_latitude = np.radians((latitude[a] + latitude[b]) / 2)
+        dx = (longitude[a] - longitude[b]) * np.cos(mean_latitude)
+        dy = latitude[a] - latitude[b]
+        distance = np.hypot(dx, dy) * METERS_PER_DEGREE
+        near = distance <= self.radius
+        return a[near], b[near], distance[near]
+
+    def _compare(
+        self, rows: List[Row], a: np.ndarray, b: np.ndarray, distance: np.ndarray
+    ) -> Iterator[Candidate]:
+        """Yields the candidates among the (a, b) pairs of nearby rows.
+
+        Names are only hashed for the rows that have a neighbour: most PoIs
+        have none.
+        """
+        signatures = np.zeros((len(rows), SIGNATURE_WORDS), dtype=np.uint64)
+        needed = np.unique(np.concatenate([a, b]))
+        signatures[needed] = np.array(
+            [name_signature(rows[index][2]) for index in needed], dtype=np.uint64
+        ).reshape(len(needed), SIGNATURE_WORDS)
+        bits = _popcount(signatures)
+        shared = _popcount(signatures[a] & signatures[b])
+        union = bits[a] + bits[b] - shared
+        similarity = np.divide(shared, union, out=np.zeros(len(union)), where=union > 0)
+        similar = similarity >= self.min_similarity
+        score = similarity * (1 - 0.5 * distance / self.radius)
+        for index in np.flatnonzero(similar):
+            yield Candidate(
+                a=rows[a[index]],
+                b=rows[b[index]],
+                distance=round(float(distance[index]), 2),
+                name_similarity=round(float(similarity[index]), 3),
+                score=round(float(score[index]), 3),
+            )
+
+
+def _to_model(candidate: Candidate) -> DuplicateCandidate:
+    a, b = sorted((candidate.a, candidate.b), key=lambda row: str(row[0]))
+    return DuplicateCandidate(
+        poi_a=a[0],
+        poi_b=b[0],
+        external_id_a=a[1],
+        external_id_b=b[1],
+        name_a=a[2][:255],
+        name_b=b[2][:255],
+        distance=candidate.distance,
+        name_similarity=candidate.name_similarity,
+        score=candidate.score,
+    )
+
+
+def find_duplicate_pois(
+    *,
+    radius: float = 50.0,
+    min_similarity: float = 0.5,
+    chunk_size: int = 50_000,
+    batch_size: int = 10_000,
+) -> int:
+    """Scans every PoI and stores the candidate duplicate pairs for review.
+
+    The PoIs are streamed with a server-side cursor where the database has
+    them (from a read replica when configured). The pending candidates of the
+    previous scan are replaced; reviewed pairs keep their status.
+    Returns:
+        int: The number of candidate pairs found.
+    """
+    finder = DuplicateFinder(
+        radius=radius, min_similarity=min_similarity, chunk_size=chunk_size
+    )
+    primary = DuplicateCandidate.objects.using(DEFAULT_DB_ALIAS)
+    primary.filter(status=DuplicateStatus.PENDING).delete()
+    found = 0
+    buffer: List[DuplicateCandidate] = []
+    with replica_reads():
+        rows = (
+            POI.objects.order_by("latitude")
+            .values_list("pk", "external_id", "name", "latitude", "longitude")
+            .iterator(chunk_size=chunk_size)
+        )
+        for candidate in finder.scan(rows):
+            buffer.append(_to_model(candidate))
+            found += 1
+            if len(buffer) >= batch_size:
+                _save(buffer, batch_size)
+                buffer = []
+    _save(buffer, batch_size)
+    return found
+
+
+def _save(candidates: List[DuplicateCandidate], batch_size: int) -> None:
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        DuplicateCandidate.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+            candidates, batch_size=batch_size, ignore_conflicts=True
+        )
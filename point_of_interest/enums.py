@@ -6,3 +6,24 @@ class SourceType(models.TextChoices):
     CSV = "csv", _("CSV")
     JSON = "json", _("JSON")
     XML = "xml", _("XML")
+
+
+class ImportStatus(models.TextChoices):
+    PENDING = "pending", _("Pending")
+    RUNNING = "running", _("Running")
+    SUCCEEDED = "succeeded", _("Succeeded")
+    FAILED = "failed", _("Failed")
+
+
+class ImportEventType(models.TextChoices):
+    STARTED = "started", _("Input started")
+    BATCH = "batch", _("Batch committed")
+    FINISHED = "finished", _("Input finished")
+    FAILED = "failed", _("Input failed")
+    COMPLETED = "completed", _("Import completed")
+
+
+class DuplicateStatus(models.TextChoices):
+    PENDING = "pending", _("Pending review")
+    CONFIRMED = "confirmed", _("Confirmed duplicate")
+    DISMISSED = "dismissed", _("Not a duplicate")
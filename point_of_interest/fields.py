@@ -0,0 +1,256 @@
+"""
+Compact storage of the PoI ratings.
+
+Ratings are between 0 and 5 with 2 decimals, so they are stored as hundredths
+in 16-bit integers: a ``smallint[]`` on PostgreSQL and a packed little-endian
+blob on other databases (2 bytes per rating instead of about 5 in JSON). Rows
+are loaded as ``Ratings`` sequences, decoded to an ``array('H')`` only when a
+value is read; ``numpy.frombuffer(ratings.packed, "<u2")`` gives a NumPy view
+without copying.
+"""
+
+import json
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, overload
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+if TYPE_CHECKING:
+    from django.db.models.sql.compiler import SQLCompiler, _AsSqlType
+
+SCALE = 100
+MAX_HUNDREDTHS = 5 * SCALE
+
+
+class Ratings(Sequence[float]):
+    """Read-only sequence of ratings (floats), backed by packed hundredths."""
+
+    __slots__ = ("_packed", "_array")
+
+    def __init__(self, packed: bytes | memoryview = b"") -> None:
+        self._packed = bytes(packed)
+        self._array: "array[int] | None" = None
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> "Ratings":
+        """Packs ratings, limited between 0 and 5 and rounded to 2 decimal places.
+        Raises:
+            ValueError, TypeError, OverflowError: If a rating is not a finite number.
+        """
+        hundredths = [round(float(value) * SCALE) for value in values]
+        # Clamping each value is the slow path: values are normally in range.
+        if hundredths and (min(hundredths) < 0 or max(hundredths) > MAX_HUNDREDTHS):
+            hundredths = [min(MAX_HUNDREDTHS, max(0, value)) for value in hundredths]
+        return cls.from_hundredths(hundredths)
+
+    @classmethod
+    def from_hundredths(cls, hundredths: Iterable[int]) -> "Ratings":
+        """Packs ratings given in hundredths (0 to 500)."""
+        data = array("H", hundredths)
+        if sys.byteorder == "big":  # pragma: no cover - stored little-endian
+            data.byteswap()
+        return cls(data.tobytes())
+
+    @property
+    def packed(self) -> bytes:
+        """The stored bytes: one little-endian unsigned 16-bit integer per rating."""
+        return self._packed
+
+    @property
+    def array(self) -> "array[int]":
+        """The ratings as hundredths, decoded on first access."""
+        if self._array is None:
+            data = array("H")
+            data.frombytes(self._packed)
+            if sys.byteorder == "big":  # pragma: no cover - stored little-endian
+                data.byteswap()
+            self._array = data
+        return self._array
+
+    def tolist(self) -> List[float]:
+        return [value / SCALE for value in self.array]
+
+    def __len__(self) -> int:
+        return len(self._packed) // 2
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[float]: ...
+
+    def __getitem__(self, index: int | slice) -> float | List[float]:
+        if isinstance(index, slice):
+            return [value / SCALE for value in self.array[index]]
+        return self.array[index] / SCALE
+
+    def __iter__(self) -> Iterator[float]:
+        return (value / SCALE for value in self.array)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Ratings):
+            return self._packed == other._packed
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
+
+
+def ratings_json(value: bytes | None) -> str | None:
+    """Returns a stored blob of ratings as a JSON list, e.g. for SQL functions."""
+    if value is None:
+        return None
+    return json.dumps(Ratings(value).tolist())
+
+
+def ratings_average(value: bytes | None) -> float | None:
+    """Returns the average of a stored blob of ratings, 0 when there are none."""
+    if value is None:
+        return None
+    ratings = Ratings(value)
+    return round(sum(ratings.array) / len(ratings) / SCALE, 2) if ratings else 0.0
+
+
+@receiver(connection_created)
+def _register_sqlite_functions(
+    sender: type[BaseDatabaseWrapper], connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    """Makes the blob helpers available to SQL, as poi_ratings_json/poi_ratings_avg."""
+    if connection.vendor != "sqlite":
+        return
+    for name, function in (
+        ("poi_ratings_json", ratings_json),
+        ("poi_ratings_avg", ratings_average),
+    ):
+        connection.connection.create_function(name, 1, function, deterministic=True)
+
+
+class RatingsAverage(models.Func):
+    """Average of a ratings column with 2 decimal places, computed by the database."""
+
+    function = "poi_ratings_avg"
+    arity = 1
+    output_field = models.FloatField()
+
+    def as_postgresql(
+        self,
+        compiler: "SQLCompiler",
+        connection: BaseDatabaseWrapper,
+        **extra_context: Any,
+    ) -> "_AsSqlType":
+        return self.as_sql(
+            compiler,
+            connection,
+            template=(
+                "CAST(COALESCE((SELECT ROUND(AVG(value) / 100.0, 2)"
+                " FROM unnest(%(expressions)s) AS value), 0) AS double precision)"
+            ),
+            **extra_context,
+        )
+
+
+class RatingsEncoder(json.JSONEncoder):
+    """JSON encoder writing ``Ratings`` as lists."""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, Ratings):
+            return o.tolist()
+        return super().default(o)
+
+
+class RatingsFormField(forms.JSONField):
+    """Edits the ratings as a JSON list."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs.setdefault("encoder", RatingsEncoder)
+        super().__init__(**kwargs)
+
+
+if TYPE_CHECKING:
+    _RatingsFieldBase = models.Field[Any, Ratings]
+else:
+    _RatingsFieldBase = models.Field
+
+
+class RatingsField(_RatingsFieldBase):
+    """List of ratings stored as 16-bit hundredths, loaded as ``Ratings``."""
+
+    description = "Ratings between 0 and 5, with 2 decimal places"
+
+    def db_type(self, connection: BaseDatabaseWrapper) -> str:
+        if connection.vendor == "postgresql":
+            return "smallint[]"
+        return str(
+            connection.data_types["BinaryField"] % self.db_type_parameters(connection)
+        )
+
+    def to_python(self, value: Any) -> Ratings | None:
+        if value is None or isinstance(value, Ratings):
+            return value
+        if isinstance(value, (bytes, memoryview)):
+            return Ratings(value)
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise ValidationError("Enter a list of ratings.", code="invalid")
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError("Enter a list of ratings.", code="invalid")
+        try:
+            return Ratings.from_values(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValidationError("Ratings must be numbers.", code="invalid")
+
+    def from_db_value(
+        self, value: Any, expression: Any, connection: BaseDatabaseWrapper
+    ) -> Ratings | None:
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return Ratings.from_hundredths(value)
+        return Ratings(value)
+
+    def get_prep_value(self, value: Any) -> Ratings | None:
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, Ratings):
+            return value
+        return Ratings.from_values(value)
+
+    def get_db_prep_value(
+        self, value: Any, connection: BaseDatabaseWrapper, prepared: bool = False
+    ) -> Any:
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return None
+        if connection.vendor == "postgresql":
+            return list(value.array)
+        # The DB-API module of the backend is missing from the stubs.
+        return getattr(connection, "Database").Binary(value.packed)
+
+    def value_to_string(self, obj: models.Model) -> str:
+        """Serializes the ratings as a JSON list, which ``to_python`` reads back."""
+        return json.dumps(self.value_from_object(obj), cls=RatingsEncoder)
+
+    def formfield(
+        self,
+        form_class: type[forms.Field] | None = None,
+        choices_form_class: type[forms.ChoiceField] | None = None,
+        **kwargs: Any,
+    ) -> forms.Field | None:
+        return super().formfield(
+            form_class=form_class or RatingsFormField,
+            choices_form_class=choices_form_class,
+            **kwargs,
+        )
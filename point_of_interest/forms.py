@@ -0,0 +1,58 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django import forms
+from django.conf import settings
+
+from point_of_interest.models import HistoricalImportData
+from point_of_interest.utils import source_from_path
+
+if TYPE_CHECKING:
+    _ModelForm = forms.ModelForm[HistoricalImportData]
+else:
+    _ModelForm = forms.ModelForm
+
+
+class ImportJobForm(_ModelForm):
+    """Form queueing a background import from an uploaded file or a server path."""
+
+    class Meta:
+        model = HistoricalImportData
+        fields = ["file", "path"]
+        help_texts = {
+            "path": "Path of a file inside the server import directory.",
+        }
+
+    def clean_path(self) -> str:
+        """Resolves the server path, which must be a file inside IMPORT_SERVER_ROOT."""
+        value: str = self.cleaned_data.get("path", "").strip()
+        if not value:
+            return value
+        root = Path(settings.IMPORT_SERVER_ROOT).resolve()
+        resolved = (root / value).resolve()
+        if not resolved.is_relative_to(root):
+            raise forms.ValidationError(
+                f"The path must be inside the import directory '{root}'."
+            )
+        if not resolved.is_file():
+            raise forms.ValidationError(f"File not found: '{resolved}'.")
+        return str(resolved)
+
+    def clean(self) -> dict[str, Any]:
+        """Requires exactly one input and derives the source type from its name."""
+        cleaned_data: dict[str, Any] = super().clean() or self.cleaned_data
+        upload = cleaned_data.get("file")
+        path: str = cleaned_data.get("path", "")
+        if self.errors:
+            return cleaned_data
+        if bool(upload) == bool(path):
+            raise forms.ValidationError(
+                "Provide either a file to upload or a server path."
+            )
+        filename = Path(upload.name if upload else path).name
+        try:
+            self.instance.source = source_from_path(Path(filename))
+        except ValueError as exc:
+            raise forms.ValidationError(str(exc)) from exc
+        self.instance.filename = filename
+        return cleaned_data
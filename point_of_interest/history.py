@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Tuple
+from uuid import UUID
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from point_of_interest.fields import Ratings
+from point_of_interest.models import POI, POIChange
+
+# PoI fields whose changes are recorded; the importer reads them back for the
+# rows it overwrites.
+HISTORY_FIELDS = (
+    "name",
+    "latitude",
+    "longitude",
+    "category_id",
+    "ratings",
+    "description",
+)
+
+# (change, values of the PoI right after it, values right before it)
+Version = Tuple[POIChange, Dict[str, Any], Dict[str, Any]]
+
+
+def reverse_diff(
+    previous: Mapping[str, Any], current: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Returns the previous values of the HISTORY_FIELDS that changed, JSON-ready."""
+    return {
+        name: (
+            previous[name].tolist()
+            if isinstance(previous[name], Ratings)
+            else previous[name]
+        )
+        for name in HISTORY_FIELDS
+        if name in current and previous[name] != current[name]
+    }
+
+
+class ChangeLog:
+    """Collects the changes of a batch of PoI updates, written with one bulk insert.
+
+    Meant to be written in the transaction of the batch, so the history never
+    records an update that was rolled back.
+    """
+
+    def __init__(self, import_run_id: UUID | None = None) -> None:
+        self.import_run_id = import_run_id
+        self.changed_at = timezone.now()
+        self._changes: List[POIChange] = []
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def add(
+        self, poi_id: UUID, previous: Mapping[str, Any], current: Mapping[str, Any]
+    ) -> None:
+        """Records the update of a PoI, if any of its HISTORY_FIELDS changed."""
+        diff = reverse_diff(previous, current)
+        if diff:
+            self._changes.append(
+                POIChange(
+                    poi_id=poi_id,
+                    import_run_id=self.import_run_id,
+                    changed_at=self.changed_at,
+                    diff=diff,
+                )
+            )
+
+    def write(self, batch_size: int = 10_000, using: str = DEFAULT_DB_ALIAS) -> int:
+        """Inserts the collected changes. Returns how many were written."""
+        changes, self._changes = self._changes, []
+        POIChange.objects.using(using).bulk_create(changes, batch_size=batch_size)
+        return len(changes)
+
+
+def _current_values(poi: POI) -> Dict[str, Any]:
+    return {name: getattr(poi, name) for name in HISTORY_FIELDS}
+
+
+def poi_versions(poi: POI, skip: int = 0, count: int | None = None) -> List[Version]:
+    """Rebuilds recorded versions of a PoI, newest first.
+
+    Starts from the stored values and walks back through the reverse diffs,
+    on the ``(poi_id, -id)`` index: only the diffs of the ``skip`` newest
+    changes are read to reach the first requested version.
+    Args:
+        poi (POI): The PoI.
+        skip (int): Number of newest changes to leave out (e.g. earlier pages).
+        count (int | None): Number of versions to rebuild, None for all of them.
+    Returns:
+        List[Version]: One (change, after, before) entry per change; ``after``
+        of the first entry is the current PoI when nothing is skipped.
+    """
+    values = _current_values(poi)
+    changes = POIChange.objects.filter(poi_id=poi.pk).order_by("-id")
+    if skip:
+        for diff in changes.values_list("diff", flat=True)[:skip]:
+            values.update(diff)
+    versions: List[Version] = []
+    for change in changes[skip : None if count is None else skip + count]:
+        before = {**values, **change.diff}
+        versions.append((change, values, before))
+        values = before
+    return versions
+
+
+def poi_version_before(poi: POI, change: POIChange) -> Dict[str, Any]:
+    """Returns the HISTORY_FIELDS values a PoI had right before one of its changes.
+
+    Only the diffs from that change to the newest one are read.
+    """
+    values = _current_values(poi)
+    for diff in (
+        POIChange.objects.filter(poi_id=poi.pk, id__gte=change.pk)
+        .order_by("-id")
+        .values_list("diff", flat=True)
+    ):
+        values.update(diff)
+    return values
+
+
+def poi_as_of(poi: POI, moment: datetime) -> Dict[str, Any]:
+    """Returns the HISTORY_FIELDS values a PoI had at the given moment."""
+    values = _current_values(poi)
+    for diff in (
+        POIChange.objects.filter(poi_id=poi.pk, changed_at__gt=moment)
+        .order_by("-id")
+        .values_list("diff", flat=True)
+    ):
+        values.update(diff)
+    return values
+
+
+@receiver(post_save, sender=POI)
+def _record_saved_poi(
+    sender: type[POI], instance: POI, created: bool, **kwargs: Any
+) -> None:
+    """Records the change of a PoI edited one by one (e.g. in the admin)."""
+    previous = getattr(instance, "_previous_values", None)
+    if kwargs.get("raw") or created or previous is None:
+        return
+    log = ChangeLog()
+    log.add(
+        instance.pk,
+        previous,
+        _current_values(instance),
+    )
+    log.write(using=kwargs.get("using") or DEFAULT_DB_ALIAS)
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from point_of_interest.duplicates import find_duplicate_pois
+
+
+class Command(BaseCommand):
+    help = (
+        "Find PoIs that may describe the same place (close together, with similar"
+        " names) and store the pairs for review in the admin."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--radius",
+            type=float,
+            default=50.0,
+            help="Maximum distance between duplicates, in metres.",
+        )
+        parser.add_argument(
+            "--min-similarity",
+            type=float,
+            default=0.5,
+            help="Minimum trigram similarity of the names, between 0 and 1.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50_000,
+            help="Number of PoIs fetched and compared per block.",
+        )
+
+    def handle(self, *args: Any, **opts: Any) -> None:
+        if opts["radius"] <= 0:
+            raise CommandError("--radius must be positive.")
+        if not 0 <= opts["min_similarity"] <= 1:
+            raise CommandError("--min-similarity must be between 0 and 1.")
+        found = find_duplicate_pois(
+            radius=opts["radius"],
+            min_similarity=opts["min_similarity"],
+            chunk_size=opts["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Duplicate candidates found: {found} pair(s)")
+        )
@@ -1,17 +1,35 @@
 import glob
-from typing import Sequence
+from pathlib import Path
+from typing import Any, Sequence
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
 
-from point_of_interest.services import ImportBuilder, ImportServiceError
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.rejects import ErrorBudget
+from point_of_interest.reload import PREVIOUS_TABLE
+from point_of_interest.services import ImportBuilder, stored_external_ids
+from point_of_interest.throttle import WriteThrottle
+from point_of_interest.utils import INPUT_FORMATS, STDIN, is_stream
+from point_of_interest.validation import FeedValidator
 
 
 class Command(BaseCommand):
     help = "Import PoI files (CSV/JSON/XML) with Pandas/ET + upsert in batches."
 
-    def add_arguments(self, parser):
+    def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument(
-            "paths", nargs="+", help="Paths to the files (multiple allowed)."
+            "paths",
+            nargs="+",
+            help="Paths to the files (multiple allowed), '-' for stdin or named pipes.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(INPUT_FORMATS),
+            help=(
+                "Format of the inputs, instead of their suffix; required for stdin. "
+                "CSV, JSON Lines and XML streams are read in chunks."
+            ),
         )
         parser.add_argument(
             "--chunksize",
@@ -25,33 +43,201 @@ class Command(BaseCommand):
             default=10_000,
             help="Batch size for bulk ops.",
         )
+        parser.add_argument(
+            "--id-index",
+            action="store_true",
+            help="Load existing external ids into memory once, so new rows skip the existence lookup.",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Full sync: delete PoIs whose external id is missing from all given files.",
+        )
+        parser.add_argument(
+            "--bulk-load",
+            action="store_true",
+            help="Drop the non-unique PoI indexes while loading and rebuild them at the end.",
+        )
+        parser.add_argument(
+            "--full-reload",
+            action="store_true",
+            help="Load the files into a new table and swap it with the live one at the end.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            help=(
+                "Skip invalid rows, writing them to a <file>.rejects.<ext> file, "
+                "until more than N rows (or N%% of the rows read) are rejected."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=(
+                "Only validate the files, in parallel, and report what the import "
+                "would do; nothing is written to the database."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes of --dry-run (default: one per CPU).",
+        )
+        parser.add_argument(
+            "--reject-dir",
+            help="Directory of the reject files (default: next to each source file).",
+        )
+        parser.add_argument(
+            "--max-rows-per-second",
+            type=float,
+            help="Write budget: rows written per second (default: IMPORT_MAX_ROWS_PER_SECOND).",
+        )
+        parser.add_argument(
+            "--max-transactions-per-second",
+            type=float,
+            help="Write budget: transactions per second (default: IMPORT_MAX_TRANSACTIONS_PER_SECOND).",
+        )
+        parser.add_argument(
+            "--max-commit-latency",
+            type=float,
+            help="Back off while a write transaction takes longer than this many seconds.",
+        )
+        parser.add_argument(
+            "--max-replica-lag",
+            type=float,
+            help="Back off while the read replicas lag more than this many seconds.",
+        )
 
-    def handle(self, *args, **opts):
+    def handle(self, *args: Any, **opts: Any) -> None:
 
         paths: Sequence[str] = opts["paths"]
         chunksize: int = opts["chunksize"]
         batch_size: int = opts["batch_size"]
+        use_id_index: bool = opts["id_index"]
+        sync: bool = opts["sync"]
+        bulk_load: bool = opts["bulk_load"]
+        full_reload: bool = opts["full_reload"]
+        max_errors: str | None = opts["max_errors"]
+        budget: ErrorBudget | None = None
+        input_format: str | None = opts["format"]
+        if full_reload and (sync or bulk_load):
+            raise CommandError(
+                "--full-reload cannot be combined with --sync or --bulk-load."
+            )
+        if max_errors is not None:
+            try:
+                budget = ErrorBudget.parse(max_errors)
+            except ValueError as exc:
+                raise CommandError(f"--max-errors: {exc}") from exc
+
+        if STDIN in paths and input_format is None:
+            raise CommandError("--format is required to read from stdin ('-').")
+        if paths.count(STDIN) > 1:
+            raise CommandError("Stdin ('-') can only be read once.")
 
         expanded_paths = []
         for p in paths:
-            expanded = glob.glob(p)
+            expanded = glob.glob(p) if p != STDIN else []
             if expanded:
                 expanded_paths.extend(expanded)
             else:
                 expanded_paths.append(p)
 
+        if opts["dry_run"]:
+            if any(is_stream(Path(p)) for p in expanded_paths):
+                raise CommandError(
+                    "--dry-run splits files between workers and needs regular files, "
+                    "not stdin or pipes."
+                )
+            self._dry_run(expanded_paths, opts["workers"], budget, input_format)
+            return
+
         try:
             stats = ImportBuilder(
-                expanded_paths, chunksize=chunksize, batch_size=batch_size
+                expanded_paths,
+                chunksize=chunksize,
+                batch_size=batch_size,
+                use_id_index=use_id_index,
+                sync=sync,
+                bulk_load=bulk_load,
+                full_reload=full_reload,
+                max_errors=budget,
+                reject_dir=opts["reject_dir"],
+                input_format=input_format,
+                throttle=WriteThrottle.from_settings(
+                    max_rows_per_second=opts["max_rows_per_second"],
+                    max_transactions_per_second=opts["max_transactions_per_second"],
+                    max_commit_latency=opts["max_commit_latency"],
+                    max_lag=opts["max_replica_lag"],
+                ),
             ).run()
             self.stdout.write(self.style.SUCCESS("Data processed successfully"))
             self.stdout.write(
                 self.style.WARNING(
                     f"Files processed: {stats.files_processed} | "
-                    f"created: {stats.created} | updated: {stats.updated}"
+                    f"created: {stats.created} | updated: {stats.updated} | "
+                    f"duplicates: {stats.duplicates} | deleted: {stats.deleted} | "
+                    f"rejected: {stats.rejected}"
                 )
             )
+            if stats.throttled_seconds or stats.backoffs:
+                self.stdout.write(
+                    f"Writes throttled for {stats.throttled_seconds:.1f} s "
+                    f"({stats.backoffs} back-offs under load)."
+                )
+            if stats.rejected:
+                self.stdout.write(
+                    "Rejected rows were written to the *.rejects.* file of their source."
+                )
+            if full_reload:
+                self.stdout.write(
+                    f"Previous PoI table kept as '{PREVIOUS_TABLE}'; "
+                    "run rollback_full_reload to restore it."
+                )
         except ImportServiceError as exc:
             self.stderr.write(self.style.ERROR(str(exc)))
         except Exception as exc:  # noqa: BLE001
             self.stderr.write(self.style.ERROR(f"Unexpected error: {exc}"))
+
+    def _dry_run(
+        self,
+        paths: Sequence[str],
+        workers: int | None,
+        max_errors: ErrorBudget | None,
+        input_format: str | None,
+    ) -> None:
+        """Validates the files and prints the report of what the import would do."""
+        # The stored ids are read once, before the workers start; the
+        # validation itself never touches the database.
+        known_ids = stored_external_ids()
+        connections.close_all()
+        try:
+            report = FeedValidator(
+                paths, workers=workers, input_format=input_format
+            ).run(known_ids)
+        except (OSError, ValueError, ImportServiceError) as exc:
+            raise CommandError(f"Failed validating the files: {exc}") from exc
+        self.stdout.write(
+            f"Files: {report.files} | rows: {report.rows} | valid: {report.valid} | "
+            f"invalid: {report.invalid} | duplicates: {report.duplicates}"
+        )
+        self.stdout.write(
+            f"Would create: {report.to_create} | would update: {report.to_update}"
+        )
+        for filename, record, reason in report.errors:
+            self.stdout.write(f"  {filename} record {record}: {reason}")
+        if report.duplicate_ids:
+            self.stdout.write(
+                "  Duplicated ids: "
+                + ", ".join(
+                    f"{external_id} ({name})"
+                    for name, external_id in report.duplicate_ids
+                )
+            )
+        if not report.within(max_errors):
+            raise CommandError(
+                f"Validation failed: {report.invalid} invalid rows "
+                f"(max errors: {max_errors or 0})"
+            )
+        self.stdout.write(self.style.SUCCESS("Validation passed, nothing imported"))
@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from point_of_interest.aggregates import rebuild_category_stats, rebuild_map_clusters
+
+
+class Command(BaseCommand):
+    help = "Recompute the PoI summary tables from a full scan, to repair any drift."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="Number of PoIs fetched per query.",
+        )
+
+    def handle(self, *args: Any, **opts: Any) -> None:
+        categories = rebuild_category_stats(chunk_size=opts["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Category statistics rebuilt: {categories} categories")
+        )
+        cells = rebuild_map_clusters(chunk_size=opts["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Map clusters rebuilt: {cells} cells"))
@@ -0,0 +1,35 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.reload import discard_previous_tables, rollback_full_reload
+
+
+class Command(BaseCommand):
+    help = "Restore the PoI tables replaced by the last full reload, or discard them."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--discard",
+            action="store_true",
+            help="Drop the previous PoI and summary tables instead of restoring them.",
+        )
+
+    def handle(self, *args: Any, **opts: Any) -> None:
+        if opts["discard"]:
+            if discard_previous_tables():
+                self.stdout.write(self.style.SUCCESS("Dropped the previous PoI tables"))
+            else:
+                self.stdout.write(self.style.WARNING("No previous PoI tables to drop"))
+            return
+        try:
+            rollback_full_reload()
+        except ImportServiceError as exc:
+            self.stderr.write(self.style.ERROR(str(exc)))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Previous PoI tables restored; run it again to undo the rollback"
+            )
+        )
@@ -0,0 +1,156 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import close_old_connections, connections
+
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.rejects import ErrorBudget
+from point_of_interest.services import (
+    claim_import_job,
+    reclaim_stale_import_jobs,
+    run_import_job,
+)
+from point_of_interest.throttle import WriteThrottle
+
+
+class Command(BaseCommand):
+    help = "Run the PoI import jobs queued from the admin, polling the database."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of jobs processed in parallel (threads).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the pending jobs and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            help=(
+                "Re-queue running jobs without progress for this many seconds, "
+                "left by a crashed worker (default: IMPORT_JOB_STALE_SECONDS)."
+            ),
+        )
+        parser.add_argument(
+            "--chunksize",
+            type=int,
+            default=100_000,
+            help="Chunk size for CSV/JSON.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Batch size for bulk ops.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            help=(
+                "Skip invalid rows of each job, writing them to a reject file, "
+                "until more than N rows (or N%% of the rows read) are rejected."
+            ),
+        )
+        parser.add_argument(
+            "--max-rows-per-second",
+            type=float,
+            help="Write budget: rows written per second (default: IMPORT_MAX_ROWS_PER_SECOND).",
+        )
+        parser.add_argument(
+            "--max-transactions-per-second",
+            type=float,
+            help="Write budget: transactions per second (default: IMPORT_MAX_TRANSACTIONS_PER_SECOND).",
+        )
+        parser.add_argument(
+            "--max-commit-latency",
+            type=float,
+            help="Back off while a write transaction takes longer than this many seconds.",
+        )
+        parser.add_argument(
+            "--max-replica-lag",
+            type=float,
+            help="Back off while the read replicas lag more than this many seconds.",
+        )
+
+    def handle(self, *args: Any, **opts: Any) -> None:
+        if opts["max_errors"] is not None:
+            try:
+                opts["max_errors"] = ErrorBudget.parse(opts["max_errors"])
+            except ValueError as exc:
+                raise CommandError(f"--max-errors: {exc}") from exc
+        # One budget for all the jobs of the worker, whatever the concurrency.
+        opts["throttle"] = WriteThrottle.from_settings(
+            max_rows_per_second=opts["max_rows_per_second"],
+            max_transactions_per_second=opts["max_transactions_per_second"],
+            max_commit_latency=opts["max_commit_latency"],
+            max_lag=opts["max_replica_lag"],
+        )
+        if opts["stale_after"] is None:
+            opts["stale_after"] = settings.IMPORT_JOB_STALE_SECONDS
+        if opts["stale_after"] <= 0:
+            raise CommandError("--stale-after must be positive.")
+        concurrency: int = max(1, opts["concurrency"])
+        if concurrency == 1:
+            self._work(opts)
+            return
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(self._thread_work, opts) for _ in range(concurrency)]
+            for future in futures:
+                future.result()
+
+    def _thread_work(self, opts: dict[str, Any]) -> None:
+        """Runs the worker loop in a pool thread, closing its DB connections at exit."""
+        try:
+            self._work(opts)
+        finally:
+            connections.close_all()
+
+    def _work(self, opts: dict[str, Any]) -> None:
+        """Claims and runs jobs until the queue is empty (--once) or forever."""
+        while True:
+            # Each poll is handled like a request: connections past
+            # DB_CONN_MAX_AGE or broken are replaced, pooled ones returned.
+            close_old_connections()
+            reclaimed = reclaim_stale_import_jobs(opts["stale_after"])
+            if reclaimed:
+                self.stdout.write(f"Re-queued {reclaimed} stale running job(s)")
+            record = claim_import_job()
+            if record is None:
+                if opts["once"]:
+                    return
+                time.sleep(opts["poll_interval"])
+                continue
+            self.stdout.write(f"Importing '{record.filename}' ({record.pk})")
+            try:
+                stats = run_import_job(
+                    record,
+                    chunksize=opts["chunksize"],
+                    batch_size=opts["batch_size"],
+                    max_errors=opts["max_errors"],
+                    throttle=opts["throttle"],
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Finished '{record.filename}' | "
+                        f"created: {stats.created} | updated: {stats.updated} | "
+                        f"rejected: {stats.rejected} | "
+                        f"throttled: {stats.throttled_seconds:.1f} s"
+                    )
+                )
+            except ImportServiceError as exc:
+                self.stderr.write(self.style.ERROR(str(exc)))
+            except Exception as exc:  # noqa: BLE001
+                self.stderr.write(self.style.ERROR(f"Unexpected error: {exc}"))
@@ -0,0 +1,96 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import IntegrityError
+
+from point_of_interest.aggregates import rebuild_category_stats, rebuild_map_clusters
+from point_of_interest.caching import bump_data_version
+from point_of_interest.seeding import seed_import_history, seed_pois
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load synthetic PoIs (and import history records) for load tests,"
+        " after the PoIs already stored."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("rows", type=int, help="Number of PoIs to create.")
+        parser.add_argument(
+            "--categories",
+            type=int,
+            default=300,
+            help="Number of categories the PoIs are spread over.",
+        )
+        parser.add_argument(
+            "--imports",
+            type=int,
+            default=0,
+            help="Number of finished import history records to create.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Number of PoIs written per transaction.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the generated data."
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Keep the secondary indexes up to date while loading (slower).",
+        )
+        parser.add_argument(
+            "--skip-aggregates",
+            action="store_true",
+            help="Do not rebuild the category statistics and map clusters.",
+        )
+
+    def handle(self, *args: Any, **opts: Any) -> None:
+        if opts["rows"] < 0 or opts["imports"] < 0:
+            raise CommandError("The numbers of PoIs and imports cannot be negative.")
+        if opts["categories"] < 1 or opts["batch_size"] < 1:
+            raise CommandError("--categories and --batch-size must be positive.")
+        started = time.monotonic()
+        report_every = max(opts["rows"] // 10, opts["batch_size"])
+
+        def on_batch(written: int) -> None:
+            if written % report_every < opts["batch_size"] or written == opts["rows"]:
+                rate = written / max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f"{written:,} PoIs written ({rate:,.0f} rows/s)")
+
+        try:
+            created = seed_pois(
+                opts["rows"],
+                categories=opts["categories"],
+                batch_size=opts["batch_size"],
+                seed=opts["seed"],
+                defer_indexes=not opts["keep_indexes"],
+                on_batch=on_batch,
+            )
+        except IntegrityError as error:
+            raise CommandError(f"Seeding failed: {error}") from error
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"PoIs created: {created:,} in {time.monotonic() - started:.1f} s"
+            )
+        )
+        if opts["imports"]:
+            records = seed_import_history(opts["imports"], seed=opts["seed"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Import records created: {records:,}")
+            )
+        if not opts["skip_aggregates"]:
+            started = time.monotonic()
+            categories = rebuild_category_stats()
+            cells = rebuild_map_clusters()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Summaries rebuilt: {categories} categories, {cells:,} cells"
+                    f" in {time.monotonic() - started:.1f} s"
+                )
+            )
+        bump_data_version()
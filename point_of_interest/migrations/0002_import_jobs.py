@@ -0,0 +1,98 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="eta_seconds",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="file",
+            field=models.FileField(blank=True, upload_to="imports/"),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="finished_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="path",
+            field=models.CharField(
+                blank=True, max_length=512, verbose_name="Server path"
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="rows_per_second",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="rows_processed",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="rows_total",
+            field=models.PositiveBigIntegerField(
+                blank=True, null=True, verbose_name="Estimated rows"
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="stats",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("running", "Running"),
+                    ("succeeded", "Succeeded"),
+                    ("failed", "Failed"),
+                ],
+                db_index=True,
+                default="succeeded",
+                max_length=16,
+            ),
+        ),
+        # Imports recorded before the job queue existed already finished.
+        migrations.AlterField(
+            model_name="historicalimportdata",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("running", "Running"),
+                    ("succeeded", "Succeeded"),
+                    ("failed", "Failed"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:16
+
+import point_of_interest.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0002_import_jobs"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalimportdata",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                storage=point_of_interest.models.ImportUploadStorage,
+                upload_to="imports/",
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    """Creates one Category per distinct category string and links every PoI."""
+    Category = apps.get_model("point_of_interest", "Category")
+    POI = apps.get_model("point_of_interest", "POI")
+    names = POI.objects.values_list("category_name", flat=True).distinct()
+    Category.objects.bulk_create(
+        [Category(name=name) for name in names], ignore_conflicts=True
+    )
+    for category in Category.objects.all():
+        POI.objects.filter(category_name=category.name).update(category=category)
+
+
+def backwards(apps, schema_editor):
+    """Copies the category names back onto the PoIs."""
+    Category = apps.get_model("point_of_interest", "Category")
+    POI = apps.get_model("point_of_interest", "POI")
+    for category in Category.objects.all():
+        POI.objects.filter(category=category).update(category_name=category.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0003_private_import_uploads"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "name",
+                    models.CharField(max_length=64, unique=True, verbose_name="Name"),
+                ),
+            ],
+            options={
+                "verbose_name": "Category",
+                "verbose_name_plural": "Categories",
+                "db_table": "poi_category",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="poi",
+            name="point_of_in_categor_53d822_idx",
+        ),
+        migrations.AlterField(
+            model_name="poi",
+            name="category",
+            field=models.CharField(
+                max_length=64, default="", verbose_name="PoI category"
+            ),
+        ),
+        migrations.RenameField(
+            model_name="poi",
+            old_name="category",
+            new_name="category_name",
+        ),
+        migrations.AddField(
+            model_name="poi",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="pois",
+                to="point_of_interest.category",
+                verbose_name="PoI category",
+            ),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name="poi",
+            name="category_name",
+        ),
+        migrations.AlterField(
+            model_name="poi",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="pois",
+                to="point_of_interest.category",
+                verbose_name="PoI category",
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+HISTOGRAM_FIELDS = (
+    "ratings_0_1",
+    "ratings_1_2",
+    "ratings_2_3",
+    "ratings_3_4",
+    "ratings_4_5",
+)
+
+
+def populate(apps, schema_editor):
+    """Computes the statistics of the PoIs already stored."""
+    POI = apps.get_model("point_of_interest", "POI")
+    CategoryStats = apps.get_model("point_of_interest", "CategoryStats")
+    stats = {}
+    rows = POI.objects.values_list("category_id", "ratings").iterator(chunk_size=10_000)
+    for category_id, ratings in rows:
+        entry = stats.get(category_id)
+        if entry is None:
+            entry = stats[category_id] = CategoryStats(category_id=category_id)
+        entry.poi_count += 1
+        for value in ratings if isinstance(ratings, list) else ():
+            try:
+                value = min(5.0, max(0.0, float(value)))
+            except (TypeError, ValueError):
+                continue
+            entry.rating_count += 1
+            entry.rating_sum += value
+            name = HISTOGRAM_FIELDS[min(int(value), len(HISTOGRAM_FIELDS) - 1)]
+            setattr(entry, name, getattr(entry, name) + 1)
+    CategoryStats.objects.bulk_create(stats.values(), batch_size=10_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0004_category_lookup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryStats",
+            fields=[
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="point_of_interest.category",
+                        verbose_name="Category",
+                    ),
+                ),
+                ("poi_count", models.BigIntegerField(default=0, verbose_name="PoIs")),
+                (
+                    "rating_count",
+                    models.BigIntegerField(default=0, verbose_name="Ratings"),
+                ),
+                ("rating_sum", models.FloatField(default=0.0)),
+                ("ratings_0_1", models.BigIntegerField(default=0, verbose_name="0-1")),
+                ("ratings_1_2", models.BigIntegerField(default=0, verbose_name="1-2")),
+                ("ratings_2_3", models.BigIntegerField(default=0, verbose_name="2-3")),
+                ("ratings_3_4", models.BigIntegerField(default=0, verbose_name="3-4")),
+                ("ratings_4_5", models.BigIntegerField(default=0, verbose_name="4-5")),
+            ],
+            options={
+                "verbose_name": "Category statistics",
+                "verbose_name_plural": "Category statistics",
+                "db_table": "poi_category_stats",
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
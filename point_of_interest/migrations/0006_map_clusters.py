@@ -0,0 +1,90 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:38
+
+import math
+
+from django.db import migrations, models
+
+CLUSTER_ZOOMS = (2, 4, 6, 8, 10, 12)
+CLUSTER_CELL_BITS = 3
+MAX_LATITUDE = 85.05112878
+ALL_CATEGORIES = 0
+
+
+def populate(apps, schema_editor):
+    """Computes the map clusters of the PoIs already stored."""
+    POI = apps.get_model("point_of_interest", "POI")
+    MapCluster = apps.get_model("point_of_interest", "MapCluster")
+    cells = {}
+    rows = POI.objects.values_list("category_id", "latitude", "longitude")
+    for category_id, latitude, longitude in rows.iterator(chunk_size=10_000):
+        if not (math.isfinite(latitude) and math.isfinite(longitude)):
+            continue
+        sin = math.sin(math.radians(min(MAX_LATITUDE, max(-MAX_LATITUDE, latitude))))
+        fx = min(max((longitude + 180.0) / 360.0, 0.0), 1.0)
+        fy = min(max(0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi), 0.0), 1.0)
+        for zoom in CLUSTER_ZOOMS:
+            size = 1 << (zoom + CLUSTER_CELL_BITS)
+            x, y = min(int(fx * size), size - 1), min(int(fy * size), size - 1)
+            for category in (category_id, ALL_CATEGORIES):
+                cell = cells.setdefault((zoom, category, x, y), [0, 0.0, 0.0])
+                cell[0] += 1
+                cell[1] += latitude
+                cell[2] += longitude
+    MapCluster.objects.bulk_create(
+        [
+            MapCluster(
+                zoom=zoom,
+                category=category,
+                x=x,
+                y=y,
+                count=count,
+                latitude_sum=lat,
+                longitude_sum=lon,
+            )
+            for (zoom, category, x, y), (count, lat, lon) in cells.items()
+        ],
+        batch_size=10_000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0005_category_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MapCluster",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("zoom", models.PositiveSmallIntegerField()),
+                ("category", models.PositiveIntegerField(verbose_name="Category id")),
+                ("x", models.PositiveIntegerField()),
+                ("y", models.PositiveIntegerField()),
+                ("count", models.BigIntegerField(default=0)),
+                ("latitude_sum", models.FloatField(default=0.0)),
+                ("longitude_sum", models.FloatField(default=0.0)),
+            ],
+            options={
+                "verbose_name": "Map cluster",
+                "verbose_name_plural": "Map clusters",
+                "db_table": "poi_map_cluster",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("zoom", "category", "x", "y"),
+                        name="unique_map_cluster_cell",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0006_map_clusters"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="poi",
+            name="point_of_in_externa_96d9fb_idx",
+        ),
+        migrations.AlterField(
+            model_name="poi",
+            name="external_id",
+            field=models.CharField(max_length=128, verbose_name="PoI external ID"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0007_drop_redundant_external_id_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="reject_path",
+            field=models.CharField(
+                blank=True, max_length=512, verbose_name="Rejected rows file"
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="rows_rejected",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
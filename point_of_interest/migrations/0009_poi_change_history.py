@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0008_import_rejects"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="POIChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("poi_id", models.UUIDField(verbose_name="PoI internal ID")),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("diff", models.JSONField(verbose_name="Previous values")),
+                (
+                    "import_run",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="poi_changes",
+                        to="point_of_interest.historicalimportdata",
+                        verbose_name="Import",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "PoI change",
+                "verbose_name_plural": "PoI changes",
+                "db_table": "poi_change",
+                "indexes": [
+                    models.Index(fields=["poi_id", "-id"], name="poi_change_poi_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0009_poi_change_history"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateCandidate",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("poi_a", models.UUIDField(verbose_name="PoI A internal ID")),
+                ("poi_b", models.UUIDField(verbose_name="PoI B internal ID")),
+                (
+                    "external_id_a",
+                    models.CharField(max_length=128, verbose_name="External ID A"),
+                ),
+                (
+                    "external_id_b",
+                    models.CharField(max_length=128, verbose_name="External ID B"),
+                ),
+                ("name_a", models.CharField(max_length=255, verbose_name="Name A")),
+                ("name_b", models.CharField(max_length=255, verbose_name="Name B")),
+                ("distance", models.FloatField(verbose_name="Distance (m)")),
+                ("name_similarity", models.FloatField()),
+                ("score", models.FloatField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending review"),
+                            ("confirmed", "Confirmed duplicate"),
+                            ("dismissed", "Not a duplicate"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "detected_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Duplicate candidate",
+                "verbose_name_plural": "Duplicate candidates",
+                "db_table": "poi_duplicate_candidate",
+                "ordering": ["-score"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "-score"], name="poi_duplicate_review_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("poi_a", "poi_b"), name="unique_duplicate_pair"
+                    )
+                ],
+            },
+        ),
+    ]
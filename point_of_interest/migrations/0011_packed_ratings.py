@@ -0,0 +1,87 @@
+from django.db import migrations, models
+
+import point_of_interest.fields
+
+BATCH_SIZE = 10_000
+
+
+def _clean(values):
+    """Returns the numeric ratings of a JSON list, skipping invalid ones."""
+    if not isinstance(values, (list, tuple)):
+        return []
+    ratings = []
+    for value in values:
+        try:
+            ratings.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    return ratings
+
+
+def _copy(apps, schema_editor, source, target, convert):
+    """Copies a ratings column into another one, in batches walking the primary key."""
+    POI = apps.get_model("point_of_interest", "POI")
+    db = schema_editor.connection.alias
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    field = POI._meta.get_field(target)
+    pk = POI._meta.pk
+    sql = (
+        f"UPDATE {quote(POI._meta.db_table)} SET {quote(field.column)} = %s "
+        f"WHERE {quote(pk.column)} = %s"
+    )
+    rows = POI.objects.using(db).order_by("pk").values_list("pk", source)
+    last = None
+    while True:
+        batch = list(
+            (rows if last is None else rows.filter(pk__gt=last))[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                sql,
+                [
+                    (
+                        field.get_db_prep_save(convert(value), connection),
+                        pk.get_db_prep_save(key, connection),
+                    )
+                    for key, value in batch
+                ],
+            )
+        last = batch[-1][0]
+
+
+def pack_ratings(apps, schema_editor):
+    """Packs the JSON ratings of every PoI into 16-bit hundredths."""
+    _copy(apps, schema_editor, "ratings", "packed_ratings", _clean)
+
+
+def unpack_ratings(apps, schema_editor):
+    """Writes the packed ratings back as JSON lists."""
+    _copy(apps, schema_editor, "packed_ratings", "ratings", list)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0010_duplicate_candidates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poi",
+            name="packed_ratings",
+            field=point_of_interest.fields.RatingsField(blank=True, default=list),
+        ),
+        migrations.RunPython(pack_ratings, unpack_ratings, elidable=True),
+        migrations.RemoveField(
+            model_name="poi",
+            name="ratings",
+        ),
+        migrations.RenameField(
+            model_name="poi",
+            old_name="packed_ratings",
+            new_name="ratings",
+        ),
+    ]
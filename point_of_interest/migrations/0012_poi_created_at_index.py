@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0011_packed_ratings"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="poi",
+            index=models.Index(fields=["created_at", "id"], name="poi_created_at_idx"),
+        ),
+    ]
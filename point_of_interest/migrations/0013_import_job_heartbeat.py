@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0012_poi_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalimportdata",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
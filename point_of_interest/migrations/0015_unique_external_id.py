@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:48
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+
+def rename_duplicate_external_ids(apps, schema_editor):
+    """Renames the older PoIs sharing an external_id, before it becomes unique.
+
+    Imports before the upsert inserted a new row for an external_id that was
+    already stored instead of updating it. The most recently updated PoI keeps
+    the external_id; the others are kept too, as ``<external_id>~<id>``, and
+    logged, so they can be reviewed and deleted from the admin.
+    """
+    POI = apps.get_model("point_of_interest", "POI")
+    db = schema_editor.connection.alias
+    max_length = POI._meta.get_field("external_id").max_length
+    duplicated = list(
+        POI.objects.using(db)
+        .values("external_id")
+        .annotate(rows=Count("pk"))
+        .filter(rows__gt=1)
+        .values_list("external_id", flat=True)
+    )
+    for external_id in duplicated:
+        stale = (
+            POI.objects.using(db)
+            .filter(external_id=external_id)
+            .order_by("-updated_at", "-created_at", "-pk")[1:]
+        )
+        for poi in stale:
+            suffix = f"~{poi.pk}"
+            renamed = external_id[: max_length - len(suffix)] + suffix
+            logger.warning(
+                "PoI %s (%s) shares the external_id %r: renamed to %r.",
+                poi.pk,
+                poi.name,
+                external_id,
+                renamed,
+            )
+            POI.objects.using(db).filter(pk=poi.pk).update(external_id=renamed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("point_of_interest", "0014_data_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_external_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="poi",
+            constraint=models.UniqueConstraint(
+                fields=("external_id",), name="unique_external_id"
+            ),
+        ),
+    ]
@@ -1,20 +1,110 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
 from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
 from statistics import mean
-from typing import Optional
-from uuid import uuid4
+from typing import Any, Optional, Sequence
+from uuid import UUID, uuid4
 
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
+from django.utils import timezone
+
+from point_of_interest.enums import DuplicateStatus, ImportStatus, SourceType
+from point_of_interest.fields import Ratings, RatingsField, ratings_average
+
+
+class ImportUploadStorage(FileSystemStorage):
+    """Storage for uploaded import files, kept outside the publicly served MEDIA_ROOT.
+
+    The location is read from ``IMPORT_UPLOAD_ROOT`` on every access and the
+    storage has no base URL, so uploads are never reachable over HTTP.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(base_url=None)
+
+    @property
+    def base_location(self) -> str:
+        return str(settings.IMPORT_UPLOAD_ROOT)
+
+    @property
+    def location(self) -> str:
+        return os.path.abspath(self.base_location)
 
-from point_of_interest.enums import SourceType
+
+def average_rating(ratings: Sequence[Any]) -> float:
+    """Returns the average of ratings, limited between 0 and 5, with 2 decimal places."""
+    if isinstance(ratings, Ratings):
+        # Stored ratings are already limited: average the hundredths as they are.
+        return ratings_average(ratings.packed) or 0.0
+    try:
+        data = [min(5.0, max(0.0, float(x))) for x in ratings]
+        return round(sum(data) / len(data), 2) if data else 0.0
+    except Exception:
+        return 0.0
 
 
 class HistoricalImportData(models.Model):
-    """Historical Import Data model"""
+    """Historical Import Data model, also used as the queue of background import jobs."""
 
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
-    source = models.CharField(max_length=8, choices=SourceType.choices, db_index=True)
-    filename = models.CharField(max_length=256, null=False, blank=False)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    id: models.UUIDField[UUID, UUID] = models.UUIDField(
+        primary_key=True, default=uuid4, editable=False
+    )
+    source: models.CharField[str, str] = models.CharField(
+        max_length=8, choices=SourceType.choices, db_index=True
+    )
+    filename: models.CharField[str, str] = models.CharField(
+        max_length=256, null=False, blank=False
+    )
+    timestamp: models.DateTimeField[datetime, datetime] = models.DateTimeField(
+        auto_now_add=True
+    )
+    status: models.CharField[str, str] = models.CharField(
+        max_length=16,
+        choices=ImportStatus.choices,
+        default=ImportStatus.PENDING,
+        db_index=True,
+    )
+    file = models.FileField(
+        upload_to="imports/", storage=ImportUploadStorage, blank=True
+    )
+    path: models.CharField[str, str] = models.CharField(
+        max_length=512, blank=True, verbose_name="Server path"
+    )
+    rows_processed: models.PositiveBigIntegerField[int, int] = (
+        models.PositiveBigIntegerField(default=0)
+    )
+    rows_total: models.PositiveBigIntegerField[int | None, int | None] = (
+        models.PositiveBigIntegerField(
+            null=True, blank=True, verbose_name="Estimated rows"
+        )
+    )
+    rows_rejected: models.PositiveBigIntegerField[int, int] = (
+        models.PositiveBigIntegerField(default=0)
+    )
+    reject_path: models.CharField[str, str] = models.CharField(
+        max_length=512, blank=True, verbose_name="Rejected rows file"
+    )
+    rows_per_second: models.FloatField[float, float] = models.FloatField(default=0.0)
+    eta_seconds: models.FloatField[float | None, float | None] = models.FloatField(
+        null=True, blank=True
+    )
+    stats = models.JSONField(default=dict, blank=True)
+    error: models.TextField[str, str] = models.TextField(blank=True, default="")
+    started_at: models.DateTimeField[datetime | None, datetime | None] = (
+        models.DateTimeField(null=True, blank=True)
+    )
+    # Saved by the worker with the progress of every batch.
+    heartbeat_at: models.DateTimeField[datetime | None, datetime | None] = (
+        models.DateTimeField(null=True, blank=True)
+    )
+    finished_at: models.DateTimeField[datetime | None, datetime | None] = (
+        models.DateTimeField(null=True, blank=True)
+    )
 
     class Meta:
         verbose_name = "Historical Import Data"
@@ -22,42 +112,90 @@ class HistoricalImportData(models.Model):
         db_table = "historical_import_data"
         ordering = ["-timestamp"]
 
+    def __str__(self) -> str:
+        return f"[{self.status}] {self.filename}"
+
+    @property
+    def source_path(self) -> Path:
+        """Returns the file to import: the uploaded file or the server path."""
+        return Path(self.file.path) if self.file else Path(self.path)
+
+    @property
+    def eta(self) -> Optional[timedelta]:
+        """Returns the estimated remaining time of a running import."""
+        if self.eta_seconds is None:
+            return None
+        return timedelta(seconds=round(self.eta_seconds))
+
+
+class Category(models.Model):
+    """PoI category, stored once and referenced by a small integer key."""
+
+    id: models.AutoField[int, int] = models.AutoField(primary_key=True)
+    name: models.CharField[str, str] = models.CharField(
+        max_length=64, unique=True, verbose_name="Name"
+    )
+
+    class Meta:
+        verbose_name = "Category"
+        verbose_name_plural = "Categories"
+        db_table = "poi_category"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
 
 class POI(models.Model):
     """Point of Interest model"""
 
-    id = models.UUIDField(
+    id: models.UUIDField[UUID, UUID] = models.UUIDField(
         primary_key=True,
         default=uuid4,
         editable=False,
         verbose_name="PoI internal ID",
     )
-    external_id = models.CharField(
-        max_length=128, db_index=True, verbose_name="PoI external ID"
+    external_id: models.CharField[str, str] = models.CharField(
+        max_length=128, verbose_name="PoI external ID"
+    )
+    name: models.CharField[str, str] = models.CharField(
+        max_length=255, db_index=True, verbose_name="PoI name"
+    )
+    latitude: models.FloatField[float, float] = models.FloatField()
+    longitude: models.FloatField[float, float] = models.FloatField()
+    category: models.ForeignKey[Category, Category] = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        related_name="pois",
+        verbose_name="PoI category",
+    )
+    category_id: int
+    ratings = RatingsField(default=list, blank=True)
+    description: models.TextField[str, str] = models.TextField(blank=True, default="")
+    created_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(
+        auto_now_add=True
     )
-    name = models.CharField(max_length=255, db_index=True, verbose_name="PoI name")
-    latitude = models.FloatField()
-    longitude = models.FloatField()
-    category = models.CharField(
-        max_length=64, db_index=True, verbose_name="PoI category"
+    updated_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(
+        auto_now=True
     )
-    ratings = models.JSONField(default=list, blank=True)
-    description = models.TextField(blank=True, default="")
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Stored values of an edited PoI, kept by a pre_save receiver for the
+    # summary tables and the change history.
+    _previous_values: dict[str, Any] | None
 
     class Meta:
         verbose_name = "Point Of Interest"
         verbose_name_plural = "Point Of Interest"
         db_table = "point_of_interest"
-        indexes = [
-            models.Index(fields=["category"]),
-            models.Index(fields=["external_id"]),
-        ]
         constraints = [
+            # The only index on external_id: it serves every lookup by it.
             models.UniqueConstraint(fields=["external_id"], name="unique_external_id")
         ]
         ordering = ["created_at"]
+        indexes = [
+            # The admin changelist order: a total one, so pages are read
+            # straight from the index, without sorting the table.
+            models.Index(fields=["created_at", "id"], name="poi_created_at_idx")
+        ]
 
     def __str__(self) -> str:
         return f"[{self.id}] {self.name} ({self.external_id})"
@@ -65,8 +203,228 @@ class POI(models.Model):
     @property
     def avg_rating(self) -> float:
         """Returns the average of ratings, limited between 0 and 5, with 2 decimal places."""
-        try:
-            data = [min(5.0, max(0.0, float(x))) for x in self.ratings]
-            return round(sum(data) / len(data), 2) if data else 0.0
-        except Exception:
-            return 0.0
+        return average_rating(self.ratings)
+
+
+class POIChange(models.Model):
+    """Append-only change history of the PoIs, one row per PoI update.
+
+    ``diff`` is a reverse diff: the previous values of only the fields that
+    changed, so any past version is rebuilt from the current row by applying
+    the diffs of the newer changes. ``poi_id`` is not a foreign key: the history
+    outlives deleted PoIs and full reloads, which need no table to reference
+    the PoIs.
+    """
+
+    id: models.BigAutoField[int, int] = models.BigAutoField(primary_key=True)
+    poi_id: models.UUIDField[UUID, UUID] = models.UUIDField(
+        verbose_name="PoI internal ID"
+    )
+    import_run: models.ForeignKey[
+        HistoricalImportData | None, HistoricalImportData | None
+    ] = models.ForeignKey(
+        HistoricalImportData,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="poi_changes",
+        verbose_name="Import",
+    )
+    import_run_id: UUID | None
+    changed_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(
+        default=timezone.now
+    )
+    diff = models.JSONField(verbose_name="Previous values")
+
+    class Meta:
+        verbose_name = "PoI change"
+        verbose_name_plural = "PoI changes"
+        db_table = "poi_change"
+        indexes = [models.Index(fields=["poi_id", "-id"], name="poi_change_poi_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.poi_id} @ {self.changed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class DuplicateCandidate(models.Model):
+    """A pair of PoIs that may describe the same place, for manual review.
+
+    Written by the ``find_duplicate_pois`` command. The pair is stored once,
+    ``poi_a`` being the lower id; the names and external ids are copied so the
+    review list never joins the PoI table. Like ``POIChange.poi_id`` the PoI
+    ids are not foreign keys, which full reloads require.
+    """
+
+    id: models.BigAutoField[int, int] = models.BigAutoField(primary_key=True)
+    poi_a: models.UUIDField[UUID, UUID] = models.UUIDField(
+        verbose_name="PoI A internal ID"
+    )
+    poi_b: models.UUIDField[UUID, UUID] = models.UUIDField(
+        verbose_name="PoI B internal ID"
+    )
+    external_id_a: models.CharField[str, str] = models.CharField(
+        max_length=128, verbose_name="External ID A"
+    )
+    external_id_b: models.CharField[str, str] = models.CharField(
+        max_length=128, verbose_name="External ID B"
+    )
+    name_a: models.CharField[str, str] = models.CharField(
+        max_length=255, verbose_name="Name A"
+    )
+    name_b: models.CharField[str, str] = models.CharField(
+        max_length=255, verbose_name="Name B"
+    )
+    distance: models.FloatField[float, float] = models.FloatField(
+        verbose_name="Distance (m)"
+    )
+    name_similarity: models.FloatField[float, float] = models.FloatField()
+    score: models.FloatField[float, float] = models.FloatField()
+    status: models.CharField[str, str] = models.CharField(
+        max_length=16,
+        choices=DuplicateStatus.choices,
+        default=DuplicateStatus.PENDING,
+    )
+    detected_at: models.DateTimeField[datetime, datetime] = models.DateTimeField(
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = "Duplicate candidate"
+        verbose_name_plural = "Duplicate candidates"
+        db_table = "poi_duplicate_candidate"
+        ordering = ["-score"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["poi_a", "poi_b"], name="unique_duplicate_pair"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["status", "-score"], name="poi_duplicate_review_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name_a} ({self.external_id_a}) ~ {self.name_b} ({self.external_id_b})"
+
+
+class CategoryStats(models.Model):
+    """Per-category summary of the PoIs and their ratings.
+
+    Kept up to date incrementally by the importer and the model signals; the
+    ``rebuild_aggregates`` command recomputes it from scratch.
+    """
+
+    category: models.OneToOneField[Category, Category] = models.OneToOneField(
+        Category,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="stats",
+        verbose_name="Category",
+    )
+    category_id: int
+    poi_count: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="PoIs"
+    )
+    rating_count: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="Ratings"
+    )
+    rating_sum: models.FloatField[float, float] = models.FloatField(default=0.0)
+    ratings_0_1: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="0-1"
+    )
+    ratings_1_2: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="1-2"
+    )
+    ratings_2_3: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="2-3"
+    )
+    ratings_3_4: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="3-4"
+    )
+    ratings_4_5: models.BigIntegerField[int, int] = models.BigIntegerField(
+        default=0, verbose_name="4-5"
+    )
+
+    HISTOGRAM_FIELDS = (
+        "ratings_0_1",
+        "ratings_1_2",
+        "ratings_2_3",
+        "ratings_3_4",
+        "ratings_4_5",
+    )
+
+    class Meta:
+        verbose_name = "Category statistics"
+        verbose_name_plural = "Category statistics"
+        db_table = "poi_category_stats"
+
+    def __str__(self) -> str:
+        return f"{self.category_id}: {self.poi_count} PoIs"
+
+    @property
+    def avg_rating(self) -> Optional[float]:
+        """Returns the average of every rating of the category, with 2 decimal places."""
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def histogram(self) -> list[int]:
+        """Returns the number of ratings per one-star bucket, from 0-1 to 4-5."""
+        return [getattr(self, name) for name in self.HISTOGRAM_FIELDS]
+
+
+class MapCluster(models.Model):
+    """PoI count and coordinate sums of a map grid cell, per zoom level and category.
+
+    ``zoom`` is the map zoom level the cell is served for and ``x``/``y`` the
+    cell coordinates on a Web Mercator grid a few levels finer than the map
+    tiles of that zoom (see ``point_of_interest.aggregates``). ``category`` is
+    a Category id, or ``ALL_CATEGORIES`` for the totals of the cell, so
+    unfiltered viewports never have to sum the per-category rows.
+    """
+
+    ALL_CATEGORIES = 0
+
+    zoom: models.PositiveSmallIntegerField[int, int] = (
+        models.PositiveSmallIntegerField()
+    )
+    category: models.PositiveIntegerField[int, int] = models.PositiveIntegerField(
+        verbose_name="Category id"
+    )
+    x: models.PositiveIntegerField[int, int] = models.PositiveIntegerField()
+    y: models.PositiveIntegerField[int, int] = models.PositiveIntegerField()
+    count: models.BigIntegerField[int, int] = models.BigIntegerField(default=0)
+    latitude_sum: models.FloatField[float, float] = models.FloatField(default=0.0)
+    longitude_sum: models.FloatField[float, float] = models.FloatField(default=0.0)
+
+    class Meta:
+        verbose_name = "Map cluster"
+        verbose_name_plural = "Map clusters"
+        db_table = "poi_map_cluster"
+        constraints = [
+            # Also serves the viewport queries: zoom and category equality, then
+            # x/y ranges.
+            models.UniqueConstraint(
+                fields=["zoom", "category", "x", "y"], name="unique_map_cluster_cell"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.zoom}/{self.x}/{self.y} [{self.category}]: {self.count}"
+
+
+class DataVersion(models.Model):
+    """Version of the PoI data, keying the API responses and their ETags.
+
+    A single row, bumped by every committed write, stored with the data so
+    every process (and replica) agrees on it.
+    """
+
+    version: models.BigIntegerField[int, int] = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Data version"
+        db_table = "poi_data_version"
+
+    def __str__(self) -> str:
+        return str(self.version)
@@ -0,0 +1,304 @@
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from point_of_interest.enums import SourceType
+
+RATINGS_SEPARATORS = re.compile(r"[,\|\;\s]+")
+
+
+@dataclass(frozen=True, slots=True)
+class FieldPlan:
+    """FieldPlan dataclasses describing where each PoI field lives in a raw row."""
+
+    external_id: str
+    name: str
+    category: str
+    ratings: str
+    description: str
+    latitude: str | None = None
+    longitude: str | None = None
+    coordinates: str | None = None
+
+
+FIELD_PLANS: dict[str, FieldPlan] = {
+    SourceType.CSV: FieldPlan(
+        external_id="poi_id",
+        name="poi_name",
+        latitude="poi_latitude",
+        longitude="poi_longitude",
+        category="poi_category",
+        ratings="poi_ratings",
+        description="poi_description",
+    ),
+    SourceType.JSON: FieldPlan(
+        external_id="id",
+        name="name",
+        coordinates="coordinates",
+        category="category",
+        ratings="ratings",
+        description="description",
+    ),
+    SourceType.XML: FieldPlan(
+        external_id="pid",
+        name="pname",
+        latitude="platitude",
+        longitude="plongitude",
+        category="pcategory",
+        ratings="pratings",
+        description="pdescription",
+    ),
+}
+
+
+_RATING_VALUES: dict[Any, float | None] = {}
+_RATING_VALUES_LIMIT = 65_536
+
+
+def _clamp_rating(value: Any) -> float | None:
+    """Converts a single rating value, memoizing the result of repeated tokens."""
+    try:
+        val = float(value)
+    except (TypeError, ValueError):
+        val = None
+    else:
+        val = round(min(5.0, max(0.0, val)), 2)
+    if len(_RATING_VALUES) < _RATING_VALUES_LIMIT:
+        try:
+            _RATING_VALUES[value] = val
+        except TypeError:
+            pass
+    return val
+
+
+def _clamp_ratings(sequence: list[Any] | tuple[Any, ...]) -> list[float]:
+    """Converts each value to float, limited between 0 and 5 with 2 decimal places."""
+    cache = _RATING_VALUES
+    try:
+        values = [cache[value] for value in sequence]
+    except (KeyError, TypeError):
+        values = [_clamp_rating(value) for value in sequence]
+    return [value for value in values if value is not None]
+
+
+def parse_ratings(raw: Any) -> list[float]:
+    """Function to convert a raw ratings value into a list of floats.
+    Args:
+        raw (Any): JSON array string, separated string, number or sequence.
+    Raises:
+        TypeError: If the raw value has an unsupported type.
+    Returns:
+        list[float]: Ratings limited between 0 and 5, with 2 decimal places.
+    """
+    if raw is None or raw == "":
+        return []
+    if isinstance(raw, (list, tuple)):
+        return _clamp_ratings(raw)
+    if isinstance(raw, (int, float)):
+        return _clamp_ratings((raw,))
+    if isinstance(raw, str):
+        context = raw.strip()
+        if context.startswith("[") and context.endswith("]"):
+            try:
+                return _clamp_ratings(json.loads(context))
+            except Exception:
+                return []
+        return _clamp_ratings([p for p in RATINGS_SEPARATORS.split(context) if p])
+    raise TypeError(f"Unsupported ratings value: {raw!r}")
+
+
+def _coordinate(value: Any) -> float:
+    """Converts a latitude or longitude, rejecting missing and non-finite values."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Invalid coordinate: {value!r}")
+    return number
+
+
+def parse_coordinates(coords: Any) -> tuple[float, float]:
+    """Function to extract (latitude, longitude) from a JSON coordinates value.
+    Args:
+        coords (Any): A [lat, lon] list or a {latitude, longitude} object.
+    Raises:
+        ValueError: If the coordinates are invalid or missing.
+    Returns:
+        tuple[float, float]: The latitude and longitude pair.
+    """
+    lat, lon = None, None
+    if isinstance(coords, (list, tuple)) and len(coords) >= 2:
+        try:
+            lat = _coordinate(coords[0])
+            lon = _coordinate(coords[1])
+        except (TypeError, ValueError):
+            lat, lon = None, None
+    elif isinstance(coords, dict):
+        try:
+            lat_raw = coords.get("latitude")
+            lon_raw = coords.get("longitude")
+            lat = _coordinate(lat_raw) if lat_raw is not None else None
+            lon = _coordinate(lon_raw) if lon_raw is not None else None
+        except (TypeError, ValueError):
+            lat, lon = None, None
+    if lat is None or lon is None:
+        raise ValueError("Invalid or missing coordinates in JSON row")
+    return lat, lon
+
+
+class RecordNormalizer:
+    """Normalizes raw rows of a single source type with a precompiled field plan.
+
+    The per-source dispatch and key lookups are resolved once, when the
+    normalizer is built, so normalizing a batch only runs the extraction itself.
+    """
+
+    def __init__(self, source: str) -> None:
+        try:
+            self.plan = FIELD_PLANS[source]
+        except KeyError:
+            raise ValueError(f"Unknown source: {source}") from None
+        self.source = source
+        self._extract = self._compile(self.plan)
+
+    def __call__(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        return self._extract(row)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Returns the raw column names read by this normalizer."""
+        plan = self.plan
+        names = (
+            plan.external_id,
+            plan.name,
+            plan.latitude,
+            plan.longitude,
+            plan.coordinates,
+            plan.category,
+            plan.ratings,
+            plan.description,
+        )
+        return tuple(name for name in names if name is not None)
+
+    @property
+    def required_columns(self) -> tuple[str, ...]:
+        """Returns the raw columns every row must have: all but the optional ones."""
+        optional = (self.plan.ratings, self.plan.description)
+        return tuple(name for name in self.columns if name not in optional)
+
+    @property
+    def dtypes(self) -> dict[str, type]:
+        """Returns the declared column types used by the tabular readers."""
+        plan = self.plan
+        result: dict[str, type] = {
+            plan.external_id: str,
+            plan.name: str,
+            plan.category: str,
+            plan.description: str,
+        }
+        if plan.latitude is not None and plan.longitude is not None:
+            result[plan.latitude] = float
+            result[plan.longitude] = float
+            result[plan.ratings] = str
+        return result
+
+    @staticmethod
+    def _compile(plan: FieldPlan) -> Callable[[Mapping[str, Any]], dict[str, Any]]:
+        """Builds the extraction function for the given plan."""
+        ext_key, name_key, cat_key = plan.external_id, plan.name, plan.category
+        ratings_key, desc_key = plan.ratings, plan.description
+
+        if plan.coordinates is not None:
+            coords_key = plan.coordinates
+
+            def extract(row: Mapping[str, Any]) -> dict[str, Any]:
+                ratings = parse_ratings(row.get(ratings_key))
+                lat, lon = parse_coordinates(row.get(coords_key))
+                return {
+                    "external_id": str(row[ext_key]).strip(),
+                    "name": str(row[name_key]).strip(),
+                    "latitude": lat,
+                    "longitude": lon,
+                    "category": str(row[cat_key]).strip(),
+                    "ratings": ratings,
+                    "description": str(row.get(desc_key) or "").strip(),
+                }
+
+            return extract
+
+        lat_key, lon_key = plan.latitude, plan.longitude
+        if lat_key is None or lon_key is None:
+            raise ValueError(
+                "A field plan needs coordinates or latitude and longitude."
+            )
+
+        def extract_columns(row: Mapping[str, Any]) -> dict[str, Any]:
+            ratings = parse_ratings(row.get(ratings_key))
+            return {
+                "external_id": str(row[ext_key]).strip(),
+                "name": str(row[name_key]).strip(),
+                "latitude": _coordinate(row[lat_key]),
+                "longitude": _coordinate(row[lon_key]),
+                "category": str(row[cat_key]).strip(),
+                "ratings": ratings,
+                "description": str(row.get(desc_key) or "").strip(),
+            }
+
+        return extract_columns
+
+    def normalize_batch(
+        self, rows: Iterable[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Normalizes a batch of raw rows.
+        Args:
+            rows (Iterable[Mapping[str, Any]]): Raw rows of this normalizer's source.
+        Raises:
+            ValueError: If any row is invalid.
+        Returns:
+            list[dict[str, Any]]: Normalized records, in input order.
+        """
+        extract = self._extract
+        try:
+            return [extract(row) for row in rows]
+        except Exception as exc:
+            raise ValueError(f"Error normalizing record: {exc}") from exc
+
+    def partition_batch(
+        self, rows: Sequence[Mapping[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[tuple[int, str]]]:
+        """Normalizes a batch of raw rows, setting the invalid ones aside.
+
+        The whole batch is normalized at once first; rows are only extracted
+        one by one when that fails.
+        Args:
+            rows (Sequence[Mapping[str, Any]]): Raw rows of this normalizer's source.
+        Returns:
+            tuple: The normalized valid records, in input order, and the
+            (index in the batch, reason) pair of each invalid row.
+        """
+        try:
+            return self.normalize_batch(rows), []
+        except ValueError:
+            pass
+        extract = self._extract
+        records: list[dict[str, Any]] = []
+        errors: list[tuple[int, str]] = []
+        for index, row in enumerate(rows):
+            try:
+                records.append(extract(row))
+            except KeyError as exc:
+                errors.append((index, f"Missing field {exc}"))
+            except Exception as exc:
+                errors.append((index, str(exc) or type(exc).__name__))
+        return records, errors
+
+
+_NORMALIZERS: dict[str, RecordNormalizer] = {}
+
+
+def get_normalizer(source: str) -> RecordNormalizer:
+    """Returns the shared RecordNormalizer for the given source type."""
+    normalizer = _NORMALIZERS.get(source)
+    if normalizer is None:
+        normalizer = _NORMALIZERS[source] = RecordNormalizer(source)
+    return normalizer
@@ -0,0 +1,147 @@
+"""
+Chunked readers of the tabular source formats: CSV and JSON Lines.
+
+pandas (with NumPy) and pyarrow take hundreds of milliseconds and tens of MB
+to import, so they are loaded the first time a file of one of these formats is
+read, not when the importer modules are imported. Management commands, the
+import worker and the web processes only pay for them when they parse a file.
+"""
+
+import csv
+from functools import cache
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Sequence
+
+from point_of_interest.exceptions import ImportServiceError
+
+Source = str | Path | IO[bytes]
+
+
+@cache
+def pyarrow_csv() -> Any | None:
+    """Returns the ``pyarrow.csv`` module, or None when pyarrow is not installed."""
+    try:
+        from pyarrow import csv
+    except ImportError:  # pragma: no cover - pyarrow is optional
+        return None
+    return csv
+
+
+def csv_header(line: bytes) -> List[str]:
+    """Returns the column names of a CSV header line."""
+    text = line.decode("utf-8-sig", errors="replace")
+    return next(csv.reader([text]), [])
+
+
+def check_columns(header: Sequence[str], required: Sequence[str]) -> None:
+    """Checks that a CSV header has every required column.
+    Raises:
+        ImportServiceError: If a required column is missing.
+    """
+    missing = [name for name in required if name not in header]
+    if missing:
+        raise ImportServiceError(
+            f"Invalid data or format: missing CSV columns {', '.join(missing)}"
+        )
+
+
+def read_csv(
+    source: Source,
+    columns: Sequence[str],
+    dtypes: Mapping[str, type],
+    chunksize: int,
+    required: Sequence[str] = (),
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yields chunks of raw CSV rows, reading only the given columns.
+
+    Uses the multithreaded pyarrow CSV reader when installed, falling back to
+    the pandas C engine. Either way string columns are never type-inferred,
+    so identifiers such as ``0012`` or ``NA`` are kept exactly as written.
+    Optional columns missing from the header are read as empty values.
+    Args:
+        source (Source): Path or binary file object of the CSV file.
+        columns (Sequence[str]): Columns to read; others are skipped.
+        dtypes (Mapping[str, type]): ``str`` or ``float`` for each column.
+        chunksize (int): Number of rows per chunk.
+        required (Sequence[str]): Columns the header must have.
+    Raises:
+        ImportServiceError: If a required column is missing from the header.
+    Yields:
+        Iterator[List[Dict[str, Any]]]: Chunks of rows, keyed by column name.
+    """
+    # The header is read before the parser starts: from its own handle for a
+    # path, or consumed from a stream, which is then parsed with those names.
+    names: List[str] | None = None
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as handle:
+            header = csv_header(handle.readline())
+    else:
+        header = names = csv_header(source.readline())
+    check_columns(header, required)
+
+    pa_csv = pyarrow_csv()
+    if pa_csv is not None:
+        import pyarrow as pa
+
+        arrow_types = {
+            name: pa.string() if kind is str else pa.float64()
+            for name, kind in dtypes.items()
+        }
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(column_names=names),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=arrow_types,
+                include_columns=list(columns),
+                include_missing_columns=True,
+                strings_can_be_null=False,
+            ),
+        )
+        buffer: List[Dict[str, Any]] = []
+        for batch in reader:
+            buffer.extend(batch.to_pylist())
+            while len(buffer) >= chunksize:
+                yield buffer[:chunksize]
+                buffer = buffer[chunksize:]
+        if buffer:
+            yield buffer
+        return
+
+    import pandas as pd
+
+    float_columns = [name for name, kind in dtypes.items() if kind is float]
+    for df in pd.read_csv(
+        source,
+        chunksize=chunksize,
+        header=None if names is not None else "infer",
+        names=names,
+        usecols=lambda name: name in columns,
+        dtype=dict(dtypes),
+        keep_default_na=False,
+        na_values={name: [""] for name in float_columns},
+    ):
+        yield df.to_dict(orient="records")
+
+
+def read_json_lines(
+    source: Source,
+    columns: Sequence[str],
+    dtypes: Mapping[str, type],
+    chunksize: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yields chunks of raw JSON Lines records, keeping only the given columns.
+    Raises:
+        ValueError: If the file is not JSON Lines.
+    """
+    import pandas as pd
+
+    for df in pd.read_json(
+        source,
+        lines=True,
+        chunksize=chunksize,
+        dtype=dict(dtypes),
+        convert_dates=False,
+    ):
+        yield df[[name for name in columns if name in df.columns]].to_dict(
+            orient="records"
+        )
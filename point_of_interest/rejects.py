@@ -0,0 +1,170 @@
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, List, Mapping, Sequence, Tuple
+from xml.etree import ElementTree as ET
+
+from point_of_interest.enums import SourceType
+from point_of_interest.exceptions import ImportServiceError
+
+# (record number in the file, raw row, reason) of a row that was skipped.
+Reject = Tuple[int, Mapping[str, Any], str]
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorBudget:
+    """How many invalid rows an import may skip before it fails.
+
+    Either an absolute number of rows or a percentage of the rows read so far,
+    checked after every chunk.
+    """
+
+    limit: int | None = None
+    percent: float | None = None
+
+    @classmethod
+    def parse(cls, value: str | int) -> "ErrorBudget":
+        """Builds a budget from ``N`` (rows) or ``N%`` (of the rows read).
+        Args:
+            value (str | int): The budget, e.g. ``100`` or ``0.5%``.
+        Raises:
+            ValueError: If the value is not a non-negative number or percentage.
+        Returns:
+            ErrorBudget: The parsed budget.
+        """
+        text = str(value).strip()
+        if text.endswith("%"):
+            percent = float(text[:-1])
+            if not 0 <= percent <= 100:
+                raise ValueError(f"Invalid error budget: {value!r}")
+            return cls(percent=percent)
+        limit = int(text)
+        if limit < 0:
+            raise ValueError(f"Invalid error budget: {value!r}")
+        return cls(limit=limit)
+
+    def __str__(self) -> str:
+        return f"{self.percent:g}%" if self.percent is not None else str(self.limit)
+
+    def check(self, rejected: int, processed: int) -> None:
+        """Raises once the rejected rows exceed the budget.
+        Raises:
+            ImportServiceError: If there are more rejected rows than allowed.
+        """
+        if self.percent is not None:
+            exceeded = rejected * 100 > self.percent * processed
+        else:
+            exceeded = rejected > (self.limit or 0)
+        if exceeded:
+            raise ImportServiceError(
+                f"Too many invalid rows: {rejected} of {processed} rejected "
+                f"(max errors: {self})."
+            )
+
+
+def reject_path(path: Path, directory: Path | None = None) -> Path:
+    """Returns the reject file of a source file: ``<name>.rejects.<ext>``."""
+    return (directory or path.parent) / f"{path.stem}.rejects{path.suffix}"
+
+
+class RejectWriter:
+    """Streams the rows skipped from a source file to a file of the same format.
+
+    Each row is written as read, limited to the columns of the source schema,
+    so the file can be fixed and imported again; the source file name, the
+    record number (1-based, the header excluded) and the reason are added as
+    ``reject_*`` columns, a ``_reject`` object (JSON Lines) or attributes (XML),
+    which the importer ignores. The file is only created for the first reject.
+    """
+
+    def __init__(
+        self,
+        source_path: Path,
+        source: str,
+        columns: Sequence[str],
+        directory: Path | None = None,
+    ) -> None:
+        self.source_path = source_path
+        self.source = source
+        self.columns = list(columns)
+        self.path = reject_path(source_path, directory)
+        self.count = 0
+        self._file: IO[str] | None = None
+        self._csv: Any = None
+
+    def __enter__(self) -> "RejectWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _open(self) -> IO[str]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = self.path.open("w", encoding="utf-8", newline="")
+        match self.source:
+            case SourceType.CSV:
+                self._csv = csv.DictWriter(
+                    handle,
+                    fieldnames=[
+                        *self.columns,
+                        "reject_file",
+                        "reject_record",
+                        "reject_reason",
+                    ],
+                    extrasaction="ignore",
+                )
+                self._csv.writeheader()
+            case SourceType.XML:
+                handle.write('<?xml version="1.0" encoding="utf-8"?>\n<rejects>\n')
+        return handle
+
+    def write(self, rejects: List[Reject]) -> None:
+        """Appends a batch of skipped rows to the reject file."""
+        if not rejects:
+            return
+        if self._file is None:
+            self._file = self._open()
+        name = self.source_path.name
+        for record, row, reason in rejects:
+            values = {column: row.get(column) for column in self.columns}
+            match self.source:
+                case SourceType.CSV:
+                    self._csv.writerow(
+                        {
+                            **values,
+                            "reject_file": name,
+                            "reject_record": record,
+                            "reject_reason": reason,
+                        }
+                    )
+                case SourceType.JSON:
+                    info: Dict[str, Any] = {
+                        "file": name,
+                        "record": record,
+                        "reason": reason,
+                    }
+                    line = json.dumps({**values, "_reject": info}, default=str)
+                    self._file.write(line + "\n")
+                case SourceType.XML:
+                    node = ET.Element(
+                        "poi",
+                        reject_file=name,
+                        reject_record=str(record),
+                        reject_reason=reason,
+                    )
+                    for column, value in values.items():
+                        ET.SubElement(node, column).text = (
+                            "" if value is None else str(value)
+                        )
+                    self._file.write(ET.tostring(node, encoding="unicode") + "\n")
+        self.count += len(rejects)
+
+    def close(self) -> None:
+        """Finishes and closes the reject file, if one was written."""
+        if self._file is None:
+            return
+        if self.source == SourceType.XML:
+            self._file.write("</rejects>\n")
+        self._file.close()
+        self._file = None
@@ -0,0 +1,328 @@
+import uuid
+from typing import Any, Dict, List, Tuple, Type, cast
+
+from django.apps.registry import Apps
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils import timezone
+
+from point_of_interest.aggregates import rebuild_category_stats, rebuild_map_clusters
+from point_of_interest.bulk import SecondaryIndexes
+from point_of_interest.caching import bump_data_version
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.history import HISTORY_FIELDS
+from point_of_interest.models import POI, CategoryStats, MapCluster, POIChange
+
+# Tables replaced together by a full reload: the PoIs and their summaries.
+RELOADED_MODELS = (POI, CategoryStats, MapCluster)
+# The live PoI table as it was before the last full reload, kept for a rollback.
+PREVIOUS_TABLE = f"{POI._meta.db_table}_previous"
+
+
+def previous_table(model: Type[models.Model]) -> str:
+    """Returns the name the table of a model gets when a full reload replaces it."""
+    return f"{model._meta.db_table}_previous"
+
+
+def shadow_prefix(model: Type[models.Model]) -> str:
+    """Returns the name prefix of the shadow tables of a model."""
+    return f"{model._meta.db_table}_reload_"
+
+
+def shadow_model(model: Type[models.Model], table: str) -> Type[models.Model]:
+    """Returns an unregistered copy of a model stored in another table.
+
+    The copy lives in its own app registry, so it is invisible to the rest of
+    the project. Relations keep pointing to the real related models.
+    """
+    meta = type(
+        "Meta",
+        (),
+        {
+            "app_label": model._meta.app_label,
+            "db_table": table,
+            "apps": Apps(),
+            "constraints": [c.clone() for c in model._meta.constraints],
+            "indexes": [index.clone() for index in model._meta.indexes],
+        },
+    )
+    attrs: Dict[str, Any] = {"__module__": __name__, "Meta": meta}
+    for field in model._meta.local_fields:
+        name, _, args, kwargs = field.deconstruct()
+        if field.is_relation:
+            kwargs["to"] = field.related_model
+            kwargs["related_name"] = "+"
+        attrs[name] = field.__class__(*args, **kwargs)
+    copy = cast(
+        Type[models.Model], type(f"{model.__name__}Reload", (models.Model,), attrs)
+    )
+    # Index names are global in SQLite: derive them from the shadow table.
+    for index in copy._meta.indexes:
+        index.set_name_with_model(copy)
+    return copy
+
+
+def _table_names(connection: BaseDatabaseWrapper) -> List[str]:
+    return connection.introspection.table_names()
+
+
+def _rename_tables(
+    connection: BaseDatabaseWrapper, renames: List[Tuple[str, str]]
+) -> None:
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for old, new in renames:
+            cursor.execute(f"ALTER TABLE {quote(old)} RENAME TO {quote(new)}")
+
+
+class ShadowTables:
+    """Fresh copies of the PoI and summary tables a full reload is loaded into.
+
+    The PoI copy is created without its secondary indexes, which are built
+    once the load is complete, and the summaries are computed from it before
+    the swap. The swap then only renames tables: the live ones become their
+    ``previous_table`` (kept for a rollback) and the copies take their names,
+    in a single transaction, so readers see either the old or the new data,
+    never a mix of both.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.using = using
+        self.connection = connections[using]
+        # A new name on every reload: the index names derive from it and must
+        # not clash with the live ones, which may come from an earlier reload.
+        token = uuid.uuid4().hex[:12]
+        self.models = {
+            model: shadow_model(model, f"{shadow_prefix(model)}{token}")
+            for model in RELOADED_MODELS
+        }
+        self.poi = self.models[POI]
+        self._fields = self.poi._meta.concrete_fields
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _count(self, table: str) -> int:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {self._quote(table)}")
+            return int(cursor.fetchone()[0])
+
+    def create(self) -> None:
+        """Creates the empty shadow tables, dropping leftovers of earlier reloads.
+
+        Raises:
+            ImportServiceError: If the database is not SQLite or other tables
+            reference a reloaded table (their foreign keys would follow the
+            rename).
+        """
+        if self.connection.vendor != "sqlite":
+            raise ImportServiceError("Full reload is only supported on SQLite.")
+        if any(model._meta.related_objects for model in RELOADED_MODELS):
+            raise ImportServiceError(
+                "Full reload is not possible while other tables reference PoIs."
+            )
+        stale = [
+            name
+            for name in _table_names(self.connection)
+            for model in RELOADED_MODELS
+            if name.startswith(shadow_prefix(model)) or name == previous_table(model)
+        ]
+        editor = self.connection.SchemaEditorClass(self.connection)
+        with self.connection.cursor() as cursor:
+            for name in stale:
+                cursor.execute(f"DROP TABLE {self._quote(name)}")
+            for shadow in self.models.values():
+                sql, params = editor.table_sql(shadow)
+                cursor.execute(sql, params)
+
+    def drop(self) -> None:
+        """Drops the shadow tables that were not swapped in."""
+        with self.connection.cursor() as cursor:
+            for shadow in self.models.values():
+                table = self._quote(shadow._meta.db_table)
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def load(self, rows: List[Dict[str, Any]]) -> int:
+        """Inserts a batch of normalized PoI rows, the last one wins on repeated ids.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if not rows:
+            return 0
+        now = timezone.now()
+        fields = self._fields
+        columns = [self._quote(str(field.column)) for field in fields]
+        kept = {"id", "external_id", "created_at"}
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}"
+            for field, column in zip(fields, columns)
+            if field.name not in kept
+        )
+        sql = (
+            f"INSERT INTO {self._quote(self.poi._meta.db_table)} "
+            f"({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({self._quote('external_id')}) DO UPDATE SET {updates}"
+        )
+        params = []
+        for row in rows:
+            values = {"created_at": now, "updated_at": now, **row}
+            params.append(
+                [
+                    field.get_db_prep_save(
+                        (
+                            values[field.attname]
+                            if field.attname in values
+                            else field.get_default()
+                        ),
+                        self.connection,
+                    )
+                    for field in fields
+                ]
+            )
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+        return len(params)
+
+    def _record_changes(self, import_run_id: uuid.UUID | None) -> int:
+        """Adds the reverse diffs of the reloaded PoIs to the change history.
+
+        A single INSERT ... SELECT joins the live and shadow tables; the JSON
+        diff holds the live values of the HISTORY_FIELDS that differ (ratings
+        decoded by the ``poi_ratings_json`` SQL function). It runs before the
+        cutover, outside its transaction; the history table is not reloaded, so
+        a rollback keeps the rows.
+        """
+        quote = self._quote
+        poi_fields = {field.attname: field for field in POI._meta.concrete_fields}
+        history = {field.name: field for field in POIChange._meta.concrete_fields}
+        values, unchanged, changed = [], [], []
+        for name in HISTORY_FIELDS:
+            column = quote(str(poi_fields[name].column))
+            value = f"p.{column}"
+            if name == "ratings":
+                value = f"json(poi_ratings_json({value}))"
+            values.append(f"'{name}', {value}")
+            unchanged.append(
+                f"CASE WHEN s.{column} IS p.{column} THEN '$.{name}' ELSE '$._' END"
+            )
+            changed.append(f"s.{column} IS NOT p.{column}")
+        columns = ", ".join(
+            quote(str(history[name].column))
+            for name in ("poi_id", "import_run", "changed_at", "diff")
+        )
+        external_id = quote("external_id")
+        sql = (
+            f"INSERT INTO {quote(POIChange._meta.db_table)} ({columns}) "
+            f"SELECT p.{quote(str(POI._meta.pk.column))}, %s, %s, "
+            f"json_remove(json_object({', '.join(values)}), {', '.join(unchanged)}) "
+            f"FROM {quote(POI._meta.db_table)} p "
+            f"JOIN {quote(self.poi._meta.db_table)} s "
+            f"ON s.{external_id} = p.{external_id} "
+            f"WHERE {' OR '.join(changed)}"
+        )
+        params = [
+            history["import_run"].get_db_prep_save(import_run_id, self.connection),
+            history["changed_at"].get_db_prep_save(timezone.now(), self.connection),
+        ]
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return int(cursor.rowcount)
+
+    def swap(
+        self, expected: int, import_run_id: uuid.UUID | None = None
+    ) -> Tuple[int, int, int]:
+        """Validates the loaded PoIs and swaps every shadow table with the live one.
+
+        PoIs already stored keep their internal id and creation date, and the
+        fields the reload changes are added to their change history. Changes
+        made to the live tables while the files were loading are discarded.
+        Args:
+            expected (int): Number of distinct PoIs in the imported files.
+            import_run_id (UUID | None): Import the changes are recorded for.
+        Raises:
+            ImportServiceError: If the shadow table is empty or does not hold
+            exactly the expected number of PoIs.
+        Returns:
+            tuple[int, int, int]: (created, updated, deleted) PoIs, compared to
+            the live table.
+        """
+        live_table = POI._meta.db_table
+        live = self._quote(live_table)
+        shadow = self._quote(self.poi._meta.db_table)
+        pk = self._quote(str(POI._meta.pk.column))
+        external_id = self._quote("external_id")
+        created_at = self._quote("created_at")
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {shadow} SET {pk} = p.{pk}, {created_at} = p.{created_at} "
+                f"FROM {live} p WHERE p.{external_id} = {shadow}.{external_id}"
+            )
+            updated = cursor.rowcount
+
+        loaded = self._count(self.poi._meta.db_table)
+        if not loaded:
+            raise ImportServiceError("Full reload aborted: no PoIs were loaded.")
+        if loaded != expected:
+            raise ImportServiceError(
+                f"Full reload aborted: the loaded table holds {loaded} PoIs, "
+                f"{expected} expected."
+            )
+        for copy in self.models.values():
+            SecondaryIndexes(copy, self.using).restore()
+        rebuild_category_stats(source=self.poi, target=self.models[CategoryStats])
+        rebuild_map_clusters(source=self.poi, target=self.models[MapCluster])
+
+        # The diff against the live table is computed before the cutover, so
+        # the write lock is only held for the renames.
+        deleted = self._count(live_table) - updated
+        self._record_changes(import_run_id)
+        renames = []
+        for model, copy in self.models.items():
+            renames.append((model._meta.db_table, previous_table(model)))
+            renames.append((copy._meta.db_table, model._meta.db_table))
+        with transaction.atomic(using=self.using):
+            _rename_tables(self.connection, renames)
+            transaction.on_commit(bump_data_version)
+        return loaded - updated, updated, deleted
+
+
+def rollback_full_reload(using: str = DEFAULT_DB_ALIAS) -> None:
+    """Swaps the live PoI and summary tables with those kept by the last reload.
+
+    Changes made after the reload are lost. Running it again re-applies the
+    reload, since the tables only trade places.
+    Raises:
+        ImportServiceError: If there are no previous tables to restore.
+    """
+    connection = connections[using]
+    tables = set(_table_names(connection))
+    if not all(previous_table(model) in tables for model in RELOADED_MODELS):
+        raise ImportServiceError("There is no previous PoI table to restore.")
+    renames = []
+    for model in RELOADED_MODELS:
+        live = model._meta.db_table
+        temporary = f"{shadow_prefix(model)}rollback"
+        renames += [
+            (live, temporary),
+            (previous_table(model), live),
+            (temporary, previous_table(model)),
+        ]
+    with transaction.atomic(using=using):
+        _rename_tables(connection, renames)
+        transaction.on_commit(bump_data_version)
+
+
+def discard_previous_tables(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """Drops the tables kept by the last full reload. Returns whether they existed."""
+    connection = connections[using]
+    tables = set(_table_names(connection))
+    previous = [
+        previous_table(model)
+        for model in RELOADED_MODELS
+        if previous_table(model) in tables
+    ]
+    with connection.cursor() as cursor:
+        for name in previous:
+            cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+    return bool(previous)
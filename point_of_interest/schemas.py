@@ -1,9 +1,8 @@
-import json
-import re
-from dataclasses import asdict, dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Tuple
+from uuid import UUID
 
-from point_of_interest.enums import SourceType
+from point_of_interest.normalizers import get_normalizer, parse_ratings
 
 
 @dataclass(slots=True)
@@ -11,8 +10,58 @@ class ImportStats:
     """ImportStats dataclasses representing statistics about the import process."""
 
     files_processed: int = 0
+    processed: int = 0
     created: int = 0
     updated: int = 0
+    duplicates: int = 0
+    deleted: int = 0
+    rejected: int = 0
+    # Time the writes waited for the write budget, and back-offs under load.
+    throttled_seconds: float = 0.0
+    backoffs: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def merge(self, other: "ImportStats") -> None:
+        """Adds the counters of another ImportStats into this one."""
+        for item in fields(self):
+            setattr(
+                self, item.name, getattr(self, item.name) + getattr(other, item.name)
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class ImportSource:
+    """An input of ImportBuilder that is not a file path.
+
+    ``data`` holds raw records, keyed like the files of ``input_format``
+    (``csv``, ``json``, ``jsonl`` or ``xml``): an iterable or an async
+    iterable of mappings, or a binary file object of such a file. ``name``
+    identifies the input in its history record and events.
+    """
+
+    data: Any
+    input_format: str
+    name: str = "records"
+
+
+@dataclass(frozen=True, slots=True)
+class ImportEvent:
+    """Progress of an import, yielded by ``ImportBuilder.events``."""
+
+    type: str
+    # Name of the input, empty for the COMPLETED event of the whole run.
+    input: str
+    # Counters of the input so far, or of the run for COMPLETED.
+    stats: ImportStats
+    rows_per_second: float = 0.0
+    # History record of the input.
+    import_id: UUID | None = None
+    # (record number, reason) of the rows of the batch rejected by max_errors.
+    errors: Tuple[Tuple[int, str], ...] = ()
+    # Error message of a FAILED input.
+    error: str = ""
 
 
 @dataclass(slots=True)
@@ -33,31 +82,7 @@ class ImportData:
     @staticmethod
     def _parse_ratings(raw: Any) -> list[float]:
         """Converts ratings to a list of floats, limiting values between 0 and 5 and to 2 decimal places."""
-        result = []
-        if not (raw is None or raw == ""):
-            if isinstance(raw, (list, tuple)):
-                sequence = raw
-            elif isinstance(raw, (int, float)):
-                sequence = [raw]
-            elif isinstance(raw, str):
-                context = raw.strip()
-                if context.startswith("[") and context.endswith("]"):
-                    try:
-                        sequence = json.loads(context)
-                    except Exception:
-                        return []
-                else:
-                    sequence = [p for p in re.split(r"[,\|\;\s]+", context) if p]
-
-            for value in sequence:
-                try:
-                    val = float(value)
-                    val = min(5.0, max(0.0, val))
-                    val = round(val, 2)
-                    result.append(val)
-                except (TypeError, ValueError):
-                    continue
-        return result
+        return parse_ratings(raw)
 
     @classmethod
     def from_row(cls, row: dict[str, Any], source: str) -> "ImportData":
@@ -70,60 +95,4 @@ class ImportData:
         Returns:
             ImportData: The created ImportData instance.
         """
-        match source:
-            case SourceType.CSV:
-                ratings = cls._parse_ratings(raw=row.get("poi_ratings"))
-                instance = cls(
-                    external_id=str(row["poi_id"]).strip(),
-                    name=str(row["poi_name"]).strip(),
-                    latitude=float(row["poi_latitude"]),
-                    longitude=float(row["poi_longitude"]),
-                    category=str(row["poi_category"]).strip(),
-                    ratings=ratings,
-                    description=str(row.get("poi_description") or "").strip(),
-                )
-                return instance
-            case SourceType.JSON:
-                ratings = cls._parse_ratings(raw=row.get("ratings"))
-                coords = row.get("coordinates")
-                lat, lon = None, None
-                if isinstance(coords, (list, tuple)) and len(coords) >= 2:
-                    try:
-                        lat = float(coords[0])
-                        lon = float(coords[1])
-                    except (TypeError, ValueError):
-                        lat, lon = None, None
-                elif isinstance(coords, dict):
-                    try:
-                        lat_raw = coords.get("latitude")
-                        lon_raw = coords.get("longitude")
-                        lat = float(lat_raw) if lat_raw is not None else None
-                        lon = float(lon_raw) if lon_raw is not None else None
-                    except (TypeError, ValueError):
-                        lat, lon = None, None
-                if lat is None or lon is None:
-                    raise ValueError("Invalid or missing coordinates in JSON row")
-                instance = cls(
-                    external_id=str(row["id"]).strip(),
-                    name=str(row["name"]).strip(),
-                    latitude=lat,
-                    longitude=lon,
-                    category=str(row["category"]).strip(),
-                    ratings=ratings,
-                    description=str(row.get("description") or "").strip(),
-                )
-                return instance
-            case SourceType.XML:
-                ratings = cls._parse_ratings(raw=row.get("pratings"))
-                instance = cls(
-                    external_id=str(row["pid"]).strip(),
-                    name=str(row["pname"]).strip(),
-                    latitude=float(row["platitude"]),
-                    longitude=float(row["plongitude"]),
-                    category=str(row["pcategory"]).strip(),
-                    ratings=ratings,
-                    description=str(row.get("pdescription") or "").strip(),
-                )
-                return instance
-            case _:
-                raise ValueError(f"Unknown source: {source}")
+        return cls(**get_normalizer(source)(row))
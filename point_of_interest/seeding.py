@@ -0,0 +1,296 @@
+"""
+Synthetic PoI datasets for load tests, bulk loaded straight into the database.
+
+PoIs get numeric external ids, names built from their category and a few
+word lists (so name searches match a realistic share of the table),
+coordinates scattered around a list of cities and 0 to 20 ratings. Rows are
+written with plain multi-row INSERTs, bypassing the model signals, in
+``batch_size`` transactions under the import database profile, with the
+secondary indexes rebuilt once at the end; the summary tables are then
+rebuilt by the caller.
+"""
+
+import random
+import uuid
+from datetime import timedelta
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Sequence
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from point_of_interest.bulk import SecondaryIndexes, import_db_profile
+from point_of_interest.enums import ImportStatus, SourceType
+from point_of_interest.fields import Ratings
+from point_of_interest.models import POI, Category, HistoricalImportData
+
+# (name, latitude, longitude) of the cities the PoIs are scattered around.
+CITIES = (
+    ("Lisbon", 38.72, -9.14),
+    ("Madrid", 40.42, -3.70),
+    ("Paris", 48.86, 2.35),
+    ("London", 51.51, -0.13),
+    ("Berlin", 52.52, 13.40),
+    ("Rome", 41.90, 12.50),
+    ("Warsaw", 52.23, 21.01),
+    ("Istanbul", 41.01, 28.98),
+    ("Cairo", 30.04, 31.24),
+    ("Lagos", 6.52, 3.38),
+    ("Nairobi", -1.29, 36.82),
+    ("Johannesburg", -26.20, 28.05),
+    ("Dubai", 25.20, 55.27),
+    ("Mumbai", 19.08, 72.88),
+    ("Bangkok", 13.76, 100.50),
+    ("Singapore", 1.35, 103.82),
+    ("Jakarta", -6.21, 106.85),
+    ("Shanghai", 31.23, 121.47),
+    ("Seoul", 37.57, 126.98),
+    ("Tokyo", 35.68, 139.69),
+    ("Sydney", -33.87, 151.21),
+    ("Auckland", -36.85, 174.76),
+    ("Los Angeles", 34.05, -118.24),
+    ("Mexico City", 19.43, -99.13),
+    ("Chicago", 41.88, -87.63),
+    ("Toronto", 43.65, -79.38),
+    ("New York", 40.71, -74.01),
+    ("Bogota", 4.71, -74.07),
+    ("Lima", -12.05, -77.04),
+    ("Sao Paulo", -23.55, -46.63),
+    ("Rio de Janeiro", -22.91, -43.17),
+    ("Buenos Aires", -34.60, -58.38),
+)
+CATEGORIES = (
+    "restaurant",
+    "cafe",
+    "bar",
+    "bakery",
+    "hotel",
+    "hostel",
+    "museum",
+    "gallery",
+    "park",
+    "garden",
+    "beach",
+    "viewpoint",
+    "church",
+    "monument",
+    "theatre",
+    "cinema",
+    "library",
+    "school",
+    "university",
+    "hospital",
+    "pharmacy",
+    "supermarket",
+    "market",
+    "shop",
+    "mall",
+    "gym",
+    "stadium",
+    "pool",
+    "station",
+    "airport",
+    "parking",
+    "fuel",
+    "bank",
+    "post office",
+    "police",
+    "zoo",
+)
+ADJECTIVES = (
+    "Old",
+    "New",
+    "Royal",
+    "Little",
+    "Grand",
+    "Golden",
+    "Green",
+    "Blue",
+    "Central",
+    "Happy",
+    "Silver",
+    "Sunny",
+)
+NOUNS = (
+    "Harbour",
+    "Garden",
+    "Bridge",
+    "Tower",
+    "Square",
+    "River",
+    "Hill",
+    "Corner",
+    "Station",
+    "Market",
+    "Palace",
+    "Lighthouse",
+    "Oak",
+    "Star",
+    "Moon",
+    "Fox",
+)
+# Ratings, in hundredths: 1.00 to 5.00.
+RATINGS = range(100, 501)
+# Degrees of the spread of the PoIs around their city (about 30 km).
+CITY_SPREAD = 0.3
+
+
+def category_names(count: int) -> List[str]:
+    """Returns ``count`` category names: the CATEGORIES, then numbered variants."""
+    return [
+        CATEGORIES[index % len(CATEGORIES)]
+        + (f" {index // len(CATEGORIES) + 1}" if index >= len(CATEGORIES) else "")
+        for index in range(count)
+    ]
+
+
+def ensure_categories(count: int) -> List[Category]:
+    """Creates the missing seed categories. Returns the ``count`` of them."""
+    names = category_names(count)
+    Category.objects.bulk_create(
+        [Category(name=name) for name in names], ignore_conflicts=True
+    )
+    categories = Category.objects.in_bulk(names, field_name="name")
+    return [categories[name] for name in names]
+
+
+def poi_rows(
+    count: int,
+    categories: Sequence[Category],
+    *,
+    start: int = 1,
+    seed: int = 0,
+) -> Iterator[dict[str, Any]]:
+    """Yields the column values of ``count`` synthetic PoIs.
+
+    External ids are the numbers from ``start``; the same ``seed`` and
+    ``start`` yield the same PoIs. The creation times are a millisecond apart,
+    so they are unique and follow the external ids.
+    """
+    rng = random.Random(f"{seed}:{start}")
+    now = timezone.now()
+    for number in range(start, start + count):
+        category = rng.choice(categories)
+        city, latitude, longitude = rng.choice(CITIES)
+        kind = category.name.rstrip("0123456789 ")
+        yield {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "external_id": str(number),
+            "name": (
+                f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {kind.title()}"
+                f" {city}"
+            ),
+            "latitude": round(rng.gauss(latitude, CITY_SPREAD), 6),
+            "longitude": round(rng.gauss(longitude, CITY_SPREAD), 6),
+            "category_id": category.pk,
+            "ratings": Ratings.from_hundredths(
+                rng.choices(RATINGS, k=int(rng.random() * 21))
+            ),
+            "description": "",
+            "created_at": now + timedelta(milliseconds=number - start),
+            "updated_at": now,
+        }
+
+
+def seed_pois(
+    count: int,
+    *,
+    categories: int = 300,
+    batch_size: int = 50_000,
+    seed: int = 0,
+    defer_indexes: bool = True,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Bulk loads ``count`` synthetic PoIs after the ones already stored.
+    Args:
+        count (int): Number of PoIs to create.
+        categories (int): Number of categories the PoIs are spread over.
+        batch_size (int): Number of rows per transaction.
+        seed (int): Seed of the generator.
+        defer_indexes (bool): Drops the secondary indexes while loading and
+            rebuilds them once at the end, unless fewer PoIs are added than
+            already stored.
+        on_batch (Callable[[int], None] | None): Called with the number of
+            PoIs written so far after each batch.
+    Returns:
+        int: The number of PoIs created.
+    Raises:
+        IntegrityError: If a numeric external id is already taken.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    fields = list(POI._meta.concrete_fields)
+    columns = ", ".join(
+        connection.ops.quote_name(str(field.column)) for field in fields
+    )
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    table = connection.ops.quote_name(POI._meta.db_table)
+    stored = POI.objects.count()
+    rows = poi_rows(count, ensure_categories(categories), start=stored + 1, seed=seed)
+    # Rebuilding the indexes over the stored rows costs more than keeping them
+    # up to date while adding fewer rows.
+    defer_indexes = defer_indexes and count >= stored
+    written = 0
+    with import_db_profile():
+        indexes = SecondaryIndexes(POI)
+        if defer_indexes:
+            indexes.drop()
+        try:
+            with connection.cursor() as cursor:
+                # Multi-row statements, within the 999 bound parameters of
+                # older SQLite versions.
+                per_statement = max(1, 999 // len(fields))
+                while batch := [
+                    [
+                        field.get_db_prep_save(row[field.attname], connection)
+                        for field in fields
+                    ]
+                    for row in islice(rows, batch_size)
+                ]:
+                    with transaction.atomic():
+                        for offset in range(0, len(batch), per_statement):
+                            statement = batch[offset : offset + per_statement]
+                            cursor.execute(
+                                f"INSERT INTO {table} ({columns}) VALUES "
+                                + ", ".join([placeholders] * len(statement)),
+                                [value for row in statement for value in row],
+                            )
+                    written += len(batch)
+                    if on_batch is not None:
+                        on_batch(written)
+        finally:
+            if defer_indexes:
+                indexes.restore()
+    return written
+
+
+def seed_import_history(count: int, *, seed: int = 0) -> int:
+    """Creates ``count`` finished import history records, most of them succeeded.
+    Returns:
+        int: The number of records created.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    records = []
+    for index in range(count):
+        source = rng.choice(SourceType.values)
+        status = rng.choices(
+            (ImportStatus.SUCCEEDED, ImportStatus.FAILED), weights=(9, 1)
+        )[0]
+        rows = rng.randrange(1_000, 5_000_000)
+        finished_at = now - timedelta(hours=count - index)
+        records.append(
+            HistoricalImportData(
+                source=source,
+                filename=f"feed-{index:06d}.{source.lower()}",
+                status=status,
+                rows_processed=rows,
+                rows_total=rows,
+                rows_rejected=rng.randrange(0, 50),
+                rows_per_second=round(rng.uniform(2_000, 50_000), 2),
+                error="Invalid data or format" if status == ImportStatus.FAILED else "",
+                started_at=finished_at - timedelta(minutes=rng.randrange(1, 120)),
+                finished_at=finished_at,
+            )
+        )
+    HistoricalImportData.objects.bulk_create(records, batch_size=1_000)
+    return len(records)
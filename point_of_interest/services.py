@@ -1,141 +1,793 @@
+import asyncio
 import json
+import time
+from collections.abc import Sized
+from contextlib import ExitStack, closing, nullcontext
+from dataclasses import replace
+from datetime import timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    cast,
+)
+from uuid import UUID
 
-import pandas as pd
-from django.db import transaction
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 
-from point_of_interest.enums import SourceType
+from point_of_interest import readers
+from point_of_interest.aggregates import AggregateDelta
+from point_of_interest.bloom import BloomFilter
+from point_of_interest.bulk import SecondaryIndexes, import_db_profile
+from point_of_interest.caching import bump_data_version
+from point_of_interest.enums import ImportEventType, ImportStatus, SourceType
 from point_of_interest.exceptions import ImportServiceError
-from point_of_interest.models import POI, HistoricalImportData
-from point_of_interest.schemas import ImportStats
+from point_of_interest.history import HISTORY_FIELDS, ChangeLog
+from point_of_interest.models import POI, Category, HistoricalImportData
+from point_of_interest.normalizers import RecordNormalizer
+from point_of_interest.rejects import ErrorBudget, RejectWriter
+from point_of_interest.reload import ShadowTables
+from point_of_interest.schemas import ImportEvent, ImportSource, ImportStats
+from point_of_interest.sync import SeenIdTable
+from point_of_interest.throttle import WriteThrottle
 from point_of_interest.utils import (
+    STDIN,
     batched,
+    estimate_rows,
+    is_stream,
     iter_xml_dicts,
-    normalize_record,
+    open_input,
     source_from_path,
 )
 
 
+class ImportProgress:
+    """Persists the status and progress of a file import on its history record."""
+
+    def __init__(self, record: HistoricalImportData) -> None:
+        self.record = record
+        self.started = time.monotonic()
+
+    def _save(self, **values: Any) -> None:
+        for name, value in values.items():
+            setattr(self.record, name, value)
+        HistoricalImportData.objects.filter(pk=self.record.pk).update(**values)
+
+    def start(self, rows_total: int | None) -> None:
+        """Marks the record as running, creating it if needed."""
+        record = self.record
+        record.status = ImportStatus.RUNNING
+        record.started_at = record.heartbeat_at = timezone.now()
+        record.rows_total = rows_total
+        record.rows_processed = 0
+        record.rows_rejected = 0
+        record.reject_path = ""
+        record.error = ""
+        record.save()
+        self.started = time.monotonic()
+
+    def rate(self, stats: ImportStats) -> float:
+        """Returns the rows processed per second since the import started."""
+        return stats.processed / max(time.monotonic() - self.started, 1e-6)
+
+    def update(self, stats: ImportStats) -> None:
+        """Saves rows processed, throughput and ETA after a committed batch."""
+        rate = self.rate(stats)
+        eta = None
+        if self.record.rows_total is not None and rate > 0:
+            eta = max(self.record.rows_total - stats.processed, 0) / rate
+        self._save(
+            rows_processed=stats.processed,
+            rows_rejected=stats.rejected,
+            rows_per_second=round(rate, 2),
+            eta_seconds=eta,
+            stats=stats.to_dict(),
+            heartbeat_at=timezone.now(),
+        )
+
+    def rejected_to(self, path: Path) -> None:
+        """Saves where the rows skipped from the file were written."""
+        self._save(reject_path=str(path))
+
+    def finish(self, stats: ImportStats) -> None:
+        """Marks the record as succeeded."""
+        self.update(stats)
+        self._save(
+            status=ImportStatus.SUCCEEDED, eta_seconds=0, finished_at=timezone.now()
+        )
+
+    def fail(self, stats: ImportStats, error: str) -> None:
+        """Marks the record as failed with the given error message."""
+        self._save(
+            status=ImportStatus.FAILED,
+            error=error,
+            eta_seconds=None,
+            stats=stats.to_dict(),
+            finished_at=timezone.now(),
+        )
+
+
+class CategoryCache:
+    """In-memory ``name -> id`` map of the PoI categories, shared by a whole run.
+
+    The existing categories are loaded once; names not seen before are inserted
+    with a single bulk insert per batch. Reads go to the primary, where the
+    inserted categories are visible straight away.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] | None = None
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, int]:
+        """Returns the ids of the given category names, creating the missing ones."""
+        primary = Category.objects.using(DEFAULT_DB_ALIAS)
+        if self._ids is None:
+            self._ids = dict(primary.values_list("name", "pk"))
+        ids = self._ids
+        missing = set(names).difference(ids)
+        if missing:
+            primary.bulk_create(
+                [Category(name=name) for name in missing], ignore_conflicts=True
+            )
+            ids.update(primary.filter(name__in=missing).values_list("name", "pk"))
+        return ids
+
+
+def _async_chunks(
+    records: AsyncIterable[Mapping[str, Any]],
+    size: int,
+    runner: asyncio.Runner | None = None,
+) -> Iterator[List[Mapping[str, Any]]]:
+    """Yields lists of up to ``size`` records of an async iterable, from sync code.
+
+    Each list is collected, a whole chunk per round trip, by ``runner``, or on
+    the event loop of the caller of ``aevents`` when None. A new loop per chunk
+    would not do: closing it finalizes the async generators started on it.
+    """
+    iterator = aiter(records)
+
+    async def take() -> List[Mapping[str, Any]]:
+        chunk = []
+        async for record in iterator:
+            chunk.append(record)
+            if len(chunk) >= size:
+                break
+        return chunk
+
+    while chunk := runner.run(take()) if runner else async_to_sync(take)():
+        yield chunk
+
+
+def _next_event(
+    events: Generator[ImportEvent, None, None],
+) -> ImportEvent | None:
+    """Returns the next event of an import, or None once it is over."""
+    return next(events, None)
+
+
 class ImportBuilder:
-    """Imports PoIs from CSV, JSON or XML files, performing batch upserts."""
+    """Imports PoIs from CSV, JSON or XML files, performing batch upserts.
+
+    A path may also be ``-`` (stdin) or a named pipe, read once as a stream
+    with the given ``input_format`` (``csv``, ``json``, ``jsonl`` or ``xml``,
+    which otherwise overrides the file suffixes). CSV, JSON Lines and XML
+    streams are read chunk by chunk; a ``json`` stream holds a single document
+    (an array or an object) and is loaded whole.
+
+    Writes follow the budget of ``throttle`` (by default the IMPORT_MAX_*
+    settings); while one is set, every ``batch_size`` rows are written in
+    their own transaction, paced and delayed under load.
+    """
+
+    ID_INDEX_MIN_CAPACITY = 1_000_000
 
     def __init__(
         self,
-        paths: Sequence[str | Path],
+        paths: Sequence[str | Path | ImportSource],
         *,
         chunksize: int = 100_000,
         batch_size: int = 10_000,
+        use_id_index: bool = False,
+        sync: bool = False,
+        bulk_load: bool = False,
+        full_reload: bool = False,
+        max_errors: ErrorBudget | str | int | None = None,
+        reject_dir: str | Path | None = None,
+        input_format: str | None = None,
+        throttle: WriteThrottle | None = None,
     ) -> None:
-        self.paths = [Path(p) for p in paths]
+        self.paths = [p if isinstance(p, ImportSource) else Path(p) for p in paths]
+        self.input_format = input_format
+        self.throttle = (
+            throttle if throttle is not None else WriteThrottle.from_settings()
+        )
         self.chunksize = int(chunksize)
         self.batch_size = int(batch_size)
+        self.use_id_index = use_id_index
+        self.sync = sync
+        self.bulk_load = bulk_load
+        self.full_reload = full_reload
+        if max_errors is not None and not isinstance(max_errors, ErrorBudget):
+            max_errors = ErrorBudget.parse(max_errors)
+        self.max_errors = max_errors
+        self.reject_dir = Path(reject_dir) if reject_dir is not None else None
+        self._seen_ids: set[str] = set()
+        self._id_index: BloomFilter | None = None
+        self._seen_table: SeenIdTable | None = None
+        self._shadow: ShadowTables | None = None
+        self._progress: ImportProgress | None = None
+        self._rejects: RejectWriter | None = None
+        # History record of the latest file, the changes of a full reload are
+        # recorded against it.
+        self._last_import_id: UUID | None = None
+        self._position = 0
+        # Whether the import runs for aevents, async iterables then being
+        # consumed on the caller's event loop.
+        self._in_event_loop = False
+        # (record number, reason) of the rows rejected from the current chunk.
+        self._chunk_errors: List[Tuple[int, str]] = []
+        # Counters of the files already imported by the current run.
+        self._run_stats = ImportStats()
+        self._categories = CategoryCache()
 
     def run(self) -> ImportStats:
-        """Runs the import process for all provided files."""
-        stats = ImportStats()
-        for path in self.paths:
+        """Runs the import process for all provided files.
+
+        In sync mode, once every file was imported, the PoIs whose external_id
+        did not appear in any of them are deleted. In full reload mode the files
+        are loaded into a shadow table that replaces the live one at the end;
+        the live table is left untouched if anything fails.
+
+        With ``max_errors`` invalid rows are skipped and written to a reject
+        file next to their source (or in ``reject_dir``) instead of failing the
+        run, until their number exceeds the budget, counted over all files.
+        """
+        for event in self.events():
+            stats = event.stats
+        return stats
+
+    def events(self) -> Generator[ImportEvent, None, None]:
+        """Runs the import like ``run``, yielding its progress as it goes.
+
+        Each input yields a STARTED event, a BATCH event once each chunk is
+        committed, with its rejected rows, and FINISHED, or FAILED right
+        before its error is raised. The run ends with a COMPLETED event
+        holding the counters of all the inputs.
+
+        Closing the generator cancels the import between two chunks: the
+        chunks already written are kept (but not swapped in by a full reload)
+        and the history record of the current input is marked as failed.
+        """
+        stats = self._run_stats = ImportStats()
+        started = time.monotonic()
+        with self._database_profile():
+            if self.use_id_index:
+                self._id_index = self._build_id_index()
+            if self.sync:
+                self._seen_table = SeenIdTable()
+                self._seen_table.create()
+            if self.full_reload:
+                self._shadow = ShadowTables()
+                self._shadow.create()
             try:
-                completed, updated = self._process_file(path)
-                stats.created += completed
-                stats.updated += updated
-                stats.files_processed += 1
-                HistoricalImportData.objects.create(
-                    source=source_from_path(path),
-                    filename=path.name,
+                for item in self.paths:
+                    stats.merge((yield from self._import_input(item)))
+                if self._seen_table is not None and self._seen_table.count:
+                    stats.deleted = self._seen_table.delete_missing(self.batch_size)
+                    bump_data_version()
+                if self._shadow is not None:
+                    stats.created, stats.updated, stats.deleted = self._shadow.swap(
+                        stats.processed - stats.duplicates - stats.rejected,
+                        self._last_import_id,
+                    )
+            finally:
+                if self._seen_table is not None:
+                    self._seen_table.drop()
+                    self._seen_table = None
+                if self._shadow is not None:
+                    self._shadow.drop()
+                    self._shadow = None
+        elapsed = max(time.monotonic() - started, 1e-6)
+        yield ImportEvent(
+            type=ImportEventType.COMPLETED,
+            input="",
+            stats=replace(stats),
+            rows_per_second=round(stats.processed / elapsed, 2),
+        )
+
+    async def aevents(self) -> AsyncIterator[ImportEvent]:
+        """Async variant of ``events``, for asyncio services and ASGI views.
+
+        The import runs step by step in Django's thread for sync code, while
+        async iterables of records are consumed on the event loop. Leaving the
+        loop early, or cancelling the task, cancels the import.
+        """
+        events = self.events()
+        step = sync_to_async(_next_event, thread_sensitive=True)
+        self._in_event_loop = True
+        try:
+            while (event := await step(events)) is not None:
+                yield event
+        finally:
+            await sync_to_async(events.close, thread_sensitive=True)()
+            self._in_event_loop = False
+
+    def run_job(self, record: HistoricalImportData) -> ImportStats:
+        """Runs a queued import job, tracking its progress on the given record."""
+        self._run_stats = ImportStats()
+        with self._database_profile():
+            if self.use_id_index:
+                self._id_index = self._build_id_index()
+            for event in self._import_input(record.source_path, record):
+                stats = event.stats
+            return stats
+
+    def _database_profile(self) -> ExitStack:
+        """Tunes the import connection and, in bulk-load mode, defers index upkeep.
+
+        In bulk-load mode the non-unique indexes of the PoI table are dropped
+        before loading and rebuilt once at the end, even when the import fails.
+        """
+        stack = ExitStack()
+        stack.enter_context(import_db_profile())
+        if self.bulk_load:
+            stack.enter_context(SecondaryIndexes(POI).deferred())
+        return stack
+
+    def _import_input(
+        self, item: Path | ImportSource, record: HistoricalImportData | None = None
+    ) -> Generator[ImportEvent, None, ImportStats]:
+        """Imports a single input, keeping its HistoricalImportData record up to date.
+
+        Yields its events and returns its counters.
+        """
+        stats = ImportStats()
+        name = self._input_name(item)
+        progress = None
+        failure: Exception | None = None
+        try:
+            source = self._source_type(item)
+            if record is None:
+                record = HistoricalImportData(source=source, filename=name.name)
+            progress = self._progress = ImportProgress(record)
+            progress.start(self._estimate_rows(item, source))
+            self._last_import_id = record.pk
+            yield self._event(ImportEventType.STARTED, name, stats, progress)
+            for errors in self._process_input(item, source, stats):
+                yield self._event(
+                    ImportEventType.BATCH, name, stats, progress, errors=errors
                 )
-            except FileNotFoundError as error:
-                raise ImportServiceError(f"File not found: '{path}'") from error
-            except (ValueError, KeyError, TypeError) as error:
-                raise ImportServiceError(
-                    f"Invalid data or format in '{path}': {error}"
-                ) from error
+            stats.files_processed = 1
+            progress.finish(stats)
+        except GeneratorExit:
+            if progress is not None:
+                progress.fail(stats, "Import cancelled")
+            raise
+        except FileNotFoundError as error:
+            failure = ImportServiceError(f"File not found: '{name}'")
+            failure.__cause__ = error
+        except (ValueError, KeyError, TypeError) as error:
+            failure = ImportServiceError(f"Invalid data or format in '{name}': {error}")
+            failure.__cause__ = error
+        except Exception as error:
+            failure = error
+        finally:
+            self._progress = None
+        if failure is not None:
+            if progress is not None:
+                progress.fail(stats, str(failure))
+            yield self._event(
+                ImportEventType.FAILED, name, stats, progress, error=str(failure)
+            )
+            raise failure
+        yield self._event(ImportEventType.FINISHED, name, stats, progress)
         return stats
 
-    def _process_file(self, path: Path) -> tuple[int, int]:
-        """Processes a single file and returns (created, updated)."""
-        created = 0
-        updated = 0
-        source = source_from_path(path)
+    def _event(
+        self,
+        event_type: str,
+        name: Path,
+        stats: ImportStats,
+        progress: ImportProgress | None,
+        **extra: Any,
+    ) -> ImportEvent:
+        """Returns an event of an input, with a snapshot of its counters."""
+        return ImportEvent(
+            type=event_type,
+            input=str(name),
+            stats=replace(stats),
+            rows_per_second=round(progress.rate(stats), 2) if progress else 0.0,
+            import_id=progress.record.pk if progress else None,
+            **extra,
+        )
+
+    def _process_input(
+        self, item: Path | ImportSource, source: str, stats: ImportStats
+    ) -> Iterator[Tuple[Tuple[int, str], ...]]:
+        """Loads an input chunk by chunk, accumulating its counters into stats.
+
+        Yields the (record number, reason) of the rows rejected from each chunk
+        once it is written. Rows rejected from files go to a reject file; from
+        in-memory inputs only when a reject directory is given.
+        """
+        normalizer = RecordNormalizer(source)
+        if self._shadow is None:
+            self._seen_ids.clear()
+        self._position = 0
+        writer = None
+        if self.max_errors is not None and (
+            isinstance(item, Path) or self.reject_dir is not None
+        ):
+            writer = self._rejects = RejectWriter(
+                self._input_name(item), source, normalizer.columns, self.reject_dir
+            )
+        try:
+            with writer or nullcontext():
+                for _ in self._load_input(item, source, normalizer, stats):
+                    errors, self._chunk_errors = tuple(self._chunk_errors), []
+                    yield errors
+        finally:
+            self._rejects = None
+            if writer is not None and writer.count and self._progress is not None:
+                self._progress.rejected_to(writer.path)
+
+    def _load_input(
+        self,
+        item: Path | ImportSource,
+        source: str,
+        normalizer: RecordNormalizer,
+        stats: ImportStats,
+    ) -> Iterator[None]:
+        """Loads the chunks of an input, yielding after each of them."""
+        if isinstance(item, Path):
+            with open_input(item) as handle:
+                yield from self._read_input(
+                    item, handle, self.input_format, source, normalizer, stats
+                )
+            return
+        data = item.data
+        if hasattr(data, "read"):
+            yield from self._read_input(
+                None, data, item.input_format, source, normalizer, stats
+            )
+            return
+        with ExitStack() as stack:
+            if hasattr(data, "__aiter__"):
+                runner = None
+                if not self._in_event_loop:
+                    runner = stack.enter_context(asyncio.Runner())
+                chunks = _async_chunks(data, self.chunksize, runner)
+            else:
+                records = iter(data)
+                chunks = iter(lambda: list(islice(records, self.chunksize)), [])
+            for chunk in chunks:
+                self._load_chunk(chunk, normalizer, stats)
+                yield
+
+    def _read_input(
+        self,
+        path: Path | None,
+        handle: Path | IO[bytes],
+        input_format: str | None,
+        source: str,
+        normalizer: RecordNormalizer,
+        stats: ImportStats,
+    ) -> Iterator[None]:
+        """Reads an opened file or stream of the given source, chunk by chunk.
+
+        JSON files are read as JSON Lines, falling back to a whole document when
+        they are not; a stream (``path`` is None for file objects) cannot be
+        read twice, so its format decides.
+        """
+        suffix = path.suffix.lower() if path is not None else ""
+        json_lines = (input_format or suffix).endswith("jsonl")
         match source:
             case SourceType.CSV:
-                for df in pd.read_csv(path, chunksize=self.chunksize):
-                    rows = [
-                        normalize_record(row, source)
-                        for row in df.to_dict(orient="records")
-                    ]
-                    c, u = self._upsert_rows(rows)
-                    created += c
-                    updated += u
-                return created, updated
-            case SourceType.JSON:
+                for chunk in self._read_csv(handle, normalizer):
+                    self._load_chunk(chunk, normalizer, stats)
+                    yield
+            case SourceType.JSON if json_lines:
+                for chunk in self._read_json_lines(handle, normalizer):
+                    self._load_chunk(chunk, normalizer, stats)
+                    yield
+            case SourceType.JSON if path is not None and not is_stream(path):
                 try:
-                    for df in pd.read_json(path, lines=True, chunksize=self.chunksize):
-                        rows = [
-                            normalize_record(row, source)
-                            for row in df.to_dict(orient="records")
-                        ]
-                        c, u = self._upsert_rows(rows)
-                        created += c
-                        updated += u
-                    return created, updated
+                    for chunk in self._read_json_lines(handle, normalizer):
+                        self._load_chunk(chunk, normalizer, stats)
+                        yield
                 except ValueError:
+                    self._position = 0
                     data = json.loads(path.read_text(encoding="utf-8"))
-                    if isinstance(data, dict):
-                        data = [data]
-                    for chunk in batched(data, self.chunksize):
-                        rows = [normalize_record(row, source) for row in chunk]
-                        c, u = self._upsert_rows(rows)
-                        created += c
-                        updated += u
-                    return created, updated
+                    yield from self._load_json_document(data, normalizer, stats)
+            case SourceType.JSON:
+                # open_input() yields streams as binary file objects.
+                stream = cast(IO[bytes], handle)
+                yield from self._load_json_document(
+                    json.load(stream), normalizer, stats
+                )
             case SourceType.XML:
                 buffer = []
-                for raw in iter_xml_dicts(path):
-                    buffer.append(normalize_record(raw, source))
+                for raw in iter_xml_dicts(handle):
+                    buffer.append(raw)
                     if len(buffer) >= self.chunksize:
-                        c, u = self._upsert_rows(buffer)
-                        created += c
-                        updated += u
+                        self._load_chunk(buffer, normalizer, stats)
                         buffer = []
+                        yield
                 if buffer:
-                    c, u = self._upsert_rows(buffer)
-                    created += c
-                    updated += u
-                return created, updated
+                    self._load_chunk(buffer, normalizer, stats)
+                    yield
             case _:
-                if not path.exists():
+                if path is not None and not path.exists():
                     raise FileNotFoundError(path)
                 else:
-                    raise ImportServiceError(f"Unsupported file type: {path}")
+                    raise ImportServiceError(f"Unsupported file type: {path or source}")
+
+    def _load_json_document(
+        self, data: Any, normalizer: RecordNormalizer, stats: ImportStats
+    ) -> Iterator[None]:
+        """Loads the records of a JSON document: an array of them, or a single one."""
+        if isinstance(data, dict):
+            data = [data]
+        for chunk in batched(data, self.chunksize):
+            self._load_chunk(chunk, normalizer, stats)
+            yield
+
+    def _source_type(self, item: Path | ImportSource) -> str:
+        """Returns the source type of an input.
+        Raises:
+            ValueError: If the format or the file extension is unsupported.
+        """
+        if isinstance(item, ImportSource):
+            return source_from_path(Path(item.name), item.input_format)
+        return source_from_path(item, self.input_format)
+
+    def _estimate_rows(self, item: Path | ImportSource, source: str) -> int | None:
+        """Returns the number of rows of an input when known upfront, for the ETA."""
+        if isinstance(item, Path):
+            return estimate_rows(item, source)
+        if isinstance(item.data, Sized) and not hasattr(item.data, "read"):
+            return len(item.data)
+        return None
+
+    def _input_name(self, item: Path | ImportSource) -> Path:
+        """Returns the path naming an input in its history record and reject file.
+
+        Stdin is named ``stdin.<format>``, its reject file going to the current
+        directory unless a reject directory is given. In-memory inputs get the
+        suffix of their format when their name has none.
+        """
+        if isinstance(item, ImportSource):
+            name = Path(item.name)
+            return name if name.suffix else name.with_suffix(f".{item.input_format}")
+        if str(item) == STDIN:
+            return Path(f"stdin.{self.input_format}")
+        return item
+
+    def _load_chunk(
+        self,
+        chunk: Sequence[Mapping[str, Any]],
+        normalizer: RecordNormalizer,
+        stats: ImportStats,
+    ) -> None:
+        """Normalizes, deduplicates and upserts a chunk of raw rows."""
+        if self.max_errors is None:
+            records = normalizer.normalize_batch(chunk)
+        else:
+            records = self._reject_invalid(chunk, normalizer, stats, self.max_errors)
+        self._position += len(chunk)
+        rows = self._dedupe(records, stats)
+        self._resolve_categories(rows)
+        if self._seen_table is not None:
+            self._seen_table.add(row["external_id"] for row in rows)
+        created, updated = self._write(rows, stats)
+        stats.processed += len(chunk)
+        stats.created += created
+        stats.updated += updated
+        if self._progress is not None:
+            self._progress.update(stats)
+
+    def _write(self, rows: List[Dict[str, Any]], stats: ImportStats) -> tuple[int, int]:
+        """Writes rows to the live or shadow table, within the write budget.
+
+        Returns:
+            tuple[int, int]: The number of rows created and updated.
+        """
+        if not self.throttle.active:
+            return self._store(rows)
+        created = updated = 0
+        for batch in batched(rows, self.batch_size):
+            with self.throttle.write(len(batch), stats):
+                batch_created, batch_updated = self._store(list(batch))
+            created += batch_created
+            updated += batch_updated
+        return created, updated
+
+    def _store(self, rows: List[Dict[str, Any]]) -> tuple[int, int]:
+        """Writes rows in a single transaction. Returns (created, updated)."""
+        if self._shadow is not None:
+            return self._shadow.load(rows), 0
+        return self._upsert_rows(rows)
+
+    def _reject_invalid(
+        self,
+        chunk: Sequence[Mapping[str, Any]],
+        normalizer: RecordNormalizer,
+        stats: ImportStats,
+        budget: ErrorBudget,
+    ) -> List[Dict[str, Any]]:
+        """Normalizes a chunk, sending its invalid rows to the reject file.
+
+        In sync mode the PoIs of the rejected rows are kept: a row that could
+        not be read does not mean the PoI was removed from the source.
+        Raises:
+            ImportServiceError: If the rejected rows exceed the error budget.
+        """
+        records, errors = normalizer.partition_batch(chunk)
+        if not errors:
+            return records
+        stats.rejected += len(errors)
+        rejects = [
+            (self._position + index + 1, chunk[index], reason)
+            for index, reason in errors
+        ]
+        self._chunk_errors = [(record, reason) for record, _, reason in rejects]
+        if self._rejects is not None:
+            self._rejects.write(rejects)
+        if self._seen_table is not None:
+            key = normalizer.plan.external_id
+            self._seen_table.add(
+                external_id
+                for external_id in (
+                    str(chunk[index].get(key) or "").strip() for index, _ in errors
+                )
+                if external_id
+            )
+        # Files already imported in this run count towards the budget too.
+        budget.check(
+            self._run_stats.rejected + stats.rejected,
+            self._run_stats.processed + stats.processed + len(chunk),
+        )
+        return records
+
+    def _dedupe(
+        self, rows: List[Dict[str, Any]], stats: ImportStats
+    ) -> List[Dict[str, Any]]:
+        """Collapses rows sharing an external_id, the last occurrence wins.
+
+        Ids already seen in an earlier chunk of the same file (of any file, in a
+        full reload) are still upserted, so the last value wins across chunks
+        too, but counted as duplicates.
+        """
+        unique = {row["external_id"]: row for row in rows}
+        seen = self._seen_ids
+        stats.duplicates += len(rows) - len(unique)
+        stats.duplicates += sum(1 for external_id in unique if external_id in seen)
+        seen.update(unique)
+        return list(unique.values())
+
+    def _resolve_categories(self, rows: List[Dict[str, Any]]) -> None:
+        """Replaces the category name of each row by its ``category_id``.
+
+        Runs outside the upsert transaction, so a rolled back batch never leaves
+        ids of uncommitted categories in the cache.
+        """
+        ids = self._categories.resolve(row["category"] for row in rows)
+        for row in rows:
+            row["category_id"] = ids[row.pop("category")]
+
+    def _column_types(self, normalizer: RecordNormalizer) -> Dict[str, type]:
+        """Returns the column types the readers convert to.
+
+        With an error budget every column is read as text: a value that does
+        not convert would otherwise fail the whole chunk in the reader, and
+        not only its row in the normalizer.
+        """
+        if self.max_errors is not None:
+            return dict.fromkeys(normalizer.dtypes, str)
+        return normalizer.dtypes
+
+    def _read_csv(
+        self, path: readers.Source, normalizer: RecordNormalizer
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yields chunks of raw CSV rows, reading only the columns of the source schema."""
+        return readers.read_csv(
+            path,
+            normalizer.columns,
+            self._column_types(normalizer),
+            self.chunksize,
+            required=normalizer.required_columns,
+        )
+
+    def _read_json_lines(
+        self, path: readers.Source, normalizer: RecordNormalizer
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yields chunks of raw JSON Lines records, keeping only the source columns."""
+        return readers.read_json_lines(
+            path, normalizer.columns, self._column_types(normalizer), self.chunksize
+        )
+
+    def _build_id_index(self) -> BloomFilter:
+        """Loads the external_ids already stored into a Bloom filter, once per run.
+
+        Rows whose id is not in the filter are definitely new and skip the
+        existence lookup; the filter is sized with headroom for the ids created
+        during the run.
+        """
+        primary = POI.objects.using(DEFAULT_DB_ALIAS)
+        existing = primary.count()
+        index = BloomFilter(capacity=max(2 * existing, self.ID_INDEX_MIN_CAPACITY))
+        index.update(
+            primary.values_list("external_id", flat=True).iterator(
+                chunk_size=self.batch_size
+            )
+        )
+        return index
+
+    def _existing_rows(self, externals: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns {external_id: {pk, *HISTORY_FIELDS}} for the ids already stored.
+
+        The HISTORY_FIELDS include the TRACKED_FIELDS of the summary tables.
+
+        Always reads the primary: a lagging replica would turn updates into
+        duplicate inserts.
+        """
+        index = self._id_index
+        if index is not None:
+            externals = [external for external in externals if external in index]
+        current: Dict[str, Dict[str, Any]] = {}
+        primary = POI.objects.using(DEFAULT_DB_ALIAS)
+        for chunk in batched(externals, self.batch_size):
+            for row in primary.filter(external_id__in=chunk).values(
+                "external_id", "pk", *HISTORY_FIELDS
+            ):
+                current[row.pop("external_id")] = row
+        return current
 
     @transaction.atomic
     def _upsert_rows(self, rows: List[Dict[str, Any]]) -> tuple[int, int]:
-        """Performs upsert of records in the database. Returns (created, updated)."""
+        """Performs upsert of records in the database. Returns (created, updated).
+
+        The per-category statistics are updated in the same transaction, from
+        the difference between the previous and the new values of the rows, and
+        the fields that changed are added to the PoI change history.
+        """
         created = 0
         updated = 0
         if rows:
-            externals = [r["external_id"] for r in rows]
-            current = {
-                instance.external_id: instance
-                for instance in POI.objects.filter(external_id__in=externals)
-            }
+            current = self._existing_rows([r["external_id"] for r in rows])
 
             to_create = []
             to_update = []
+            delta = AggregateDelta()
+            changes = ChangeLog(
+                self._progress.record.pk if self._progress is not None else None
+            )
 
+            now = timezone.now()
             for r in rows:
-                existing = current.get(r["external_id"])
-                if existing:
-                    existing.name = r["name"]
-                    existing.latitude = r["latitude"]
-                    existing.longitude = r["longitude"]
-                    existing.category = r["category"]
-                    existing.ratings = r["ratings"]
-                    existing.description = r["description"]
-                    to_update.append(existing)
+                previous = current.get(r["external_id"])
+                if previous is not None:
+                    delta.remove(previous)
+                    changes.add(previous["pk"], previous, r)
+                    to_update.append(POI(pk=previous["pk"], updated_at=now, **r))
                 else:
                     to_create.append(POI(**r))
+                delta.add(r)
 
             for chunk in batched(to_create, self.batch_size):
                 POI.objects.bulk_create(list(chunk), batch_size=self.batch_size)
@@ -153,9 +805,122 @@ class ImportBuilder:
                         "category",
                         "ratings",
                         "description",
+                        "updated_at",
                     ],
                     batch_size=self.batch_size,
                 )
                 updated += len(chunk)
 
+            delta.apply()
+            changes.write(self.batch_size)
+            transaction.on_commit(bump_data_version)
+
+            if self._id_index is not None:
+                self._id_index.update(instance.external_id for instance in to_create)
+
         return (created, updated)
+
+
+def stored_external_ids() -> set[str]:
+    """Returns a snapshot of the external ids stored, read from the primary."""
+    return set(
+        POI.objects.using(DEFAULT_DB_ALIAS)
+        .values_list("external_id", flat=True)
+        .iterator(chunk_size=10_000)
+    )
+
+
+def claim_import_job() -> HistoricalImportData | None:
+    """Atomically claims the oldest pending import job.
+    Returns:
+        HistoricalImportData | None: The claimed record, now running, or None when
+        the queue is empty.
+    """
+    pending = (
+        HistoricalImportData.objects.filter(status=ImportStatus.PENDING)
+        .exclude(file="", path="")
+        .order_by("timestamp")
+    )
+    for pk in pending.values_list("pk", flat=True)[:10]:
+        now = timezone.now()
+        claimed = HistoricalImportData.objects.filter(
+            pk=pk, status=ImportStatus.PENDING
+        ).update(status=ImportStatus.RUNNING, started_at=now, heartbeat_at=now)
+        if claimed:
+            return HistoricalImportData.objects.get(pk=pk)
+    return None
+
+
+def stale_import_jobs(stale_after: float) -> QuerySet[HistoricalImportData]:
+    """Returns the running jobs without progress for ``stale_after`` seconds.
+
+    Their worker saves the progress after every batch, so they were left
+    behind by a worker that crashed or was killed.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return (
+        HistoricalImportData.objects.filter(status=ImportStatus.RUNNING)
+        .exclude(file="", path="")
+        .filter(
+            Q(heartbeat_at__lt=cutoff)
+            | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+        )
+    )
+
+
+def reclaim_stale_import_jobs(stale_after: float) -> int:
+    """Puts the stale running jobs back in the queue.
+    Args:
+        stale_after (float): Seconds without progress after which a running job
+            is considered abandoned; longer than the slowest batch.
+    Returns:
+        int: The number of jobs re-queued.
+    """
+    return stale_import_jobs(stale_after).update(
+        status=ImportStatus.PENDING,
+        error=f"Re-queued: no progress from its worker for {stale_after:g} s",
+        heartbeat_at=None,
+    )
+
+
+def run_import_job(record: HistoricalImportData, **options: Any) -> ImportStats:
+    """Runs a claimed import job with an ImportBuilder built from options."""
+    return ImportBuilder([], **options).run_job(record)
+
+
+def import_records(
+    data: Iterable[Mapping[str, Any]] | AsyncIterable[Mapping[str, Any]] | IO[bytes],
+    input_format: str,
+    *,
+    name: str = "records",
+    on_event: Callable[[ImportEvent], bool | None] | None = None,
+    **options: Any,
+) -> ImportStats:
+    """Imports in-memory records, or a binary file object, through the pipeline.
+
+    The records are raw rows of the given format (``csv``, ``json``,
+    ``jsonl`` or ``xml``), as read from a feed of that format: CSV rows keyed
+    by their header, JSON objects or dicts of the XML elements. They are
+    normalized, validated and written exactly like the rows of a file.
+
+    Args:
+        data: Records, an async iterable of records, or a file object.
+        input_format: The format of the records, which sets their schema.
+        name: The name of the input in its history record.
+        on_event: Called with each progress event; returning False cancels the
+            import before its next chunk.
+        **options: The options of ImportBuilder.
+    Returns:
+        ImportStats: The counters of the import, up to the cancellation if any.
+    Raises:
+        ImportServiceError: If the format is unsupported or the import fails.
+    """
+    builder = ImportBuilder([ImportSource(data, input_format, name)], **options)
+    events = builder.events()
+    stats = ImportStats()
+    with closing(events):
+        for event in events:
+            stats = event.stats
+            if on_event is not None and on_event(event) is False:
+                break
+    return stats
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+from point_of_interest.aggregates import TRACKED_FIELDS, AggregateDelta
+from point_of_interest.models import POI
+
+
+class SeenIdTable:
+    """Temporary table holding every external_id seen during a full-sync import.
+
+    The table lives on the import connection only, so the set of seen ids never
+    has to be materialized in Python; stale PoIs are then removed with a
+    ``NOT EXISTS`` anti-join against it.
+    """
+
+    table_name = "import_seen_external_ids"
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.using = using
+        self.connection = connections[using]
+        self.count = 0
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _from_db(self, field: models.Field[Any, Any], value: Any) -> Any:
+        """Converts a raw column value as the ORM would (e.g. decodes JSON)."""
+        if value is not None and hasattr(field, "from_db_value"):
+            return field.from_db_value(value, None, self.connection)
+        return value
+
+    def create(self) -> None:
+        """Creates (or recreates) the temporary table."""
+        table = self._quote(self.table_name)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {table} (external_id VARCHAR(128) PRIMARY KEY)"
+            )
+        self.count = 0
+
+    def add(self, external_ids: Iterable[str]) -> None:
+        """Records a batch of external_ids as seen."""
+        params = [(external_id,) for external_id in external_ids]
+        if params:
+            table = self._quote(self.table_name)
+            with self.connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {table} (external_id) VALUES (%s) "
+                    "ON CONFLICT (external_id) DO NOTHING",
+                    params,
+                )
+            self.count += len(params)
+
+    def drop(self) -> None:
+        """Drops the temporary table."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self._quote(self.table_name)}")
+
+    def delete_missing(self, batch_size: int) -> int:
+        """Deletes, in batches, every PoI whose external_id was not seen.
+
+        The deleted rows are returned by the ``DELETE`` itself, so the summary
+        tables are updated in the same transaction without reading them first.
+        Args:
+            batch_size (int): Maximum number of rows removed per transaction.
+        Returns:
+            int: The number of deleted PoIs.
+        """
+        poi_table = self._quote(POI._meta.db_table)
+        concrete = {field.attname: field for field in POI._meta.concrete_fields}
+        pk = self._quote(str(POI._meta.pk.column))
+        external_id = self._quote(str(concrete["external_id"].column))
+        seen_table = self._quote(self.table_name)
+        fields = [concrete[name] for name in TRACKED_FIELDS]
+        returning = ", ".join(self._quote(str(field.column)) for field in fields)
+        sql = (
+            f"DELETE FROM {poi_table} WHERE {pk} IN ("
+            f"SELECT p.{pk} FROM {poi_table} p WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {seen_table} s WHERE s.external_id = p.{external_id}"
+            f") LIMIT %s) RETURNING {returning}"
+        )
+        deleted = 0
+        while True:
+            with transaction.atomic(using=self.using):
+                with self.connection.cursor() as cursor:
+                    cursor.execute(sql, [batch_size])
+                    rows = cursor.fetchall()
+                delta = AggregateDelta()
+                for values in rows:
+                    delta.remove(
+                        {
+                            field.attname: self._from_db(field, value)
+                            for field, value in zip(fields, values)
+                        }
+                    )
+                delta.apply()
+            removed = len(rows)
+            deleted += removed
+            if removed < batch_size:
+                return deleted
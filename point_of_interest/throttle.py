@@ -0,0 +1,211 @@
+"""
+Write budget of the importer, so large loads share a busy database.
+
+Writes are paced to at most ``max_rows_per_second`` rows and
+``max_transactions_per_second`` transactions. On top of that the importer
+backs off, with an exponentially growing pause, while the database looks
+overloaded: a write transaction took longer than ``max_commit_latency``
+seconds, or the health probe (by default the replication lag of the read
+replicas) reports more than ``max_lag``, failing the import once the probe
+kept it waiting for ``max_health_wait`` seconds in a row. The time spent
+waiting and the number of back-offs are added to the import stats.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.schemas import ImportStats
+
+# Returns a measure of the database load (e.g. replication lag in seconds),
+# or None when it is unknown.
+HealthProbe = Callable[[], float | None]
+
+_REPLICA_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+def replica_lag() -> float | None:
+    """Returns the replication lag of the most lagging read replica, in seconds.
+
+    PostgreSQL only: a replica that replayed everything it received has no
+    lag. Returns None without PostgreSQL replicas.
+    """
+    lags = []
+    for alias in getattr(settings, "DATABASE_REPLICAS", []):
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(_REPLICA_LAG_SQL)
+            lags.append(float(cursor.fetchone()[0]))
+    return max(lags, default=None)
+
+
+class WriteThrottle:
+    """Paces the write transactions of imports and backs off under load.
+
+    One instance may be shared by the threads of an import worker: the budget
+    is then shared by all of them. ``clock`` and ``sleep`` can be replaced,
+    e.g. to simulate time in tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_rows_per_second: float | None = None,
+        max_transactions_per_second: float | None = None,
+        max_commit_latency: float | None = None,
+        max_lag: float | None = None,
+        max_health_wait: float | None = 600.0,
+        health_probe: HealthProbe | None = None,
+        probe_interval: float = 5.0,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_rows_per_second = max_rows_per_second or None
+        self.max_transactions_per_second = max_transactions_per_second or None
+        self.max_commit_latency = max_commit_latency or None
+        self.max_lag = max_lag or None
+        self.max_health_wait = max_health_wait or None
+        self.health_probe = health_probe if self.max_lag else None
+        self.probe_interval = probe_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        # When the next transaction may start, with the budget.
+        self._ready_at = 0.0
+        # Pause added before each transaction while the database is overloaded.
+        self._backoff = 0.0
+        self._probe_at = 0.0
+
+    @classmethod
+    def from_settings(cls, **overrides: float | None) -> "WriteThrottle":
+        """Builds the throttle of the IMPORT_MAX_* settings; None overrides are ignored."""
+        probe = getattr(settings, "IMPORT_HEALTH_PROBE", None)
+
+        def option(name: str, setting: str, default: float = 0) -> float | None:
+            value = overrides.pop(name, None)
+            return getattr(settings, setting, default) if value is None else value
+
+        throttle = cls(
+            max_rows_per_second=option(
+                "max_rows_per_second", "IMPORT_MAX_ROWS_PER_SECOND"
+            ),
+            max_transactions_per_second=option(
+                "max_transactions_per_second", "IMPORT_MAX_TRANSACTIONS_PER_SECOND"
+            ),
+            max_commit_latency=option(
+                "max_commit_latency", "IMPORT_MAX_COMMIT_LATENCY"
+            ),
+            max_lag=option("max_lag", "IMPORT_MAX_REPLICA_LAG"),
+            max_health_wait=option(
+                "max_health_wait", "IMPORT_MAX_HEALTH_WAIT", default=600.0
+            ),
+            health_probe=import_string(probe) if isinstance(probe, str) else probe,
+        )
+        if overrides:
+            raise TypeError(f"Unknown write throttle options: {', '.join(overrides)}")
+        return throttle
+
+    @property
+    def active(self) -> bool:
+        """Whether any limit is set; otherwise writes are never delayed."""
+        return any(
+            (
+                self.max_rows_per_second,
+                self.max_transactions_per_second,
+                self.max_commit_latency,
+                self.health_probe,
+            )
+        )
+
+    @contextmanager
+    def write(self, rows: int, stats: ImportStats) -> Iterator[None]:
+        """Wraps a write transaction of ``rows`` rows, waiting for its turn first.
+
+        The time the transaction takes, commit included, is its commit latency.
+        """
+        self._wait(self._reserve(rows), stats)
+        self._check_health(stats)
+        start = self.clock()
+        yield
+        latency = self.clock() - start
+        if self.max_commit_latency and latency > self.max_commit_latency:
+            self._back_off(stats)
+        else:
+            self._recover()
+
+    def _reserve(self, rows: int) -> float:
+        """Books the budget of a transaction, returning when it may start."""
+        cost = 0.0
+        if self.max_rows_per_second:
+            cost = rows / self.max_rows_per_second
+        if self.max_transactions_per_second:
+            cost = max(cost, 1 / self.max_transactions_per_second)
+        with self._lock:
+            start = max(self.clock(), self._ready_at) + self._backoff
+            self._ready_at = start + cost
+        return start
+
+    def _wait(self, until: float, stats: ImportStats) -> None:
+        delay = until - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+            stats.throttled_seconds += delay
+
+    def _check_health(self, stats: ImportStats) -> None:
+        """Pauses while the health probe reports more than ``max_lag``.
+
+        The probe runs at most every ``probe_interval`` seconds while healthy,
+        and before every retry once over the threshold.
+        Raises:
+            ImportServiceError: If the probe is still over the threshold after
+            ``max_health_wait`` seconds.
+        """
+        if (
+            self.health_probe is None
+            or self.max_lag is None
+            or self.clock() < self._probe_at
+        ):
+            return
+        since = self.clock()
+        while True:
+            value = self.health_probe()
+            if value is None or value <= self.max_lag:
+                break
+            waited = self.clock() - since
+            if self.max_health_wait is not None and waited >= self.max_health_wait:
+                raise ImportServiceError(
+                    f"Import aborted: the database stayed overloaded for {waited:.0f} s "
+                    f"(health probe {value:g}, max {self.max_lag:g})."
+                )
+            self._back_off(stats)
+            self._wait(self.clock() + self._backoff, stats)
+        self._probe_at = self.clock() + self.probe_interval
+
+    def _back_off(self, stats: ImportStats) -> None:
+        with self._lock:
+            self._backoff = min(
+                self.max_backoff, max(self.min_backoff, self._backoff * 2)
+            )
+        stats.backoffs += 1
+
+    def _recover(self) -> None:
+        with self._lock:
+            self._backoff = (
+                0.0 if self._backoff <= self.min_backoff else self._backoff / 2
+            )
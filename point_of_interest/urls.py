@@ -0,0 +1,11 @@
+from django.urls import path
+
+from point_of_interest import views
+
+app_name = "point_of_interest"
+
+urlpatterns = [
+    path("pois/", views.poi_list, name="poi-list"),
+    path("pois/<str:lookup>/", views.poi_detail, name="poi-detail"),
+    path("clusters/", views.cluster_list, name="cluster-list"),
+]
@@ -1,11 +1,24 @@
+import stat
+import sys
 import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Iterator, Sequence
+from typing import IO, Any, Iterator, Sequence
 from uuid import UUID
 
 from point_of_interest.enums import SourceType
 from point_of_interest.schemas import ImportData
 
+# Input path of the standard input.
+STDIN = "-"
+# Formats of the --format option: JSON Lines is read as JSON, one record per line.
+INPUT_FORMATS = {
+    "csv": SourceType.CSV,
+    "json": SourceType.JSON,
+    "jsonl": SourceType.JSON,
+    "xml": SourceType.XML,
+}
+
 
 def validate_uuid(uuid_string: str) -> bool:
     """Function responsible to check the uuid input
@@ -22,20 +35,44 @@ def validate_uuid(uuid_string: str) -> bool:
     return result
 
 
-def source_from_path(path: Path) -> str | ValueError:
-    """Infer source type from file suffix.
+def get_lookup_params(term: str) -> dict[str, Any] | None:
+    """Function to build the exact PoI lookup for a search term.
+    Args:
+        term (str): A PoI internal id (UUID) or a numeric external id.
+    Returns:
+        dict[str, Any] | None: Lookup kwargs for the POI queryset, or None when
+        the term is neither a UUID nor a number.
+    """
+    term = term.strip()
+    if validate_uuid(term):
+        return {"pk": UUID(term)}
+    if term.isdigit():
+        return {"external_id": term}
+    return None
+
+
+def source_from_path(path: Path, input_format: str | None = None) -> str:
+    """Infer source type from file suffix, unless the input format is given.
     Args:
         path (Path): Receives the file path to infer the source type from.
+        input_format (str | None): One of INPUT_FORMATS, required for stdin.
     Raises:
-        ValueError: If the file extension is unsupported.
+        ValueError: If the format or the file extension is unsupported.
     Returns:
-        str: Return the inferred source type or a ValueError if unsupported.
+        str: Return the inferred source type.
     """
+    if input_format is not None:
+        try:
+            return INPUT_FORMATS[input_format]
+        except KeyError:
+            raise ValueError(f"Unsupported input format: {input_format}") from None
+    if str(path) == STDIN:
+        raise ValueError("The input format is required to read from stdin")
     extension = path.suffix.lower()
     match extension:
         case ".csv":
             return SourceType.CSV
-        case ".json":
+        case ".json" | ".jsonl":
             return SourceType.JSON
         case ".xml":
             return SourceType.XML
@@ -43,6 +80,65 @@ def source_from_path(path: Path) -> str | ValueError:
             raise ValueError(f"Unsupported file extension: {extension}")
 
 
+def is_stream(path: Path) -> bool:
+    """Function to check if an input can only be read once, from start to end.
+    Args:
+        path (Path): The input path.
+    Returns:
+        bool: True for stdin, named pipes and character devices (e.g. /dev/fd/N
+        of a shell process substitution), False for regular or missing files.
+    """
+    if str(path) == STDIN:
+        return True
+    try:
+        mode = path.stat().st_mode
+    except OSError:
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISCHR(mode)
+
+
+@contextmanager
+def open_input(path: Path) -> Iterator[Path | IO[bytes]]:
+    """Opens an input for the readers: regular files are read from their path,
+    streams from a binary file object, without buffering them to disk.
+    Args:
+        path (Path): The input path, ``-`` for stdin.
+    Yields:
+        Iterator[Path | IO[bytes]]: The path of a regular file, or a binary stream.
+    """
+    if str(path) == STDIN:
+        yield sys.stdin.buffer
+    elif is_stream(path):
+        with path.open("rb") as handle:
+            yield handle
+    else:
+        yield path
+
+
+def estimate_rows(path: Path, source: str) -> int | None:
+    """Function to estimate the number of records of a file, used for progress ETAs.
+    Args:
+        path (Path): Path to the file.
+        source (str): Source type of the file.
+    Returns:
+        int | None: The number of data lines for CSV and JSON Lines files, or None
+        when it cannot be estimated cheaply (XML, JSON arrays, non-regular files).
+    """
+    if source == SourceType.XML or is_stream(path) or not path.is_file():
+        return None
+    count = 0
+    with path.open("rb") as handler:
+        head = handler.read(1024).lstrip()
+        if source == SourceType.JSON and head.startswith(b"["):
+            return None
+        handler.seek(0)
+        for block in iter(lambda: handler.read(1 << 20), b""):
+            count += block.count(b"\n")
+    if source == SourceType.CSV:
+        count -= 1
+    return max(count, 0)
+
+
 def normalize_record(row: dict[str, Any], source: str) -> dict[str, Any]:
     """
     Normalize a data row based on its source type.
@@ -61,20 +157,28 @@ def normalize_record(row: dict[str, Any], source: str) -> dict[str, Any]:
         raise ValueError(f"Error normalizing record: {exc}") from exc
 
 
-def iter_xml_dicts(path: Path) -> Iterator[dict[str, Any]]:
+def iter_xml_dicts(source: Path | IO[bytes]) -> Iterator[dict[str, Any]]:
     """Function to iterate over XML file and yield dicts for each PoI-like node.
+
+    The document is parsed incrementally and each PoI node is dropped once
+    read, so memory does not grow with the size of the file.
     Args:
-        path (Path): Path to the XML file.
+        source (Path | IO[bytes]): Path or binary file object of the XML file.
     Yields:
         Iterator[dict[str, Any]]: Dict representation of each PoI-like node.
     """
     required = {"pid", "pname", "platitude", "plongitude", "pcategory", "pratings"}
-    tree = ET.parse(path)
-    root = tree.getroot()
-    for node in root.iter():
+    parents = []
+    for event, node in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(node)
+            continue
+        parents.pop()
         tags = {c.tag for c in node}
         if required.issubset(tags):
             yield {child.tag: (child.text or "").strip() for child in node}
+            if parents:
+                parents[-1].remove(node)
 
 
 def batched(seq: Sequence[Any], batch_size: int) -> Iterator[Sequence[Any]]:
@@ -0,0 +1,294 @@
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Collection, Iterator, List, Sequence, Tuple
+
+from point_of_interest import readers
+from point_of_interest.enums import SourceType
+from point_of_interest.normalizers import RecordNormalizer
+from point_of_interest.rejects import ErrorBudget
+from point_of_interest.utils import iter_xml_dicts, source_from_path
+
+# Size of the pieces CSV and JSON Lines files are split into, one task each.
+SEGMENT_BYTES = 32 << 20
+# Invalid rows and duplicated ids listed in a report.
+SAMPLE_SIZE = 20
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """A byte range of a source file, validated by a single worker.
+
+    ``end`` is None for the files read as a whole (XML and JSON arrays). CSV
+    segments carry the header line of their file.
+    """
+
+    path: Path
+    source: str
+    start: int = 0
+    end: int | None = None
+    header: bytes = b""
+
+
+@dataclass(slots=True)
+class SegmentResult:
+    """Outcome of a segment: the ids of its valid rows and its invalid rows."""
+
+    rows: int = 0
+    external_ids: List[str] = field(default_factory=list)
+    invalid: int = 0
+    # (index of the row in the segment, reason), at most SAMPLE_SIZE of them.
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ValidationReport:
+    """What importing the validated files would do, without touching the database.
+
+    ``to_create`` and ``to_update`` are the created and updated counters the
+    import would report, from the ids stored when the snapshot was taken.
+    """
+
+    files: int = 0
+    rows: int = 0
+    valid: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    to_create: int = 0
+    to_update: int = 0
+    errors: List[Tuple[str, int, str]] = field(default_factory=list)
+    duplicate_ids: List[Tuple[str, str]] = field(default_factory=list)
+
+    def within(self, budget: ErrorBudget | None) -> bool:
+        """Returns whether the import would succeed with the given error budget."""
+        if budget is None:
+            return not self.invalid
+        if budget.percent is not None:
+            return self.invalid * 100 <= budget.percent * self.rows
+        return self.invalid <= (budget.limit or 0)
+
+
+def _split_offsets(path: Path, start: int, size: int, quoted: bool) -> List[int]:
+    """Returns the start offsets of the segments of a file, then its size.
+
+    Segments end after a line break; for CSV only after one outside a quoted
+    value (an even number of quotes before it), so records with line breaks
+    in their values are never cut.
+    """
+    offsets = [start]
+    target = start + SEGMENT_BYTES
+    # Parity of the quotes between start and position + counted.
+    parity = 0
+    position = start
+    with path.open("rb") as handle:
+        handle.seek(start)
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            end = position + len(block)
+            counted = 0
+            while target < end:
+                index = max(target - position, 0)
+                while (newline := block.find(b"\n", index)) >= 0:
+                    if quoted:
+                        parity ^= block.count(b'"', counted, newline) & 1
+                        counted = newline
+                    if not parity:
+                        break
+                    index = newline + 1
+                if newline < 0:
+                    break
+                offsets.append(position + newline + 1)
+                target = position + newline + 1 + SEGMENT_BYTES
+            if quoted:
+                parity ^= block.count(b'"', counted) & 1
+            position = end
+    offsets.append(size)
+    return offsets
+
+
+def split_file(path: Path, source: str) -> List[Segment]:
+    """Splits a file into the segments validated in parallel.
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    size = path.stat().st_size
+    if source == SourceType.XML:
+        return [Segment(path, source)]
+    with path.open("rb") as handle:
+        first = handle.readline()
+    if source == SourceType.JSON:
+        try:
+            json_lines = isinstance(json.loads(first), dict)
+        except ValueError:
+            json_lines = False
+        if not json_lines:
+            return [Segment(path, source)]
+        start, header, quoted = 0, b"", False
+    else:
+        start, header, quoted = len(first), first, True
+    offsets = _split_offsets(path, start, size, quoted)
+    return [
+        Segment(path, source, begin, end, header)
+        for begin, end in zip(offsets, offsets[1:])
+        if end > begin
+    ] or [Segment(path, source, start, start, header)]
+
+
+def _read_segment(segment: Segment, normalizer: RecordNormalizer) -> Iterator[Any]:
+    """Yields the raw rows of a segment, every value read as text."""
+    path = segment.path
+    if segment.end is None:
+        if segment.source == SourceType.XML:
+            yield from iter_xml_dicts(path)
+            return
+        data = json.loads(path.read_text(encoding="utf-8"))
+        yield from [data] if isinstance(data, dict) else data
+        return
+    with path.open("rb") as handle:
+        handle.seek(segment.start)
+        data = handle.read(segment.end - segment.start)
+    if segment.source == SourceType.JSON:
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                record = exc
+            yield record
+        return
+    # Checked before the empty segments, as the import checks any CSV file.
+    readers.check_columns(
+        readers.csv_header(segment.header), normalizer.required_columns
+    )
+    if not data.strip():
+        return
+    for chunk in readers.read_csv(
+        io.BytesIO(segment.header + data),
+        normalizer.columns,
+        dict.fromkeys(normalizer.dtypes, str),
+        chunksize=1 << 16,
+    ):
+        yield from chunk
+
+
+def validate_segment(segment: Segment) -> SegmentResult:
+    """Reads and normalizes a segment. Runs in a worker process, without Django."""
+    normalizer = RecordNormalizer(segment.source)
+    result = SegmentResult()
+    rows = list(_read_segment(segment, normalizer))
+    # Lines that are not valid JSON are invalid rows of their own.
+    broken = [
+        (index, f"Invalid JSON: {row}")
+        for index, row in enumerate(rows)
+        if isinstance(row, ValueError)
+    ]
+    if broken:
+        indexes = [i for i, row in enumerate(rows) if not isinstance(row, ValueError)]
+        records, errors = normalizer.partition_batch([rows[i] for i in indexes])
+        errors = sorted(broken + [(indexes[i], reason) for i, reason in errors])
+    else:
+        records, errors = normalizer.partition_batch(rows)
+    result.rows = len(rows)
+    result.external_ids = [record["external_id"] for record in records]
+    result.invalid = len(errors)
+    result.errors = errors[:SAMPLE_SIZE]
+    return result
+
+
+class FeedValidator:
+    """Checks whether files would import cleanly, without a database connection.
+
+    The files are split into segments read and normalized in parallel by
+    worker processes (spawned, so they share nothing with the caller, database
+    connections included). The parent only aggregates the ids of the valid
+    rows, to count duplicates and, against a snapshot of the stored ids, the
+    PoIs the import would create or update.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str | Path],
+        *,
+        workers: int | None = None,
+        input_format: str | None = None,
+    ):
+        self.paths = [Path(p) for p in paths]
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.input_format = input_format
+
+    def run(self, known_ids: Collection[str] = ()) -> ValidationReport:
+        """Validates every file.
+        Args:
+            known_ids (Collection[str]): The external ids already stored.
+        Raises:
+            FileNotFoundError: If a file does not exist.
+            ValueError: If a file has an unsupported type.
+            ImportServiceError: If a CSV file lacks a required column.
+        Returns:
+            ValidationReport: The validation report of all the files.
+        """
+        plans = [
+            (path, split_file(path, source_from_path(path, self.input_format)))
+            for path in self.paths
+        ]
+        segments = [segment for _, file_segments in plans for segment in file_segments]
+        if self.workers == 1 or len(segments) == 1:
+            results: Iterator[SegmentResult] = map(validate_segment, segments)
+            return self._aggregate(plans, results, known_ids)
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(segments)),
+            mp_context=get_context("spawn"),
+        ) as pool:
+            return self._aggregate(
+                plans, pool.map(validate_segment, segments), known_ids
+            )
+
+    def _aggregate(
+        self,
+        plans: List[Tuple[Path, List[Segment]]],
+        results: Iterator[SegmentResult],
+        known_ids: Collection[str],
+    ) -> ValidationReport:
+        """Combines the segment results, in file order, into a report.
+
+        Duplicates are counted per file, and an id seen in an earlier file
+        counts as an update, as the import would report them. ``known_ids``
+        (a snapshot of the whole table) is only read, never copied.
+        """
+        report = ValidationReport(files=len(plans))
+        # Ids the earlier files would create.
+        created: set[str] = set()
+        for path, file_segments in plans:
+            seen: set[str] = set()
+            offset = 0
+            for _ in file_segments:
+                result = next(results)
+                report.errors.extend(
+                    (path.name, offset + index + 1, reason)
+                    for index, reason in result.errors
+                    if len(report.errors) < SAMPLE_SIZE
+                )
+                ids = result.external_ids
+                before = len(seen)
+                if len(report.duplicate_ids) < SAMPLE_SIZE:
+                    for external_id in ids:
+                        if external_id in seen:
+                            report.duplicate_ids.append((path.name, external_id))
+                            if len(report.duplicate_ids) == SAMPLE_SIZE:
+                                break
+                        seen.add(external_id)
+                seen.update(ids)
+                report.duplicates += len(ids) - (len(seen) - before)
+                report.rows += result.rows
+                report.valid += len(ids)
+                report.invalid += result.invalid
+                offset += result.rows
+            new = seen.difference(known_ids, created)
+            report.to_create += len(new)
+            report.to_update += len(seen) - len(new)
+            created.update(new)
+        return report
@@ -0,0 +1,270 @@
+import base64
+import binascii
+import hmac
+import json
+from functools import wraps
+from hashlib import md5
+from typing import Any, Callable
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    JsonResponse,
+)
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+from core.db_routers import replica_reads
+from point_of_interest.aggregates import (
+    CLUSTER_ZOOMS,
+    cluster_cell,
+    mercator_fractions,
+)
+from point_of_interest.caching import get_data_version
+from point_of_interest.models import POI, Category, MapCluster, average_rating
+from point_of_interest.utils import get_lookup_params
+
+POI_API_FIELDS = (
+    "id",
+    "external_id",
+    "name",
+    "latitude",
+    "longitude",
+    "category__name",
+    "ratings",
+    "description",
+    "updated_at",
+)
+
+
+def serialize_poi(values: dict[str, Any]) -> dict[str, Any]:
+    """Builds the API representation of a PoI from its field values."""
+    data = dict(values)
+    data["category"] = data.pop("category__name")
+    data["ratings"] = list(values["ratings"])
+    data["avg_rating"] = average_rating(data["ratings"])
+    return data
+
+
+def _etag(*parts: Any) -> str:
+    return (
+        '"%s"'
+        % md5(":".join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+    )
+
+
+def _conditional_json(
+    request: HttpRequest, etag: str, build: Callable[[], dict[str, Any]]
+) -> HttpResponse:
+    """Answers 304 when the client has the ETag, otherwise the cached JSON body."""
+    client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in client_etags or "*" in client_etags:
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        key = f"point_of_interest:api:{etag}"
+        body = cache.get(key)
+        if body is None:
+            body = json.dumps(build(), cls=DjangoJSONEncoder)
+            cache.set(key, body, settings.API_CACHE_TIMEOUT)
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _bad_request(message: str) -> JsonResponse:
+    return JsonResponse({"error": message}, status=400)
+
+
+def _split_bbox(value: str) -> tuple[float, float, float, float]:
+    """Parses ``min_lon,min_lat,max_lon,max_lat``."""
+    min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _parse_bbox(value: str) -> Q:
+    """Parses ``min_lon,min_lat,max_lon,max_lat`` into a latitude/longitude filter."""
+    min_lon, min_lat, max_lon, max_lat = _split_bbox(value)
+    query = Q(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon <= max_lon:
+        return query & Q(longitude__gte=min_lon, longitude__lte=max_lon)
+    # The box crosses the antimeridian.
+    return query & (Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon))
+
+
+def _encode_cursor(pk: UUID) -> str:
+    return base64.urlsafe_b64encode(pk.bytes).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> UUID:
+    return UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def _has_api_token(request: HttpRequest) -> bool:
+    """Whether the request carries one of the API_TOKENS as a bearer token."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    # Every token is compared, in constant time, not to leak which one matched.
+    matches = [
+        hmac.compare_digest(token.encode(), known.encode())
+        for known in settings.API_TOKENS
+    ]
+    return any(matches)
+
+
+def api_auth(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+    """Lets through authenticated users and API token holders (or everybody
+    with API_PUBLIC); answers 401 otherwise."""
+
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if (
+            settings.API_PUBLIC
+            or request.user.is_authenticated
+            or _has_api_token(request)
+        ):
+            return view(request, *args, **kwargs)
+        response = JsonResponse({"error": "Authentication required."}, status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="api"'
+        return response
+
+    return wrapper
+
+
+@require_safe
+@api_auth
+@replica_reads()
+def poi_list(request: HttpRequest) -> HttpResponse:
+    """Lists PoIs ordered by internal id, with cursor pagination.
+
+    Query parameters: ``category``, ``bbox`` (min_lon,min_lat,max_lon,max_lat),
+    ``limit`` and ``cursor`` (the ``next_cursor`` of the previous page).
+    """
+    params = request.GET
+    queryset = POI.objects.order_by("pk")
+    try:
+        limit = min(
+            int(params.get("limit", settings.API_PAGE_SIZE)), settings.API_MAX_PAGE_SIZE
+        )
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return _bad_request("limit must be a positive integer.")
+    if params.get("category"):
+        queryset = queryset.filter(category__name=params["category"])
+    if params.get("bbox"):
+        try:
+            queryset = queryset.filter(_parse_bbox(params["bbox"]))
+        except ValueError:
+            return _bad_request("bbox must be min_lon,min_lat,max_lon,max_lat.")
+    if params.get("cursor"):
+        try:
+            queryset = queryset.filter(pk__gt=_decode_cursor(params["cursor"]))
+        except (ValueError, binascii.Error):
+            return _bad_request("Invalid cursor.")
+
+    def build() -> dict[str, Any]:
+        rows = list(queryset.values(*POI_API_FIELDS)[: limit + 1])
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "results": [serialize_poi(row) for row in rows],
+            "next_cursor": _encode_cursor(rows[-1]["id"]) if has_next else None,
+        }
+
+    etag = _etag("list", get_data_version(), request.get_full_path())
+    return _conditional_json(request, etag, build)
+
+
+@require_safe
+@api_auth
+@replica_reads()
+def poi_detail(request: HttpRequest, lookup: str) -> HttpResponse:
+    """Returns a PoI by internal id (UUID) or external id."""
+    filters = get_lookup_params(lookup) or {"external_id": lookup}
+    queryset = POI.objects.filter(**filters)
+    current = queryset.values_list("pk", "updated_at").first()
+    if current is None:
+        return JsonResponse({"error": "PoI not found."}, status=404)
+
+    def build() -> dict[str, Any]:
+        return serialize_poi(queryset.values(*POI_API_FIELDS).get())
+
+    return _conditional_json(request, _etag("detail", *current), build)
+
+
+def _cluster_cells_filter(zoom: int, value: str) -> Q:
+    """Converts a bbox into the x/y ranges of the cluster cells at a zoom level."""
+    min_lon, min_lat, max_lon, max_lat = _split_bbox(value)
+    if min_lat > max_lat:
+        raise ValueError("min_lat greater than max_lat")
+    # Mercator y grows southwards: the north-west corner has the smallest x/y.
+    min_x, min_y = cluster_cell(zoom, *mercator_fractions(max_lat, min_lon))
+    max_x, max_y = cluster_cell(zoom, *mercator_fractions(min_lat, max_lon))
+    query = Q(y__gte=min_y, y__lte=max_y)
+    if min_lon <= max_lon:
+        return query & Q(x__gte=min_x, x__lte=max_x)
+    # The box crosses the antimeridian.
+    return query & (Q(x__gte=min_x) | Q(x__lte=max_x))
+
+
+@require_safe
+@api_auth
+@replica_reads()
+def cluster_list(request: HttpRequest) -> HttpResponse:
+    """Returns the PoI clusters of a map viewport, from the precomputed aggregates.
+
+    Query parameters: ``bbox`` (min_lon,min_lat,max_lon,max_lat, required),
+    ``zoom`` (map zoom level, required) and ``category``. Clusters come from
+    the closest precomputed level not above ``zoom``; the PoI table is never
+    queried.
+    """
+    params = request.GET
+    try:
+        zoom = int(params["zoom"])
+        if zoom < 0:
+            raise ValueError
+    except (KeyError, ValueError):
+        return _bad_request("zoom must be a non-negative integer.")
+    level = max((z for z in CLUSTER_ZOOMS if z <= zoom), default=CLUSTER_ZOOMS[0])
+    try:
+        cells = _cluster_cells_filter(level, params["bbox"])
+    except (KeyError, ValueError):
+        return _bad_request("bbox must be min_lon,min_lat,max_lon,max_lat.")
+    category = MapCluster.ALL_CATEGORIES
+    if params.get("category"):
+        category = (
+            Category.objects.filter(name=params["category"])
+            .values_list("pk", flat=True)
+            .first()
+        )
+    queryset = MapCluster.objects.filter(
+        cells, zoom=level, category=category, count__gt=0
+    ).order_by("y", "x")
+
+    def build() -> dict[str, Any]:
+        rows = queryset.values_list("x", "y", "count", "latitude_sum", "longitude_sum")
+        return {
+            "zoom": level,
+            "clusters": [
+                {
+                    "x": x,
+                    "y": y,
+                    "count": count,
+                    "latitude": round(latitude / count, 6),
+                    "longitude": round(longitude / count, 6),
+                }
+                for x, y, count, latitude, longitude in rows
+            ],
+        }
+
+    etag = _etag("clusters", get_data_version(), request.get_full_path())
+    return _conditional_json(request, etag, build)
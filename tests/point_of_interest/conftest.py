@@ -2,7 +2,7 @@ import pytest
 from django.contrib.auth.models import User
 from django.test import RequestFactory
 
-from point_of_interest.models import POI, HistoricalImportData, SourceType
+from point_of_interest.models import POI, Category, HistoricalImportData, SourceType
 from point_of_interest.services import ImportBuilder, ImportServiceError, ImportStats
 
 
@@ -60,6 +60,7 @@ def poi_factory():
             "description": "",
         }
         data.update(kwargs)
+        data["category"], _ = Category.objects.get_or_create(name=data["category"])
         return POI.objects.create(**data)
 
     return _factory
@@ -106,7 +107,7 @@ def create_poi_instance():
         "name": "unser Laden, Familie Lackinger",
         "latitude": 48.008273899935716,
         "longitude": 16.2454885,
-        "category": "convenience-store",
+        "category": Category.objects.create(name="convenience-store"),
         "ratings": [2, 2, 3, 3, 4, 5, 2, 2, 4, 1],
         "description": "dzpdfeldblkzqcxltrn",
     }
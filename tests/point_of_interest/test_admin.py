@@ -1,10 +1,17 @@
 import uuid
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
 from django.contrib import admin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from point_of_interest.admin import HistoricalImportDataAdmin, PointOfInterestAdmin
+from point_of_interest.enums import ImportStatus, SourceType
+from point_of_interest.forms import ImportJobForm
 from point_of_interest.models import POI, HistoricalImportData
 
 
@@ -21,8 +28,18 @@ def test_admin_registration():
     "list_display, list_filter, search_fields, readonly_fields, per_page",
     [
         (
-            ("id", "source", "filename", "timestamp"),
-            ["source"],
+            (
+                "id",
+                "source",
+                "filename",
+                "status",
+                "progress_display",
+                "rows_rejected",
+                "rows_per_second",
+                "eta",
+                "timestamp",
+            ),
+            ["source", "status"],
             ["source"],
             ["timestamp"],
             50,
@@ -117,3 +134,144 @@ def test_poi_admin_search_by_valid_uuid_filters_pk(
         assert list(qs.values_list("id", flat=True)) == [obj.id]
     else:
         assert qs.count() == 0
+
+
+@pytest.mark.parametrize(
+    "processed, total, expected",
+    [(1500, None, "1,500"), (250, 1000, "250 / 1,000 (25%)")],
+)
+def test_historical_import_admin_progress_display(processed, total, expected):
+    adm = HistoricalImportDataAdmin(HistoricalImportData, admin.site)
+    obj = HistoricalImportData(rows_processed=processed, rows_total=total)
+    assert adm.progress_display(obj) == expected
+
+
+@pytest.mark.django_db
+def test_import_job_form_upload_queues_pending_job(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.IMPORT_UPLOAD_ROOT = str(tmp_path / "uploads")
+    upload = SimpleUploadedFile("pois.csv", b"poi_id,poi_name\n")
+    form = ImportJobForm(data={"path": ""}, files={"file": upload})
+    assert form.is_valid(), form.errors
+    record = form.save()
+    assert record.status == ImportStatus.PENDING
+    assert record.source == SourceType.CSV
+    assert record.filename == "pois.csv"
+    assert record.source_path.is_relative_to(tmp_path / "uploads")
+    assert not (tmp_path / "media").exists()
+
+
+@pytest.mark.parametrize(
+    "relative_path, valid",
+    [("pois.json", True), ("../outside.json", False), ("missing.json", False)],
+)
+def test_import_job_form_server_path(settings, tmp_path, relative_path, valid):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "pois.json").write_text("[]")
+    (tmp_path / "outside.json").write_text("[]")
+    settings.IMPORT_SERVER_ROOT = str(root)
+    form = ImportJobForm(data={"path": relative_path})
+    assert form.is_valid() is valid
+    if valid:
+        assert form.instance.source == SourceType.JSON
+        assert form.cleaned_data["path"] == str(root / "pois.json")
+
+
+def test_import_job_form_requires_single_input():
+    form = ImportJobForm(data={"path": ""})
+    assert not form.is_valid()
+    assert (
+        "Provide either a file to upload or a server path." in form.non_field_errors()
+    )
+
+
+def _listing_query(queries, table):
+    """Returns the SQL of the query that fetched the changelist rows."""
+    return next(
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+        and "COUNT(" not in query["sql"]
+        and "ORDER BY" in query["sql"]
+    )
+
+
+@pytest.mark.django_db
+def test_poi_changelist_fetches_displayed_columns_only(admin_client, poi_factory):
+    """Test that the PoI listing skips description and ratings, averaging in SQL."""
+    poi_factory(external_id="1", ratings=[4.5, 3], description="x" * 1000)
+    poi_factory(external_id="2", ratings=[])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(
+            "/admin/point_of_interest/poi/", {"q": "Test", "category__id__exact": 1}
+        )
+
+    assert response.status_code == 200
+    counts = [query for query in queries if "COUNT(" in query["sql"]]
+    assert len(counts) == 1
+    sql = _listing_query(queries, "point_of_interest")
+    assert '"point_of_interest"."description"' not in sql
+    assert '"point_of_interest"."ratings"' not in sql.split(" FROM ")[0].replace(
+        'poi_ratings_avg("point_of_interest"."ratings")', ""
+    )
+    assert "poi_ratings_avg" in sql
+    rows = response.context["cl"].result_list
+    assert sorted(poi.avg_rating_value for poi in rows) == [0.0, 3.75]
+    assert "3.75" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_import_changelist_skips_heavy_columns(admin_client, historical_import_factory):
+    record = historical_import_factory(error="boom" * 1000, stats={"created": 1})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/point_of_interest/historicalimportdata/")
+
+    assert response.status_code == 200
+    sql = _listing_query(queries, "historical_import_data")
+    assert '"historical_import_data"."error"' not in sql
+    assert '"historical_import_data"."stats"' not in sql
+    assert record.filename in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_changelist_actions_get_full_rows(admin_client, historical_import_factory):
+    record = historical_import_factory(
+        status=ImportStatus.FAILED, path="data/pois.csv", error="boom"
+    )
+
+    response = admin_client.post(
+        "/admin/point_of_interest/historicalimportdata/",
+        {"action": "requeue_imports", "_selected_action": [record.pk]},
+    )
+
+    assert response.status_code == 302
+    record.refresh_from_db()
+    assert record.status == ImportStatus.PENDING and record.error == ""
+
+
+@pytest.mark.django_db
+def test_requeue_imports_reclaims_only_stale_running_jobs(
+    admin_client, historical_import_factory, settings
+):
+    settings.IMPORT_JOB_STALE_SECONDS = 600
+    long_ago = timezone.now() - timedelta(hours=1)
+    stale = historical_import_factory(
+        status=ImportStatus.RUNNING, path="data/a.csv", heartbeat_at=long_ago
+    )
+    alive = historical_import_factory(
+        status=ImportStatus.RUNNING, path="data/b.csv", heartbeat_at=timezone.now()
+    )
+
+    admin_client.post(
+        "/admin/point_of_interest/historicalimportdata/",
+        {"action": "requeue_imports", "_selected_action": [stale.pk, alive.pk]},
+    )
+
+    stale.refresh_from_db()
+    alive.refresh_from_db()
+    assert stale.status == ImportStatus.PENDING
+    assert alive.status == ImportStatus.RUNNING
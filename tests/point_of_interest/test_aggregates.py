@@ -0,0 +1,144 @@
+import pytest
+from django.contrib import admin
+from django.core.management import call_command
+
+from point_of_interest.admin import CategoryStatsAdmin
+from point_of_interest.aggregates import (
+    CLUSTER_ZOOMS,
+    CategoryStatsDelta,
+    MapClusterDelta,
+    cluster_cell,
+    mercator_fractions,
+    rebuild_category_stats,
+    rebuild_map_clusters,
+)
+from point_of_interest.models import POI, CategoryStats, MapCluster
+from point_of_interest.services import ImportBuilder
+
+HEADER = "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+
+
+def stats_by_name():
+    return {
+        stats.category.name: (
+            stats.poi_count,
+            stats.rating_count,
+            round(stats.rating_sum, 2),
+            stats.histogram,
+        )
+        for stats in CategoryStats.objects.select_related("category")
+    }
+
+
+def clusters():
+    return {
+        (c.zoom, c.category, c.x, c.y): (
+            c.count,
+            round(c.latitude_sum, 6),
+            round(c.longitude_sum, 6),
+        )
+        for c in MapCluster.objects.filter(count__gt=0)
+    }
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude, expected",
+    [(0.0, 0.0, (0.5, 0.5)), (90.0, -180.0, (0.0, 0.0)), (-90.0, 180.0, (1.0, 1.0))],
+)
+def test_mercator_fractions(latitude, longitude, expected):
+    assert mercator_fractions(latitude, longitude) == pytest.approx(expected)
+
+
+def test_cluster_cell_clamps_to_grid():
+    size = 1 << (2 + 3)
+    assert cluster_cell(2, 1.0, 1.0) == (size - 1, size - 1)
+    assert cluster_cell(2, 0.5, 0.25) == (size // 2, size // 4)
+
+
+def test_map_cluster_delta_cancels_moves():
+    """Test that a PoI moved back to its cell leaves no change to apply."""
+    delta = MapClusterDelta()
+    delta.add(1, 48.2, 16.3)
+    # One cell per zoom for the category and one for the totals.
+    assert len(delta) == 2 * len(CLUSTER_ZOOMS)
+    delta.add(1, 48.2, 16.3, sign=-1)
+    delta.add(1, float("nan"), 16.3)
+    assert all(c.count == 0 and c.latitude_sum == 0 for c in delta.to_clusters())
+
+
+def test_category_stats_delta_histogram():
+    """Test that ratings are clamped and counted in one-star buckets."""
+    delta = CategoryStatsDelta()
+    delta.add(1, [0.5, 4.2, 5, 7, "x"])
+    delta.add(1, [4.2], sign=-1)
+    (stats,) = delta.to_stats()
+    assert stats.poi_count == 0
+    assert stats.rating_count == 3
+    assert stats.rating_sum == pytest.approx(10.5)
+    assert stats.histogram == [1, 0, 0, 0, 2]
+
+
+@pytest.mark.django_db
+def test_import_applies_aggregate_deltas(tmp_path):
+    """Test that created, updated and moved PoIs keep the summaries exact."""
+    first = tmp_path / "first.csv"
+    first.write_text(HEADER + 'E1,Park,1,2,park,"4,5"\nE2,Cafe,1,2,cafe,3\n')
+    second = tmp_path / "second.csv"
+    second.write_text(HEADER + "E1,Park,40,-3,cafe,1\nE3,Park,1,2,park,\n")
+    ImportBuilder([first]).run()
+    ImportBuilder([second]).run()
+    expected = {
+        "cafe": (2, 2, 4.0, [0, 1, 0, 1, 0]),
+        "park": (1, 0, 0.0, [0, 0, 0, 0, 0]),
+    }
+    assert stats_by_name() == expected
+    incremental = clusters()
+    rebuild_category_stats()
+    rebuild_map_clusters()
+    assert stats_by_name() == expected
+    assert clusters() == incremental
+
+
+@pytest.mark.django_db
+def test_single_saves_and_deletes_update_stats(poi_factory):
+    """Test that PoIs edited one by one (e.g. in the admin) are counted too."""
+    poi = poi_factory(external_id="E1", category="park", ratings=[4])
+    poi_factory(external_id="E2", category="park", ratings=[2])
+    poi.ratings = [5]
+    poi.save()
+    assert stats_by_name() == {"park": (2, 2, 7.0, [0, 0, 1, 0, 1])}
+    POI.objects.filter(external_id="E2").delete()
+    assert stats_by_name() == {"park": (1, 1, 5.0, [0, 0, 0, 0, 1])}
+    totals = MapCluster.objects.filter(category=MapCluster.ALL_CATEGORIES)
+    assert sorted(totals.values_list("count", flat=True)) == [1] * len(CLUSTER_ZOOMS)
+
+
+@pytest.mark.django_db
+def test_sync_deletion_updates_stats(tmp_path, poi_factory):
+    """Test that PoIs removed by a sync import are taken out of the summary."""
+    poi_factory(external_id="OLD", category="park", ratings=[3])
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(HEADER + "E1,Cafe,1,2,cafe,4\n")
+    ImportBuilder([csv_path], sync=True).run()
+    assert stats_by_name() == {
+        "cafe": (1, 1, 4.0, [0, 0, 0, 0, 1]),
+        "park": (0, 0, 0.0, [0, 0, 0, 0, 0]),
+    }
+
+
+@pytest.mark.django_db
+def test_rebuild_aggregates_command_repairs_drift(poi_factory, capsys):
+    """Test that the rebuild command recomputes the summary from the PoIs."""
+    poi_factory(external_id="E1", category="park", ratings=[4, 5])
+    CategoryStats.objects.update(poi_count=42, rating_sum=0)
+    call_command("rebuild_aggregates")
+    assert "1 categories" in capsys.readouterr().out
+    assert stats_by_name() == {"park": (1, 2, 9.0, [0, 0, 0, 0, 2])}
+
+
+def test_category_stats_admin_is_read_only(request_factory):
+    adm = CategoryStatsAdmin(CategoryStats, admin.site)
+    request = request_factory.get("/")
+    assert not adm.has_add_permission(request)
+    assert not adm.has_change_permission(request)
+    assert not adm.has_delete_permission(request)
@@ -0,0 +1,28 @@
+import pytest
+
+from point_of_interest.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added key is reported as present."""
+    bloom = BloomFilter(capacity=1_000)
+    keys = [f"E{i}" for i in range(1_000)]
+    bloom.update(keys)
+    assert len(bloom) == 1_000
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate():
+    """Test that the false positive rate stays close to the configured bound."""
+    bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+    bloom.update(f"E{i}" for i in range(5_000))
+    false_positives = sum(f"X{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize("key", [None, 1, b"E1"])
+def test_bloom_filter_ignores_non_string_keys(key):
+    """Test that non-string keys are never reported as present."""
+    bloom = BloomFilter(capacity=10)
+    bloom.add("E1")
+    assert key not in bloom
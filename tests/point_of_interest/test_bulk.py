@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+
+from point_of_interest.bulk import SecondaryIndexes, import_db_profile
+from point_of_interest.models import POI
+from point_of_interest.services import ImportBuilder
+
+
+def poi_indexes():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, POI._meta.db_table
+        )
+    return {
+        name
+        for name, info in constraints.items()
+        if info["index"] and not info["unique"] and not info["primary_key"]
+    }
+
+
+@pytest.mark.django_db
+def test_secondary_indexes_drop_and_restore():
+    """Test that only the non-unique indexes are dropped and all come back."""
+    indexes = SecondaryIndexes(POI)
+    before = poi_indexes()
+    assert before
+    assert set(indexes.drop()) == before
+    assert poi_indexes() == set()
+    assert len(indexes.restore()) == len(before)
+    assert poi_indexes() == before
+    assert indexes.restore() == []
+
+
+@pytest.mark.django_db
+def test_secondary_indexes_restore_recreates_missing_index():
+    """Test that restore repairs an index left missing by an interrupted load."""
+    before = poi_indexes()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX {connection.ops.quote_name(sorted(before)[0])}")
+    assert len(SecondaryIndexes(POI).restore()) == 1
+    assert poi_indexes() == before
+
+
+@pytest.mark.django_db
+def test_secondary_indexes_restore_names_missing_field_index():
+    """Test that a missing field index comes back under its defined name."""
+    name_index = next(
+        name for name in poi_indexes() if name.startswith("point_of_interest_name")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX {connection.ops.quote_name(name_index)}")
+    created = SecondaryIndexes(POI).restore()
+    assert len(created) == 1 and created[0].endswith("_idx")
+    assert created[0] in poi_indexes()
+
+
+def test_secondary_indexes_keep_like_twin_apart(monkeypatch):
+    """Test that a PostgreSQL LIKE index is defined next to its plain twin."""
+    indexes = SecondaryIndexes(POI)
+    monkeypatch.setattr(indexes.connection, "vendor", "postgresql")
+    names = {index.name: index for index in indexes._indexes()}
+    like = [name for name in names if name.endswith(SecondaryIndexes.LIKE_SUFFIX)]
+    assert len(like) == 1
+    plain = like[0].removesuffix(SecondaryIndexes.LIKE_SUFFIX) + "_idx"
+    assert indexes._columns(names[like[0]]) == indexes._columns(names[plain])
+    assert names[like[0]].opclasses == ["varchar_pattern_ops"]
+
+
+@pytest.mark.django_db
+def test_import_db_profile_restores_pragmas(settings):
+    """Test that the import pragmas only last for the duration of the import."""
+    settings.IMPORT_SQLITE_PRAGMAS = {"cache_size": -12345, "synchronous": "OFF"}
+
+    def pragma(name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    cache_size = pragma("cache_size")
+    synchronous = pragma("synchronous")
+    with import_db_profile():
+        assert pragma("cache_size") == -12345
+        # Not changeable inside the test transaction: left untouched.
+        assert pragma("synchronous") == synchronous
+    assert pragma("cache_size") == cache_size
+
+
+@pytest.mark.django_db
+def test_import_builder_bulk_load(tmp_path):
+    """Test that a bulk-load import rebuilds the indexes it dropped."""
+    before = poi_indexes()
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        'E1,Park,1.1,2.2,park,"4,5"\n'
+    )
+    stats = ImportBuilder([csv_path], bulk_load=True).run()
+    assert stats.created == 1
+    assert poi_indexes() == before
+    assert POI.objects.filter(name="Park").exists()
@@ -1,7 +1,15 @@
+import io
+import os
+import sys
+import threading
+from datetime import timedelta
+
 import pytest
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
+from django.utils import timezone
 
-from point_of_interest.models import POI
+from point_of_interest.enums import ImportStatus, SourceType
+from point_of_interest.models import POI, HistoricalImportData
 
 
 @pytest.mark.django_db
@@ -29,3 +37,182 @@ def test_import_poi_file_missing_file(tmp_path, capsys):
     call_command("import_poi_file", str(missing))
     captured = capsys.readouterr()
     assert "Failed processing" in captured.err or "Unexpected error" in captured.err
+
+
+@pytest.mark.django_db
+def test_import_poi_file_sync(tmp_path, capsys, poi_factory):
+    """Test that --sync removes PoIs missing from the imported files."""
+    poi_factory(external_id="OLD")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        'E1,Park,1.1,2.2,park,"4,5"\n'
+    )
+    call_command("import_poi_file", str(csv_path), "--sync")
+    captured = capsys.readouterr()
+    assert "deleted: 1" in captured.out
+    assert list(POI.objects.values_list("external_id", flat=True)) == ["E1"]
+
+
+@pytest.mark.django_db
+def test_run_import_worker_processes_pending_jobs(tmp_path, capsys):
+    """Test that the worker runs queued jobs and records their progress."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        'E1,Park,1.1,2.2,park,"4,5"\n'
+        "E2,Cafe,1.1,2.2,cafe,3\n"
+    )
+    job = HistoricalImportData.objects.create(
+        source=SourceType.CSV, filename="pois.csv", path=str(csv_path)
+    )
+    broken = HistoricalImportData.objects.create(
+        source=SourceType.CSV, filename="nope.csv", path=str(tmp_path / "nope.csv")
+    )
+    call_command("run_import_worker", "--once")
+    captured = capsys.readouterr()
+    assert "created: 2" in captured.out
+    assert "File not found" in captured.err
+
+    job.refresh_from_db()
+    assert job.status == ImportStatus.SUCCEEDED
+    assert job.rows_processed == 2
+    assert job.rows_total == 2
+    assert job.stats["created"] == 2
+    assert job.finished_at is not None
+    broken.refresh_from_db()
+    assert broken.status == ImportStatus.FAILED
+    assert "File not found" in broken.error
+    assert POI.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_run_import_worker_reclaims_stale_running_jobs(tmp_path, capsys):
+    """Test that jobs left running by a crashed worker are re-queued and run."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+    )
+    long_ago = timezone.now() - timedelta(hours=1)
+    abandoned = HistoricalImportData.objects.create(
+        source=SourceType.CSV,
+        filename="pois.csv",
+        path=str(csv_path),
+        status=ImportStatus.RUNNING,
+        started_at=long_ago,
+        heartbeat_at=long_ago,
+    )
+    alive = HistoricalImportData.objects.create(
+        source=SourceType.CSV,
+        filename="other.csv",
+        path=str(csv_path),
+        status=ImportStatus.RUNNING,
+        started_at=long_ago,
+        heartbeat_at=timezone.now(),
+    )
+    call_command("run_import_worker", "--once", "--stale-after", "600")
+    captured = capsys.readouterr()
+    assert "Re-queued 1 stale running job(s)" in captured.out
+
+    abandoned.refresh_from_db()
+    assert abandoned.status == ImportStatus.SUCCEEDED
+    assert abandoned.heartbeat_at > long_ago
+    alive.refresh_from_db()
+    assert alive.status == ImportStatus.RUNNING
+    assert POI.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_import_poi_file_full_reload_and_rollback(tmp_path, capsys, poi_factory):
+    """Test that --full-reload swaps the PoIs and rollback_full_reload restores them."""
+    poi_factory(external_id="OLD")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        'E1,Park,1.1,2.2,park,"4,5"\n'
+    )
+    call_command("import_poi_file", str(csv_path), "--full-reload")
+    captured = capsys.readouterr()
+    assert "created: 1" in captured.out
+    assert "deleted: 1" in captured.out
+    assert "rollback_full_reload" in captured.out
+    assert list(POI.objects.values_list("external_id", flat=True)) == ["E1"]
+
+    call_command("rollback_full_reload")
+    assert list(POI.objects.values_list("external_id", flat=True)) == ["OLD"]
+    call_command("rollback_full_reload", "--discard")
+    assert "Dropped" in capsys.readouterr().out
+
+    with pytest.raises(CommandError):
+        call_command("import_poi_file", str(csv_path), "--full-reload", "--sync")
+
+
+@pytest.mark.django_db
+def test_import_poi_file_max_errors(tmp_path, capsys):
+    """Test that --max-errors reports the rejected rows and validates its value."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+        "E2,Cafe,x,2.2,cafe,4\n"
+    )
+    call_command("import_poi_file", str(csv_path), "--max-errors", "1")
+    captured = capsys.readouterr()
+    assert "rejected: 1" in captured.out
+    assert (tmp_path / "pois.rejects.csv").exists()
+    with pytest.raises(CommandError):
+        call_command("import_poi_file", str(csv_path), "--max-errors", "-1")
+
+
+JSON_LINES = (
+    b'{"id": "J1", "name": "Park", "coordinates": [1.1, 2.2], "category": "park"}\n'
+    b'{"id": "J2", "name": "Cafe", "coordinates": "x", "category": "cafe"}\n'
+)
+
+
+@pytest.mark.django_db
+def test_import_poi_file_from_stdin(tmp_path, capsys, monkeypatch):
+    """Test that '-' streams stdin in the given format, rejects included."""
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(JSON_LINES)))
+    call_command(
+        "import_poi_file",
+        "-",
+        "--format",
+        "jsonl",
+        "--chunksize",
+        "1",
+        "--max-errors",
+        "1",
+        "--reject-dir",
+        str(tmp_path),
+    )
+    captured = capsys.readouterr()
+    assert "created: 1" in captured.out
+    assert "rejected: 1" in captured.out
+    assert list(POI.objects.values_list("external_id", flat=True)) == ["J1"]
+    assert (tmp_path / "stdin.rejects.jsonl").exists()
+    record = HistoricalImportData.objects.get()
+    assert (record.filename, record.rows_processed) == ("stdin.jsonl", 2)
+
+    with pytest.raises(CommandError, match="--format"):
+        call_command("import_poi_file", "-")
+    with pytest.raises(CommandError, match="once"):
+        call_command("import_poi_file", "-", "-", "--format", "csv")
+    with pytest.raises(CommandError, match="--dry-run"):
+        call_command("import_poi_file", "-", "--format", "csv", "--dry-run")
+
+
+@pytest.mark.django_db
+def test_import_poi_file_from_named_pipe(tmp_path, capsys):
+    """Test that a named pipe is read as a stream, in the format given."""
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+    writer = threading.Thread(
+        target=fifo.write_bytes, args=(JSON_LINES.splitlines(keepends=True)[0],)
+    )
+    writer.start()
+    call_command("import_poi_file", str(fifo), "--format", "jsonl")
+    writer.join()
+    assert "created: 1" in capsys.readouterr().out
+    assert POI.objects.get().name == "Park"
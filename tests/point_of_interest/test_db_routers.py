@@ -0,0 +1,124 @@
+import pytest
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+
+from core.db_routers import PIN_COOKIE_NAME, PrimaryReplicaRouter, replica_reads
+from point_of_interest.models import POI, Category
+from point_of_interest.services import ImportBuilder
+
+REPLICA = "replica"
+
+
+@pytest.fixture(scope="module")
+def replica_database(django_db_setup, django_db_blocker, tmp_path_factory):
+    """A second SQLite file with the tables of the models, registered as the
+    'replica' alias.
+
+    Replicas get the schema from the primary, so the migrations (data
+    migrations included) are not run on it. Nothing replicates into it, so the
+    rows a test creates there are only visible through reads routed to the
+    replica.
+    """
+    connections.settings[REPLICA] = {
+        **connections.settings["default"],
+        "NAME": str(tmp_path_factory.mktemp("replica") / "replica.sqlite3"),
+    }
+    with django_db_blocker.unblock():
+        with connections[REPLICA].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture
+def replica(replica_database, settings):
+    """Routes the reads to the replica, which holds a single 'Replica PoI'."""
+    settings.DATABASE_REPLICAS = [REPLICA]
+    category = Category.objects.using(REPLICA).create(name="replica")
+    POI.objects.using(REPLICA).bulk_create(
+        [
+            POI(
+                external_id="R1",
+                name="Replica PoI",
+                latitude=0,
+                longitude=0,
+                category=category,
+                ratings=[],
+            )
+        ]
+    )
+    cache.clear()
+    yield REPLICA
+    cache.clear()
+
+
+def test_router_reads_replica_only_inside_replica_reads(settings):
+    settings.DATABASE_REPLICAS = [REPLICA]
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(POI) is None
+    with replica_reads():
+        assert router.db_for_read(POI) == REPLICA
+        assert router.db_for_read(Category) == REPLICA
+        assert router.db_for_write(POI) == "default"
+        # Auth and sessions always stay on the primary.
+        from django.contrib.auth.models import User
+
+        assert router.db_for_read(User) is None
+    assert not router.allow_migrate(REPLICA, "point_of_interest")
+    assert router.allow_migrate("default", "point_of_interest")
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_poi_changelist_reads_replica(admin_client, replica, poi_factory):
+    """Test that the admin listing comes from the replica, writes from the primary."""
+    poi_factory(external_id="P1", name="Primary PoI")
+    response = admin_client.get(reverse("admin:point_of_interest_poi_changelist"))
+    assert response.status_code == 200
+    assert "Replica PoI" in response.content.decode()
+    assert "Primary PoI" not in response.content.decode()
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_api_reads_replica_until_pinned(client, replica, poi_factory, settings):
+    """Test that the API reads the replica, unless the client was pinned."""
+    settings.API_TOKENS = ["token"]
+    client.defaults["HTTP_AUTHORIZATION"] = "Bearer token"
+    poi_factory(external_id="P1", name="Primary PoI")
+    url = reverse("point_of_interest:poi-list")
+    names = [item["name"] for item in client.get(url).json()["results"]]
+    assert names == ["Replica PoI"]
+
+    cache.clear()
+    client.cookies[PIN_COOKIE_NAME] = "1"
+    names = [item["name"] for item in client.get(url).json()["results"]]
+    assert names == ["Primary PoI"]
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_unsafe_requests_pin_the_client(admin_client, replica, settings):
+    settings.DB_REPLICA_PIN_SECONDS = 5
+    url = reverse("admin:point_of_interest_category_add")
+    response = admin_client.post(url, {"name": "new"})
+    assert response.status_code == 302
+    assert response.cookies[PIN_COOKIE_NAME]["max-age"] == 5
+    response = admin_client.get(url)
+    assert PIN_COOKIE_NAME not in response.cookies
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_import_prefetch_reads_primary(tmp_path, replica):
+    """Test that the importer never mistakes replica rows for stored ones."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "R1,Park,1,2,park,4\n"
+    )
+    with replica_reads():
+        stats = ImportBuilder([csv_path]).run()
+    assert (stats.created, stats.updated) == (1, 0)
+    assert POI.objects.using("default").get(external_id="R1").name == "Park"
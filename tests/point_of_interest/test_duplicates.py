@@ -0,0 +1,130 @@
+import math
+import random
+from uuid import uuid4
+
+import pytest
+from django.core.management import call_command
+
+from point_of_interest.duplicates import (
+    METERS_PER_DEGREE,
+    DuplicateFinder,
+    find_duplicate_pois,
+    name_signature,
+)
+from point_of_interest.enums import DuplicateStatus
+from point_of_interest.models import DuplicateCandidate
+
+
+def _similarity(left, right):
+    a, b = name_signature(left), name_signature(right)
+    shared = sum(bin(x & y).count("1") for x, y in zip(a, b))
+    union = sum(bin(x | y).count("1") for x, y in zip(a, b))
+    return shared / union
+
+
+def _row(name, latitude, longitude):
+    return (uuid4(), str(uuid4().int)[:8], name, latitude, longitude)
+
+
+def _pairs(finder, rows):
+    rows = sorted(rows, key=lambda row: row[3])
+    return {frozenset((c.a[0], c.b[0])) for c in finder.scan(rows)}
+
+
+def test_name_signature_ignores_case_accents_and_punctuation():
+    assert _similarity("Café de l'Opéra", "CAFE DE L OPERA") == 1
+    assert _similarity("Central Station", "Central Stn") > 0.5
+    assert _similarity("Central Station", "Burger Palace") < 0.2
+
+
+def test_finder_matches_nearby_similar_names_across_cells():
+    meters = 1 / METERS_PER_DEGREE
+    base = _row("Central Station", 48.0, 2.0)
+    # 30 m north-east: in another cell, but within the radius.
+    near = _row("Central station", 48.0 + 20 * meters, 2.0 + 20 * meters / 0.67)
+    far = _row("Central Station", 48.0 + 200 * meters, 2.0)
+    other = _row("Burger Palace", 48.0, 2.0 + 5 * meters)
+
+    candidates = list(
+        DuplicateFinder(radius=50).scan(
+            sorted([base, near, far, other], key=lambda r: r[3])
+        )
+    )
+
+    assert len(candidates) == 1
+    assert {candidates[0].a[0], candidates[0].b[0]} == {base[0], near[0]}
+    assert 25 < candidates[0].distance < 35
+    assert candidates[0].name_similarity == 1
+    assert 0.5 < candidates[0].score < 1
+
+
+@pytest.mark.parametrize("latitude,longitude", [(10, 20), (-64, 170), (0, -179)])
+def test_finder_blocks_match_brute_force(latitude, longitude):
+    rng = random.Random(7)
+    names = ["Central Station", "Central Stn", "City Museum", "Museum of the City"]
+    rows = [
+        _row(
+            rng.choice(names),
+            latitude + rng.random() * 0.01,
+            longitude + rng.random() * 0.01,
+        )
+        for _ in range(300)
+    ]
+    expected = set()
+    for index, a in enumerate(rows):
+        for b in rows[index + 1 :]:
+            dy = (a[3] - b[3]) * METERS_PER_DEGREE
+            dx = (
+                (a[4] - b[4])
+                * METERS_PER_DEGREE
+                * math.cos(math.radians((a[3] + b[3]) / 2))
+            )
+            if math.hypot(dx, dy) <= 100 and _similarity(a[2], b[2]) >= 0.5:
+                expected.add(frozenset((a[0], b[0])))
+
+    assert expected
+    assert _pairs(DuplicateFinder(radius=100, chunk_size=10_000), rows) == expected
+    assert _pairs(DuplicateFinder(radius=100, chunk_size=7), rows) == expected
+
+
+@pytest.mark.django_db
+def test_find_duplicate_pois_keeps_reviewed_pairs(poi_factory):
+    first = poi_factory(
+        external_id="1", name="Central Station", latitude=1, longitude=1
+    )
+    second = poi_factory(
+        external_id="2", name="Central Station", latitude=1.0001, longitude=1
+    )
+    poi_factory(external_id="3", name="Central Station", latitude=2, longitude=2)
+
+    assert find_duplicate_pois(radius=50) == 1
+    pair = DuplicateCandidate.objects.get()
+    assert {pair.poi_a, pair.poi_b} == {first.pk, second.pk}
+    assert str(pair.poi_a) < str(pair.poi_b)
+    assert pair.status == DuplicateStatus.PENDING
+
+    pair.status = DuplicateStatus.DISMISSED
+    pair.save()
+    call_command("find_duplicate_pois", "--radius", "50")
+
+    assert DuplicateCandidate.objects.get().status == DuplicateStatus.DISMISSED
+
+
+@pytest.mark.django_db
+def test_duplicate_candidate_admin_review(admin_client, poi_factory):
+    poi_factory(external_id="1", name="City Museum", latitude=1, longitude=1)
+    poi_factory(external_id="2", name="City Museum", latitude=1, longitude=1.0001)
+    find_duplicate_pois()
+    pair = DuplicateCandidate.objects.get()
+
+    response = admin_client.get("/admin/point_of_interest/duplicatecandidate/")
+    assert response.status_code == 200
+    assert "City Museum" in response.content.decode()
+
+    response = admin_client.post(
+        "/admin/point_of_interest/duplicatecandidate/",
+        {"action": "confirm_duplicates", "_selected_action": [pair.pk]},
+    )
+    assert response.status_code == 302
+    pair.refresh_from_db()
+    assert pair.status == DuplicateStatus.CONFIRMED
@@ -0,0 +1,84 @@
+import pytest
+from django.core import serializers
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.forms import modelform_factory
+
+from point_of_interest.fields import Ratings, RatingsField
+from point_of_interest.models import POI
+
+
+class PostgresConnection:
+    vendor = "postgresql"
+
+
+def test_ratings_pack_hundredths_and_decode_lazily():
+    """Test that ratings are clamped, rounded and packed 2 bytes each."""
+    ratings = Ratings.from_values([4.5, "3", 7, -1, 2.349])
+
+    assert ratings.packed == bytes.fromhex("c2012c01f4010000eb00")
+    assert len(ratings) == 5
+    assert ratings._array is None
+    assert ratings == [4.5, 3.0, 5.0, 0.0, 2.35]
+    assert ratings[0] == 4.5 and ratings[1:3] == [3.0, 5.0]
+    assert list(ratings.array) == [450, 300, 500, 0, 235]
+    assert ratings == Ratings(ratings.packed)
+    assert repr(ratings) == "[4.5, 3.0, 5.0, 0.0, 2.35]"
+
+
+@pytest.mark.parametrize(
+    "value", ["[1, ", {"a": 1}, ["x"], [None], [float("inf")], [float("nan")]]
+)
+def test_ratings_field_rejects_invalid_values(value):
+    with pytest.raises(ValidationError):
+        RatingsField().to_python(value)
+
+
+def test_ratings_field_uses_smallint_array_on_postgres():
+    field = RatingsField()
+
+    assert field.db_type(PostgresConnection()) == "smallint[]"
+    assert field.get_db_prep_value([4.5, 1], PostgresConnection()) == [450, 100]
+    assert field.from_db_value([450, 100], None, PostgresConnection()) == [4.5, 1.0]
+
+
+@pytest.mark.django_db
+def test_ratings_are_stored_packed(poi_factory):
+    """Test that ratings round-trip through the database as a 2-byte-per-rating blob."""
+    poi = poi_factory(ratings=[4.5, 3])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT length(ratings) FROM point_of_interest WHERE id = %s",
+            [poi.pk.hex],
+        )
+        assert cursor.fetchone()[0] == 4
+    stored = POI.objects.get(pk=poi.pk)
+    assert isinstance(stored.ratings, Ratings)
+    assert stored.ratings == [4.5, 3.0]
+    assert stored.avg_rating == 3.75
+
+
+@pytest.mark.django_db
+def test_ratings_form_edits_json_list(poi_factory):
+    poi = POI.objects.get(pk=poi_factory(ratings=[4.5]).pk)
+    Form = modelform_factory(POI, fields=["ratings"])
+
+    assert "[4.5]" in str(Form(instance=poi)["ratings"])
+    form = Form({"ratings": "[1.5, 2]"}, instance=poi)
+    assert form.is_valid(), form.errors
+    form.save()
+    assert POI.objects.get(pk=poi.pk).ratings == [1.5, 2.0]
+
+
+@pytest.mark.django_db
+def test_ratings_serialize_as_json_text(poi_factory):
+    """Test that the serializers get a JSON string and read it back."""
+    poi = POI.objects.get(pk=poi_factory(ratings=[4.5, 3]).pk)
+    field = POI._meta.get_field("ratings")
+    assert field.value_to_string(poi) == "[4.5, 3.0]"
+
+    for format in ("json", "xml"):
+        data = serializers.serialize(format, [poi], fields=["ratings"])
+        restored = next(serializers.deserialize(format, data)).object
+        assert restored.ratings == [4.5, 3.0]
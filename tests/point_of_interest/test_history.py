@@ -0,0 +1,168 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from point_of_interest.admin import PointOfInterestAdmin
+from point_of_interest.history import poi_as_of, poi_version_before, poi_versions
+from point_of_interest.models import POI, HistoricalImportData, POIChange
+from point_of_interest.reload import rollback_full_reload
+from point_of_interest.services import ImportBuilder
+
+HEADER = "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+
+
+def write(tmp_path, name, rows):
+    path = tmp_path / name
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+    return path
+
+
+@pytest.mark.django_db
+def test_import_records_reverse_diffs_in_bulk(tmp_path):
+    """Test that an import records only the changed fields, with one insert."""
+    ImportBuilder(
+        [write(tmp_path, "v1.csv", ["E1,Park,1,2,park,4", "E2,Cafe,1,2,cafe,3"])]
+    ).run()
+    assert not POIChange.objects.exists()
+
+    second = write(tmp_path, "v2.csv", ["E1,Park,1,2,zoo,4|5", "E2,Cafe,1,2,cafe,3"])
+    with CaptureQueriesContext(connection) as queries:
+        ImportBuilder([second]).run()
+    inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "poi_change"')]
+    assert len(inserts) == 1
+
+    change = POIChange.objects.get()
+    park = POI.objects.get(external_id="E1")
+    assert change.poi_id == park.pk
+    assert set(change.diff) == {"category_id", "ratings"}
+    assert change.diff["ratings"] == [4.0]
+    assert change.import_run == HistoricalImportData.objects.get(filename="v2.csv")
+
+
+@pytest.mark.django_db
+def test_past_versions_are_rebuilt_from_reverse_diffs(tmp_path, poi_factory):
+    """Test that imports and single saves both feed the rebuilt versions."""
+    ImportBuilder([write(tmp_path, "v1.csv", ["E1,Park,1,2,park,4"])]).run()
+    first = POI.objects.get()
+    created = poi_as_of(first, first.updated_at)
+
+    ImportBuilder([write(tmp_path, "v2.csv", ["E1,Big park,1.5,2,park,4"])]).run()
+    poi = POI.objects.get()
+    poi.description = "Edited in the admin"
+    poi.save()
+
+    versions = poi_versions(POI.objects.get())
+    assert [set(change.diff) for change, _, _ in versions] == [
+        {"description"},
+        {"name", "latitude"},
+    ]
+    assert versions[0][1]["description"] == "Edited in the admin"
+    assert versions[-1][2] == created
+    assert created["name"] == "Park" and created["latitude"] == 1.0
+
+
+@pytest.mark.django_db
+def test_full_reload_records_changes(tmp_path):
+    """Test that a full reload adds the changed fields to the history too."""
+    ImportBuilder(
+        [write(tmp_path, "v1.csv", ["E1,Park,1,2,park,4", "E2,Cafe,1,2,cafe,3"])]
+    ).run()
+    ImportBuilder(
+        [write(tmp_path, "v2.csv", ["E1,Park,1,2,park,4|5", "E2,Bar,1,2,cafe,3"])],
+        full_reload=True,
+    ).run()
+    park = POIChange.objects.get(poi_id=POI.objects.get(external_id="E1").pk)
+    assert park.diff == {"ratings": [4.0]}
+    cafe = POIChange.objects.get(poi_id=POI.objects.get(external_id="E2").pk)
+    assert cafe.diff == {"name": "Cafe"}
+    assert cafe.import_run == HistoricalImportData.objects.get(filename="v2.csv")
+
+
+@pytest.mark.django_db
+def test_full_reload_history_outlives_rollback(tmp_path):
+    """Test that the history written before the cutover survives a rollback."""
+    ImportBuilder([write(tmp_path, "v1.csv", ["E1,Park,1,2,park,4"])]).run()
+    ImportBuilder(
+        [write(tmp_path, "v2.csv", ["E1,Garden,1,2,park,4"])], full_reload=True
+    ).run()
+    pk = POI.objects.get(external_id="E1").pk
+    assert list(POIChange.objects.values_list("poi_id", "diff")) == [
+        (pk, {"name": "Park"})
+    ]
+
+    rollback_full_reload()
+    assert POI.objects.get(pk=pk).name == "Park"
+    assert list(POIChange.objects.values_list("poi_id", "diff")) == [
+        (pk, {"name": "Park"})
+    ]
+
+
+@pytest.mark.django_db
+def test_admin_changes_view_shows_versions(tmp_path, admin_client):
+    """Test that the PoI changes page lists changes and rebuilds a version."""
+    ImportBuilder([write(tmp_path, "v1.csv", ["E1,Park,1,2,park,4"])]).run()
+    ImportBuilder([write(tmp_path, "v2.csv", ["E1,Zoo,1,2,zoo,4"])]).run()
+    poi = POI.objects.get()
+    change = POIChange.objects.get()
+    url = reverse("admin:point_of_interest_poi_changes", args=[poi.pk])
+
+    response = admin_client.get(url, {"version": change.pk})
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "park &rarr; zoo" in content
+    assert "Park &rarr; Zoo" in content
+    assert "Version before the change" in content
+
+
+@pytest.mark.django_db
+def test_admin_changes_view_is_paginated(admin_client, poi_factory, monkeypatch):
+    """Test that the changes page rebuilds one page, linked from the change form,
+    and that Django's history page still lists the admin log."""
+    poi = poi_factory(external_id="E1", name="v0")
+    for number in range(1, 6):
+        poi.name = f"v{number}"
+        poi.save()
+    url = reverse("admin:point_of_interest_poi_changes", args=[poi.pk])
+
+    change_form = admin_client.get(
+        reverse("admin:point_of_interest_poi_change", args=[poi.pk])
+    )
+    assert url in change_form.content.decode()
+    history = admin_client.get(
+        reverse("admin:point_of_interest_poi_history", args=[poi.pk])
+    )
+    assert history.status_code == 200
+    assert "Version before" not in history.content.decode()
+
+    monkeypatch.setattr(PointOfInterestAdmin, "changes_per_page", 2)
+    content = admin_client.get(url, {"p": 2}).content.decode()
+    assert "v2 &rarr; v3" in content and "v1 &rarr; v2" in content
+    assert "v3 &rarr; v4" not in content and "v0 &rarr; v1" not in content
+    assert "5 changes, page 2 of 3" in content
+
+
+@pytest.mark.django_db
+def test_admin_changes_view_redirects_missing_poi(admin_client):
+    """Test that the changes page of a deleted PoI redirects to the admin index."""
+    url = reverse(
+        "admin:point_of_interest_poi_changes",
+        args=["00000000-0000-4000-8000-000000000000"],
+    )
+    response = admin_client.get(url, follow=True)
+    assert response.redirect_chain == [(reverse("admin:index"), 302)]
+    assert "Perhaps it was deleted?" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_poi_versions_pages(poi_factory):
+    """Test that a page of versions matches the same slice of all of them."""
+    poi = poi_factory(external_id="E1", name="v0")
+    for number in range(1, 6):
+        poi.name = f"v{number}"
+        poi.save()
+    every = poi_versions(poi)
+    assert poi_versions(poi, skip=2, count=2) == every[2:4]
+    change = every[3][0]
+    assert poi_version_before(poi, change) == every[3][2]
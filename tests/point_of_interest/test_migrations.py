@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+BEFORE = [("point_of_interest", "0014_data_version")]
+UNIQUE = [("point_of_interest", "0015_unique_external_id")]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unique_external_id_migration_renames_older_duplicates(caplog):
+    """Test that the newest PoI keeps a duplicated external id, the others renamed."""
+    executor = MigrationExecutor(connection)
+    latest = executor.loader.graph.leaf_nodes("point_of_interest")
+    executor.migrate(BEFORE)
+    try:
+        state = executor.loader.project_state(BEFORE).apps
+        POI = state.get_model("point_of_interest", "POI")
+        category = state.get_model("point_of_interest", "Category").objects.create(
+            name="park"
+        )
+        now = timezone.now()
+        pks = {}
+        for name, external_id, age in [
+            ("Old", "E1", 2),
+            ("New", "E1", 1),
+            ("Single", "E2", 1),
+        ]:
+            poi = POI.objects.create(
+                external_id=external_id,
+                name=name,
+                latitude=0,
+                longitude=0,
+                category=category,
+            )
+            pks[name] = poi.pk
+            POI.objects.filter(pk=poi.pk).update(updated_at=now - timedelta(days=age))
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(UNIQUE)
+        POI = executor.loader.project_state(UNIQUE).apps.get_model(
+            "point_of_interest", "POI"
+        )
+        assert sorted(POI.objects.values_list("external_id", "name")) == [
+            ("E1", "New"),
+            (f"E1~{pks['Old']}", "Old"),
+            ("E2", "Single"),
+        ]
+        assert f"renamed to 'E1~{pks['Old']}'" in caplog.text
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(latest)
@@ -2,7 +2,7 @@ import uuid
 
 import pytest
 
-from point_of_interest.models import POI, HistoricalImportData, SourceType
+from point_of_interest.models import POI, Category, HistoricalImportData, SourceType
 
 
 @pytest.mark.parametrize(
@@ -45,11 +45,13 @@ def test_historical_import_creation(data, expected_source, expected_filename):
 @pytest.mark.django_db
 def test_poi_creation(poi_data, expected_category):
     """Unit poi instance test"""
-    poi = POI.objects.create(**poi_data)
+    category = Category.objects.create(name=poi_data["category"])
+    poi = POI.objects.create(**{**poi_data, "category": category})
     assert isinstance(poi.id, uuid.UUID)
     assert poi.external_id == poi_data["external_id"]
     assert poi.name == poi_data["name"]
-    assert poi.category == expected_category
+    assert poi.category.name == expected_category
+    assert str(poi.category) == expected_category
     assert poi.ratings == poi_data["ratings"]
     assert poi.description == poi_data["description"]
 
@@ -0,0 +1,145 @@
+import pytest
+
+from point_of_interest.enums import SourceType
+from point_of_interest.normalizers import (
+    RecordNormalizer,
+    get_normalizer,
+    parse_coordinates,
+    parse_ratings,
+)
+from point_of_interest.schemas import ImportData
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ([1, "2", 7, -1, "x"], [1.0, 2.0, 5.0, 0.0]),
+        ("4|3;5, 4.567", [4.0, 3.0, 5.0, 4.57]),
+        ("[1,2,3]", [1.0, 2.0, 3.0]),
+        ("[1,,2]", []),
+        (4, [4.0]),
+        ("", []),
+        (None, []),
+    ],
+)
+def test_parse_ratings(raw, expected):
+    """Test that parse_ratings supports every accepted ratings format."""
+    assert parse_ratings(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "coords, expected",
+    [
+        ([48.0, 16.2], (48.0, 16.2)),
+        ({"latitude": "48.0", "longitude": 16.2}, (48.0, 16.2)),
+    ],
+)
+def test_parse_coordinates(coords, expected):
+    """Test that parse_coordinates accepts list and object coordinates."""
+    assert parse_coordinates(coords) == expected
+
+
+@pytest.mark.parametrize("coords", [None, [1.0], ["x", 2.0], {"latitude": 1.0}])
+def test_parse_coordinates_invalid(coords):
+    """Test that parse_coordinates rejects invalid or incomplete coordinates."""
+    with pytest.raises(ValueError):
+        parse_coordinates(coords)
+
+
+@pytest.mark.parametrize(
+    "source, row",
+    [
+        (
+            SourceType.CSV,
+            {
+                "poi_id": 123,
+                "poi_name": " Park ",
+                "poi_latitude": "1.1",
+                "poi_longitude": 2.2,
+                "poi_category": "park",
+                "poi_ratings": "4,5",
+            },
+        ),
+        (
+            SourceType.JSON,
+            {
+                "id": "E1",
+                "name": "Cafe",
+                "coordinates": {"latitude": 1.1, "longitude": 2.2},
+                "category": "cafe",
+                "ratings": [4, 5],
+                "description": "Nice ",
+            },
+        ),
+        (
+            SourceType.XML,
+            {
+                "pid": "E2",
+                "pname": "Museum",
+                "platitude": "1.1",
+                "plongitude": "2.2",
+                "pcategory": "museum",
+                "pratings": "[3,4]",
+            },
+        ),
+    ],
+)
+def test_normalize_batch_matches_import_data(source, row):
+    """Test that the compiled normalizer gives the same output as ImportData."""
+    normalizer = RecordNormalizer(source)
+    assert normalizer.normalize_batch([row]) == [
+        ImportData.from_row(row, source).to_dict()
+    ]
+
+
+def test_normalize_batch_invalid_row():
+    """Test that invalid rows are re-raised as ValueError."""
+    normalizer = RecordNormalizer(SourceType.JSON)
+    with pytest.raises(ValueError) as exc:
+        normalizer.normalize_batch([{"id": "E1", "coordinates": None}])
+    assert "Error normalizing record" in str(exc.value)
+
+
+def test_normalizer_unknown_source():
+    """Test that an unknown source is rejected when building the normalizer."""
+    with pytest.raises(ValueError) as exc:
+        RecordNormalizer("yaml")
+    assert "Unknown source: yaml" in str(exc.value)
+
+
+def test_normalizer_columns_and_cache():
+    """Test the declared columns and that normalizers are shared per source."""
+    normalizer = get_normalizer(SourceType.JSON)
+    assert normalizer is get_normalizer("json")
+    assert normalizer.columns == (
+        "id",
+        "name",
+        "coordinates",
+        "category",
+        "ratings",
+        "description",
+    )
+
+
+def test_partition_batch_sets_invalid_rows_aside():
+    """Test that partition_batch keeps the valid rows and reports the invalid ones."""
+    normalizer = RecordNormalizer(SourceType.CSV)
+    row = {
+        "poi_id": "E1",
+        "poi_name": "Park",
+        "poi_latitude": 1.0,
+        "poi_longitude": 2.0,
+        "poi_category": "park",
+    }
+    records, errors = normalizer.partition_batch(
+        [
+            row,
+            {**row, "poi_latitude": "north"},
+            {**row, "poi_longitude": float("nan")},
+            {key: value for key, value in row.items() if key != "poi_name"},
+        ]
+    )
+    assert [record["external_id"] for record in records] == ["E1"]
+    assert [index for index, _ in errors] == [1, 2, 3]
+    assert "north" in errors[0][1]
+    assert errors[2][1] == "Missing field 'poi_name'"
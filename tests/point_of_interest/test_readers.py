@@ -0,0 +1,50 @@
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from point_of_interest import readers
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_read_csv_chunks_file_objects(monkeypatch, use_pyarrow):
+    """Test that read_csv reads file objects in chunks of the given columns."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pyarrow_csv", lambda: None)
+    content = io.BytesIO(b"id,value,extra\n0012,1.5,x\nNA,,y\nE3,2,z\n")
+    chunks = list(
+        readers.read_csv(content, ["id", "value"], {"id": str, "value": float}, 2)
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0][0] == {"id": "0012", "value": 1.5}
+    assert chunks[0][1]["id"] == "NA"
+
+
+def test_entry_points_do_not_import_pandas():
+    """Test that loading the commands and the WSGI app leaves pandas unloaded."""
+    code = (
+        "import sys, django\n"
+        "django.setup()\n"
+        "import core.wsgi\n"
+        "from django.core.management import get_commands, load_command_class\n"
+        "for name in ('import_poi_file', 'run_import_worker'):\n"
+        "    load_command_class(get_commands()[name], name)\n"
+        "print(sorted(m for m in ('pandas', 'numpy', 'pyarrow') if m in sys.modules))\n"
+    )
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
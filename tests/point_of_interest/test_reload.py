@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+
+from point_of_interest.bulk import SecondaryIndexes
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.models import POI, CategoryStats, MapCluster
+from point_of_interest.reload import (
+    PREVIOUS_TABLE,
+    ShadowTables,
+    discard_previous_tables,
+    rollback_full_reload,
+)
+from point_of_interest.services import ImportBuilder
+
+HEADER = "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+
+
+def external_ids():
+    return sorted(POI.objects.values_list("external_id", flat=True))
+
+
+def table_names():
+    return connection.introspection.table_names()
+
+
+@pytest.mark.django_db
+def test_full_reload_swaps_in_loaded_table(tmp_path, poi_factory):
+    """Test that a full reload replaces the PoIs, keeping ids of known ones."""
+    kept = poi_factory(external_id="E1", name="Old name", category="park")
+    poi_factory(external_id="OLD", category="park", ratings=[1])
+    first = tmp_path / "first.csv"
+    first.write_text(HEADER + "E1,Park,1,2,park,4\nE2,Cafe,1,2,cafe,3\n")
+    second = tmp_path / "second.csv"
+    second.write_text(HEADER + "E2,Cafe,1,2,cafe,5\n")
+
+    stats = ImportBuilder([first, second], full_reload=True).run()
+
+    assert (stats.created, stats.updated, stats.deleted) == (1, 1, 1)
+    assert stats.duplicates == 1
+    assert external_ids() == ["E1", "E2"]
+    reloaded = POI.objects.get(external_id="E1")
+    assert reloaded.pk == kept.pk
+    assert reloaded.created_at == kept.created_at
+    assert reloaded.name == "Park"
+    assert POI.objects.get(external_id="E2").ratings == [5.0]
+    assert dict(CategoryStats.objects.values_list("category__name", "rating_sum")) == {
+        "park": 4.0,
+        "cafe": 5.0,
+    }
+    assert SecondaryIndexes(POI).restore() == []
+    assert PREVIOUS_TABLE in table_names()
+    assert not [name for name in table_names() if "_reload_" in name]
+
+
+@pytest.mark.django_db
+def test_rollback_full_reload_trades_tables(tmp_path, poi_factory):
+    """Test that a rollback restores the replaced PoIs and can be undone."""
+    poi_factory(external_id="OLD")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(HEADER + "E1,Park,1,2,park,4\n")
+    ImportBuilder([csv_path], full_reload=True).run()
+
+    rollback_full_reload()
+    assert external_ids() == ["OLD"]
+    assert MapCluster.objects.filter(category=MapCluster.ALL_CATEGORIES).count()
+    assert list(CategoryStats.objects.values_list("poi_count", flat=True)) == [1]
+    rollback_full_reload()
+    assert external_ids() == ["E1"]
+
+    assert discard_previous_tables()
+    assert not discard_previous_tables()
+    with pytest.raises(ImportServiceError, match="no previous"):
+        rollback_full_reload()
+
+
+@pytest.mark.django_db
+def test_full_reload_validation_keeps_live_table(tmp_path, poi_factory):
+    """Test that a failed validation leaves the live table untouched."""
+    poi_factory(external_id="OLD")
+    empty = tmp_path / "empty.csv"
+    empty.write_text(HEADER)
+    with pytest.raises(ImportServiceError, match="no PoIs were loaded"):
+        ImportBuilder([empty], full_reload=True).run()
+
+    shadow = ShadowTables()
+    shadow.create()
+    try:
+        builder = ImportBuilder([])
+        rows = [
+            {
+                "external_id": "E1",
+                "name": "Park",
+                "latitude": 1.0,
+                "longitude": 2.0,
+                "category": "park",
+                "ratings": [],
+            }
+        ]
+        builder._resolve_categories(rows)
+        shadow.load(rows)
+        with pytest.raises(ImportServiceError, match="holds 1 PoIs, 2 expected"):
+            shadow.swap(expected=2)
+    finally:
+        shadow.drop()
+    assert external_ids() == ["OLD"]
+    assert shadow.poi._meta.db_table not in table_names()
@@ -0,0 +1,65 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from point_of_interest.bulk import SecondaryIndexes
+from point_of_interest.models import (
+    POI,
+    Category,
+    CategoryStats,
+    HistoricalImportData,
+    MapCluster,
+)
+from point_of_interest.seeding import category_names, seed_pois
+
+
+def test_category_names_number_the_repeated_categories():
+    """Test that more categories than the list get numbered names."""
+    names = category_names(40)
+    assert len(set(names)) == 40
+    assert names[0] == "restaurant"
+    assert names[-1].endswith(" 2")
+
+
+@pytest.mark.django_db
+def test_seed_pois_appends_numbered_pois(poi_factory):
+    """Test that seeded PoIs follow the stored ones, with indexes kept."""
+    poi_factory(external_id="1")
+    batches = []
+    assert seed_pois(5, categories=3, batch_size=2, on_batch=batches.append) == 5
+    assert batches == [2, 4, 5]
+    # Fewer PoIs than stored: the indexes are kept up to date instead.
+    assert seed_pois(2, categories=3, seed=1) == 2
+
+    external_ids = set(POI.objects.values_list("external_id", flat=True))
+    assert external_ids == {str(number) for number in range(1, 9)}
+    poi = POI.objects.get(external_id="2")
+    assert poi.category.name in category_names(3)
+    assert all(1 <= rating <= 5 for rating in poi.ratings)
+    assert -90 <= poi.latitude <= 90 and -180 <= poi.longitude <= 180
+    assert not SecondaryIndexes(POI).restore()
+
+
+@pytest.mark.django_db
+def test_seed_pois_command_seeds_history_and_summaries(capsys):
+    """Test that the command seeds PoIs, import records and the summary tables."""
+    call_command("seed_pois", "20", "--categories", "4", "--imports", "3")
+    captured = capsys.readouterr()
+    assert "PoIs created: 20" in captured.out
+    assert POI.objects.count() == 20
+    assert Category.objects.count() == 4
+    assert HistoricalImportData.objects.count() == 3
+    assert sum(CategoryStats.objects.values_list("poi_count", flat=True)) == 20
+    assert MapCluster.objects.exists()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA integrity_check")
+        assert cursor.fetchone()[0] == "ok"
+
+
+@pytest.mark.django_db
+def test_seed_pois_command_rejects_bad_options():
+    """Test that negative sizes are rejected."""
+    with pytest.raises(CommandError):
+        call_command("seed_pois", "-1")
+    with pytest.raises(CommandError):
+        call_command("seed_pois", "10", "--batch-size", "0")
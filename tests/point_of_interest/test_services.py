@@ -1,6 +1,23 @@
+import io
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from point_of_interest.services import ImportServiceError, ImportStats
+from point_of_interest import readers
+from point_of_interest.caching import get_data_version
+from point_of_interest.enums import ImportEventType, ImportStatus
+from point_of_interest.models import POI, Category, HistoricalImportData
+from point_of_interest.normalizers import RecordNormalizer
+from point_of_interest.schemas import ImportSource
+from point_of_interest.services import (
+    CategoryCache,
+    ImportBuilder,
+    ImportServiceError,
+    ImportStats,
+    import_records,
+)
 from tests.point_of_interest.conftest import DummyBuilder, ErrorBuilder
 
 
@@ -19,3 +36,412 @@ def test_import_builder_error():
     builder = ErrorBuilder(paths=[])
     with pytest.raises(ImportServiceError):
         builder.run()
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+@pytest.mark.django_db
+def test_import_builder_csv_preserves_ids(tmp_path, monkeypatch, use_pyarrow):
+    """Test that CSV ids are kept as written and unused columns are ignored."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pyarrow_csv", lambda: None)
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings,extra\n"
+        '0012,Park,1.1,2.2,park,"4,5",x\n'
+        "NA,Cafe,3.3,4.4,cafe,,y\n"
+    )
+    stats = ImportBuilder([csv_path], chunksize=1).run()
+    assert stats.created == 2
+    park = POI.objects.get(external_id="0012")
+    assert park.latitude == 1.1
+    assert park.ratings == [4.0, 5.0]
+    assert POI.objects.get(external_id="NA").ratings == []
+
+
+@pytest.mark.django_db
+def test_import_builder_json_lines_preserves_ids(tmp_path):
+    """Test that JSON Lines ids are not converted to numbers."""
+    json_path = tmp_path / "pois.json"
+    json_path.write_text(
+        '{"id": "0012", "name": "Park", "coordinates": [1.1, 2.2], '
+        '"category": "park", "ratings": [4], "extra": 1}\n'
+    )
+    stats = ImportBuilder([json_path]).run()
+    assert stats.created == 1
+    assert POI.objects.filter(external_id="0012").exists()
+
+
+@pytest.mark.django_db
+def test_import_builder_resolves_categories(tmp_path):
+    """Test that category names are stored once and shared by every PoI."""
+    Category.objects.create(name="park")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1,2,park,\n"
+        "E2,Cafe,1,2,cafe,\n"
+        "E3,Bar,1,2,cafe,\n"
+    )
+    ImportBuilder([csv_path], chunksize=2).run()
+    assert sorted(Category.objects.values_list("name", flat=True)) == ["cafe", "park"]
+    assert POI.objects.get(external_id="E1").category.name == "park"
+    assert POI.objects.filter(category__name="cafe").count() == 2
+
+
+@pytest.mark.django_db
+def test_category_cache_inserts_unseen_names_once():
+    """Test that known names are served from memory without queries."""
+    cache = CategoryCache()
+    ids = cache.resolve(["park", "cafe", "park"])
+    assert set(ids) == {"park", "cafe"}
+    with CaptureQueriesContext(connection) as queries:
+        assert cache.resolve(["cafe", "park"])["cafe"] == ids["cafe"]
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_import_builder_collapses_duplicates(tmp_path):
+    """Test that repeated external_ids keep the last row within and across chunks."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,First,1.1,2.2,park,4\n"
+        "E1,Second,1.1,2.2,park,4\n"
+        "E2,Other,1.1,2.2,park,4\n"
+        "E1,Third,1.1,2.2,park,4\n"
+    )
+    stats = ImportBuilder([csv_path], chunksize=3).run()
+    assert stats.duplicates == 2
+    assert stats.created == 2
+    assert stats.updated == 1
+    assert POI.objects.count() == 2
+    assert POI.objects.get(external_id="E1").name == "Third"
+
+
+@pytest.mark.django_db
+def test_import_builder_id_index_skips_lookup_for_new_rows(tmp_path, poi_factory):
+    """Test that the id index updates known rows and inserts new ones without a lookup."""
+    poi_factory(external_id="E1", name="Old")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,New,1.1,2.2,park,4\n"
+    )
+    builder = ImportBuilder([csv_path], use_id_index=True)
+    stats = builder.run()
+    assert (stats.created, stats.updated) == (0, 1)
+    assert POI.objects.get(external_id="E1").name == "New"
+
+    with CaptureQueriesContext(connection) as ctx:
+        builder._load_chunk(
+            [
+                {
+                    "poi_id": "E3",
+                    "poi_name": "Other",
+                    "poi_latitude": 1,
+                    "poi_longitude": 2,
+                    "poi_category": "park",
+                }
+            ],
+            RecordNormalizer("csv"),
+            ImportStats(),
+        )
+    assert not any('"external_id" IN' in q["sql"] for q in ctx.captured_queries)
+    assert "E3" in builder._id_index
+
+
+@pytest.mark.django_db
+def test_import_builder_sync_deletes_missing_pois(tmp_path, poi_factory):
+    """Test that sync mode deletes, in batches, the PoIs absent from every file."""
+    for external_id in ("E1", "S1", "S2", "S3"):
+        poi_factory(external_id=external_id)
+    first = tmp_path / "first.csv"
+    first.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+    )
+    second = tmp_path / "second.csv"
+    second.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E2,Cafe,1.1,2.2,cafe,4\n"
+    )
+    stats = ImportBuilder([first, second], batch_size=2, sync=True).run()
+    assert stats.deleted == 3
+    assert set(POI.objects.values_list("external_id", flat=True)) == {"E1", "E2"}
+
+
+@pytest.mark.django_db
+def test_import_builder_records_history(tmp_path):
+    """Test that every imported file gets a succeeded history record with its stats."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+    )
+    ImportBuilder([csv_path]).run()
+    record = HistoricalImportData.objects.get()
+    assert record.status == ImportStatus.SUCCEEDED
+    assert record.filename == "pois.csv"
+    assert record.rows_processed == 1
+    assert record.stats["created"] == 1
+
+
+@pytest.mark.parametrize("latitude", ["nan", "inf", ""])
+@pytest.mark.django_db
+def test_import_builder_fails_on_non_finite_coordinates(tmp_path, latitude):
+    """Test that without an error budget a non-finite coordinate fails the file."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+        f"E2,Cafe,{latitude},2.2,cafe,3\n"
+    )
+    with pytest.raises(ImportServiceError, match="Invalid data or format"):
+        ImportBuilder([csv_path]).run()
+    assert not POI.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_builder_marks_failed_history(tmp_path):
+    """Test that an invalid file leaves a failed history record."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text("poi_id,poi_name\nE1,Park\n")
+    with pytest.raises(ImportServiceError):
+        ImportBuilder([csv_path]).run()
+    record = HistoricalImportData.objects.get()
+    assert record.status == ImportStatus.FAILED
+    assert "Invalid data or format" in record.error
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+@pytest.mark.django_db
+def test_import_builder_fails_on_missing_required_column(
+    tmp_path, monkeypatch, use_pyarrow
+):
+    """Test that a CSV without a required column fails before writing any PoI."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pyarrow_csv", lambda: None)
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        '0012,1.1,2.2,park,"1,2"\n'
+    )
+    with pytest.raises(ImportServiceError, match="missing CSV columns poi_name"):
+        ImportBuilder([csv_path]).run()
+    assert not POI.objects.exists()
+    assert "poi_name" in HistoricalImportData.objects.get().error
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+@pytest.mark.django_db
+def test_import_builder_reads_missing_optional_columns_as_empty(
+    monkeypatch, use_pyarrow
+):
+    """Test that a CSV stream without ratings or description still imports."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pyarrow_csv", lambda: None)
+    data = io.BytesIO(
+        b"poi_id,poi_name,poi_latitude,poi_longitude,poi_category\n"
+        b"0012,Park,1.1,2.2,park\n"
+    )
+    assert import_records(data, "csv").created == 1
+    park = POI.objects.get(external_id="0012")
+    assert (park.name, park.ratings, park.description) == ("Park", [], "")
+
+
+@pytest.mark.django_db
+def test_import_builder_bumps_data_version_on_commit(
+    tmp_path, django_capture_on_commit_callbacks
+):
+    """Test that committed batches invalidate the cached API responses."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+    )
+    version = get_data_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        ImportBuilder([csv_path]).run()
+    assert get_data_version() != version
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+@pytest.mark.django_db
+def test_import_builder_rejects_invalid_rows(tmp_path, monkeypatch, use_pyarrow):
+    """Test that max_errors skips invalid rows into a CSV reject file."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pyarrow_csv", lambda: None)
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+        "E2,Cafe,north,2.2,cafe,4\n"
+        "E3,Museum,,2.2,museum,4\n"
+        "E4,Zoo,1.1,2.2,zoo,4\n"
+    )
+    stats = ImportBuilder([csv_path], chunksize=2, max_errors=2).run()
+    assert (stats.processed, stats.created, stats.rejected) == (4, 2, 2)
+    assert set(POI.objects.values_list("external_id", flat=True)) == {"E1", "E4"}
+
+    rejects = csv_path.with_name("pois.rejects.csv")
+    lines = rejects.read_text().splitlines()
+    assert lines[0] == (
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings,"
+        "poi_description,reject_file,reject_record,reject_reason"
+    )
+    assert lines[1].startswith("E2,Cafe,north,2.2,cafe,4,,pois.csv,2,")
+    assert lines[2].startswith("E3,")
+    record = HistoricalImportData.objects.get()
+    assert record.status == ImportStatus.SUCCEEDED
+    assert record.rows_rejected == 2
+    assert record.reject_path == str(rejects)
+
+
+@pytest.mark.django_db
+def test_import_builder_fails_past_error_budget(tmp_path):
+    """Test that the import fails once the rejected rows exceed the budget."""
+    first = tmp_path / "first.json"
+    first.write_text(
+        '{"id": "J1", "name": "Park", "coordinates": [1, 2], "category": "park"}\n'
+        '{"id": "J2", "name": "Cafe", "coordinates": [], "category": "cafe"}\n'
+    )
+    second = tmp_path / "second.json"
+    second.write_text(
+        '{"id": "J3", "name": "Zoo", "coordinates": "x", "category": "zoo"}\n'
+    )
+    with pytest.raises(ImportServiceError, match="Too many invalid rows: 2 of 3"):
+        ImportBuilder(
+            [first, second], max_errors="50%", reject_dir=tmp_path / "rejects"
+        ).run()
+    assert list(POI.objects.values_list("external_id", flat=True)) == ["J1"]
+    assert HistoricalImportData.objects.get(filename="second.json").status == (
+        ImportStatus.FAILED
+    )
+    reject = (tmp_path / "rejects" / "second.rejects.json").read_text()
+    assert '"_reject": {"file": "second.json", "record": 1' in reject
+
+
+@pytest.mark.django_db
+def test_import_builder_sync_keeps_rejected_pois(tmp_path, poi_factory):
+    """Test that sync mode does not delete the PoIs of rejected rows."""
+    poi_factory(external_id="X1")
+    xml_path = tmp_path / "pois.xml"
+    xml_path.write_text(
+        "<pois><poi><pid>X1</pid><pname>Park</pname><platitude>?</platitude>"
+        "<plongitude>2</plongitude><pcategory>park</pcategory><pratings/></poi>"
+        "</pois>"
+    )
+    stats = ImportBuilder([xml_path], sync=True, max_errors=1).run()
+    assert (stats.rejected, stats.deleted) == (1, 0)
+    assert POI.objects.filter(external_id="X1").exists()
+    reject = xml_path.with_name("pois.rejects.xml").read_text()
+    assert '<poi reject_file="pois.xml" reject_record="1"' in reject
+
+
+JSON_RECORDS = [
+    {"id": "E1", "name": "Park", "coordinates": [1.1, 2.2], "category": "park"},
+    {"id": "E2", "name": "Cafe", "coordinates": [3.3, 4.4], "category": "cafe"},
+    {"id": "E3", "name": "Shop", "coordinates": [5.5, 6.6], "category": "shop"},
+]
+
+
+@pytest.mark.django_db
+def test_import_records_streams_progress_events():
+    """Test that in-memory records are imported, yielding an event per batch."""
+    events = []
+    stats = import_records(
+        iter(JSON_RECORDS), "jsonl", name="feed", on_event=events.append, chunksize=2
+    )
+    assert stats.created == 3
+    assert [event.type for event in events] == [
+        ImportEventType.STARTED,
+        ImportEventType.BATCH,
+        ImportEventType.BATCH,
+        ImportEventType.FINISHED,
+        ImportEventType.COMPLETED,
+    ]
+    assert [event.stats.processed for event in events[1:3]] == [2, 3]
+    assert events[1].input == "feed.jsonl"
+    record = HistoricalImportData.objects.get(pk=events[0].import_id)
+    assert record.filename == "feed.jsonl"
+    assert record.status == ImportStatus.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_import_records_reads_file_objects():
+    """Test that a binary file object is read like a file of its format."""
+    data = io.BytesIO(
+        b"poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        b'E1,Park,1.1,2.2,park,"4,5"\n'
+    )
+    stats = import_records(data, "csv")
+    assert stats.created == 1
+    assert POI.objects.get(external_id="E1").ratings == [4.0, 5.0]
+
+
+@pytest.mark.django_db
+def test_import_records_reports_rejected_rows():
+    """Test that rows rejected within the error budget are reported by batch."""
+    records = [*JSON_RECORDS, {"id": "E4", "name": "Bad", "coordinates": "x"}]
+    events = []
+    stats = import_records(
+        records, "json", on_event=events.append, max_errors=1, chunksize=2
+    )
+    assert stats.created == 3 and stats.rejected == 1
+    batches = [event for event in events if event.type == ImportEventType.BATCH]
+    assert batches[0].errors == ()
+    assert [record for record, _ in batches[1].errors] == [4]
+
+
+@pytest.mark.django_db
+def test_import_records_can_be_cancelled():
+    """Test that a callback returning False stops the import after its batch."""
+    stats = import_records(
+        JSON_RECORDS,
+        "jsonl",
+        on_event=lambda event: event.type != ImportEventType.BATCH,
+        chunksize=1,
+    )
+    assert stats.processed == 1
+    assert POI.objects.count() == 1
+    record = HistoricalImportData.objects.get()
+    assert record.status == ImportStatus.FAILED
+    assert record.error == "Import cancelled"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_builder_async_events_consume_async_records():
+    """Test that aevents imports the records of an async generator."""
+
+    async def records():
+        for record in JSON_RECORDS:
+            yield record
+
+    async def consume():
+        builder = ImportBuilder([ImportSource(records(), "jsonl")], chunksize=2)
+        return [event async for event in builder.aevents()]
+
+    events = async_to_sync(consume)()
+    assert events[-1].type == ImportEventType.COMPLETED
+    assert events[-1].stats.created == 3
+    assert POI.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_import_records_consumes_async_records_from_sync_code():
+    """Test that every chunk of an async generator is read without a caller loop."""
+
+    async def records():
+        for record in JSON_RECORDS:
+            yield record
+
+    stats = import_records(records(), "jsonl", chunksize=1)
+    assert stats.created == 3
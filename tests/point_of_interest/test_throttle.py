@@ -0,0 +1,137 @@
+import time
+
+import pytest
+from django.db import connection
+
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.models import POI, HistoricalImportData
+from point_of_interest.schemas import ImportStats
+from point_of_interest.services import ImportBuilder
+from point_of_interest.throttle import WriteThrottle
+
+
+class SimulatedTime:
+    """Clock and sleep of a throttle, advancing only when asked to."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _throttle(simulated, **options):
+    return WriteThrottle(clock=simulated.clock, sleep=simulated.sleep, **options)
+
+
+def _write(throttle, stats, simulated, rows=1, latency=0.0):
+    with throttle.write(rows, stats):
+        simulated.now += latency
+
+
+def test_write_throttle_paces_rows_and_transactions():
+    """Test that writes are spread to stay within rows/s and transactions/s."""
+    simulated = SimulatedTime()
+    stats = ImportStats()
+    throttle = _throttle(simulated, max_rows_per_second=1000)
+    for _ in range(5):
+        _write(throttle, stats, simulated, rows=500)
+    assert simulated.sleeps == [0.5, 0.5, 0.5, 0.5]
+    assert stats.throttled_seconds == pytest.approx(2.0)
+
+    simulated.sleeps.clear()
+    throttle = _throttle(simulated, max_transactions_per_second=4)
+    for _ in range(3):
+        _write(throttle, stats, simulated, latency=0.05)
+    assert simulated.sleeps == [0.2, 0.2]
+    assert stats.backoffs == 0
+    assert not WriteThrottle().active
+
+
+def test_write_throttle_backs_off_on_slow_commits():
+    """Test that slow transactions double the pause and fast ones halve it."""
+    simulated = SimulatedTime()
+    stats = ImportStats()
+    throttle = _throttle(simulated, max_commit_latency=1.0, max_backoff=4)
+    for latency in (3, 3, 3, 3, 0.1, 0.1, 0.1, 0.1):
+        _write(throttle, stats, simulated, latency=latency)
+    assert simulated.sleeps == [0.5, 1.0, 2.0, 4.0, 2.0, 1.0, 0.5]
+    assert stats.backoffs == 4
+
+
+def test_write_throttle_waits_for_the_health_probe():
+    """Test that writes pause while the probe is over the threshold."""
+    simulated = SimulatedTime()
+    stats = ImportStats()
+    lags = iter([12.0, 8.0, 0.5, 20.0])
+    throttle = _throttle(
+        simulated, max_lag=5, health_probe=lambda: next(lags), probe_interval=60
+    )
+    _write(throttle, stats, simulated)
+    assert simulated.sleeps == [0.5, 1.0]
+    assert stats.backoffs == 2
+    # Healthy again: the next write recovers and the probe is not due yet.
+    _write(throttle, stats, simulated)
+    assert stats.backoffs == 2
+    assert next(lags) == 20.0
+
+
+def test_write_throttle_gives_up_on_a_lagging_replica():
+    """Test that an import fails once the probe held it back too long."""
+    simulated = SimulatedTime()
+    stats = ImportStats()
+    throttle = _throttle(
+        simulated, max_lag=5, max_health_wait=10, health_probe=lambda: 30.0
+    )
+    with pytest.raises(ImportServiceError, match="overloaded for 16 s"):
+        _write(throttle, stats, simulated)
+    assert simulated.sleeps == [0.5, 1.0, 2.0, 4.0, 8.0]
+    assert stats.backoffs == 5
+
+
+def test_write_throttle_from_settings(settings):
+    """Test that the settings give the defaults and options override them."""
+    settings.IMPORT_MAX_ROWS_PER_SECOND = 100
+    settings.IMPORT_MAX_REPLICA_LAG = 5
+    settings.IMPORT_HEALTH_PROBE = "point_of_interest.throttle.replica_lag"
+    throttle = WriteThrottle.from_settings(max_rows_per_second=None, max_lag=0)
+    assert throttle.max_rows_per_second == 100
+    assert throttle.max_health_wait == 600
+    assert throttle.health_probe is None
+    assert throttle.active
+
+
+@pytest.mark.django_db
+def test_import_builder_throttles_a_slow_database(tmp_path):
+    """Test that imports back off on a database with slow writes, per batch."""
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_ratings\n"
+        "E1,Park,1.1,2.2,park,4\n"
+        "E2,Cafe,1.1,2.2,cafe,4\n"
+        "E3,Shop,1.1,2.2,shop,4\n"
+    )
+    inserts = []
+
+    def slow_backend(execute, sql, params, many, context):
+        if sql.startswith('INSERT INTO "point_of_interest"'):
+            inserts.append(sql)
+            time.sleep(0.02)
+        return execute(sql, params, many, context)
+
+    sleeps = []
+    throttle = WriteThrottle(max_commit_latency=0.01, sleep=sleeps.append)
+    with connection.execute_wrapper(slow_backend):
+        stats = ImportBuilder([csv_path], batch_size=1, throttle=throttle).run()
+
+    assert POI.objects.count() == 3
+    assert len(inserts) == 3
+    assert stats.backoffs == 3
+    assert len(sleeps) == 2 and stats.throttled_seconds > 0
+    record = HistoricalImportData.objects.get()
+    assert record.stats["backoffs"] == 3
@@ -1,11 +1,16 @@
+import os
 import uuid
+from pathlib import Path
 
 import pytest
 
 import point_of_interest.utils as utils
 from point_of_interest.enums import SourceType
 from point_of_interest.utils import (
+    STDIN,
     batched,
+    estimate_rows,
+    is_stream,
     iter_xml_dicts,
     normalize_record,
     source_from_path,
@@ -51,6 +56,41 @@ def test_source_from_path_unsupported_extension(tmp_path):
     assert "Unsupported file extension" in str(exc.value)
 
 
+@pytest.mark.parametrize(
+    "fname, input_format, expected",
+    [
+        ("feed", "csv", SourceType.CSV),
+        ("feed.csv", "jsonl", SourceType.JSON),
+        ("feed.jsonl", None, SourceType.JSON),
+        (STDIN, "xml", SourceType.XML),
+    ],
+)
+def test_source_from_path_input_format(fname, input_format, expected):
+    """Test that an explicit input format overrides the suffix of the path."""
+    assert source_from_path(Path(fname), input_format) == expected
+
+
+def test_source_from_path_stdin_needs_a_format():
+    """Test that stdin or an unknown input format is rejected."""
+    with pytest.raises(ValueError, match="required"):
+        source_from_path(Path(STDIN))
+    with pytest.raises(ValueError, match="Unsupported input format"):
+        source_from_path(Path("feed.csv"), "parquet")
+
+
+def test_is_stream(tmp_path):
+    """Test that stdin and named pipes are streams, regular and missing files are not."""
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+    regular = tmp_path / "feed.csv"
+    regular.write_text("", encoding="utf-8")
+    assert is_stream(Path(STDIN))
+    assert is_stream(fifo)
+    assert not is_stream(regular)
+    assert not is_stream(tmp_path / "missing.csv")
+    assert estimate_rows(fifo, SourceType.CSV) is None
+
+
 def test_normalize_record_success(monkeypatch):
     """Test that normalize_record successfully uses ImportData.from_row and to_dict."""
     monkeypatch.setattr(utils, "ImportData", DummyImportData, raising=True)
@@ -97,6 +137,8 @@ def test_iter_xml_dicts_yields_required_nodes(tmp_path):
     assert len(items) == 2
     assert items[0]["pid"] == "E1"
     assert items[0]["pname"] == "Cafe"
+    with xmlp.open("rb") as handle:
+        assert list(iter_xml_dicts(handle)) == items
     assert set(items[0].keys()) == {
         "pid",
         "pname",
@@ -118,3 +160,20 @@ def test_iter_xml_dicts_yields_required_nodes(tmp_path):
 def test_batched(data, size, expected):
     """Test that batched yields correct slices of the input sequence."""
     assert [list(chunk) for chunk in batched(data, size)] == expected
+
+
+@pytest.mark.parametrize(
+    "fname, content, source, expected",
+    [
+        ("a.csv", "poi_id\nE1\nE2\n", SourceType.CSV, 2),
+        ("a.json", '{"id": 1}\n{"id": 2}\n', SourceType.JSON, 2),
+        ("b.json", '[\n{"id": 1}\n]\n', SourceType.JSON, None),
+        ("a.xml", "<pois></pois>", SourceType.XML, None),
+    ],
+)
+def test_estimate_rows(tmp_path, fname, content, source, expected):
+    """Test that estimate_rows counts data lines only for line-based formats."""
+    p = tmp_path / fname
+    p.write_text(content, encoding="utf-8")
+    assert estimate_rows(p, source) == expected
+    assert estimate_rows(tmp_path / "missing.csv", SourceType.CSV) is None
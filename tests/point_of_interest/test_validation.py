@@ -0,0 +1,102 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+import point_of_interest.validation as validation
+from point_of_interest.enums import SourceType
+from point_of_interest.exceptions import ImportServiceError
+from point_of_interest.models import POI, HistoricalImportData
+from point_of_interest.validation import FeedValidator, split_file
+
+HEADER = "poi_id,poi_name,poi_latitude,poi_longitude,poi_category,poi_description\n"
+
+
+def test_split_file_never_cuts_quoted_line_breaks(tmp_path, monkeypatch):
+    """Test that CSV segments only end outside quoted values."""
+    monkeypatch.setattr(validation, "SEGMENT_BYTES", 16)
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        HEADER
+        + 'E1,Park,1,2,park,"first line\nsecond ""line""\nthird"\n'
+        + "E2,Cafe,1,2,cafe,\n"
+        + 'E3,Zoo,1,2,zoo,"a\nb"\n'
+    )
+    segments = split_file(csv_path, SourceType.CSV)
+    assert len(segments) == 3
+    results = [validation.validate_segment(segment) for segment in segments]
+    assert [result.external_ids for result in results] == [["E1"], ["E2"], ["E3"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_feed_validator_reports_without_database(tmp_path, monkeypatch, workers):
+    """Test the report of invalid rows, duplicates and expected creates/updates."""
+    monkeypatch.setattr(validation, "SEGMENT_BYTES", 32)
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(
+        HEADER
+        + "E1,Park,1,2,park,\n"
+        + "E2,Cafe,north,2,cafe,\n"
+        + "E1,Park again,1,2,park,\n"
+        + "E3,Zoo,1,2,zoo,\n"
+    )
+    json_path = tmp_path / "pois.json"
+    json_path.write_text(
+        '{"id": "E3", "name": "Zoo", "coordinates": [1, 2], "category": "zoo"}\n'
+        "{not json}\n"
+        '{"id": "J1", "name": "Cafe", "coordinates": [1, 2], "category": "cafe"}\n'
+    )
+    known_ids = {"E1"}
+    report = FeedValidator([csv_path, json_path], workers=workers).run(known_ids)
+    assert known_ids == {"E1"}
+    assert (report.files, report.rows, report.valid, report.invalid) == (2, 7, 5, 2)
+    assert report.duplicates == 1
+    assert report.duplicate_ids == [("pois.csv", "E1")]
+    # E1 is stored, E3 is created by the CSV file and updated by the JSON one.
+    assert (report.to_create, report.to_update) == (2, 2)
+    assert [(name, record) for name, record, _ in report.errors] == [
+        ("pois.csv", 2),
+        ("pois.json", 2),
+    ]
+    assert report.errors[1][2].startswith("Invalid JSON")
+
+
+@pytest.mark.parametrize("missing", ["poi_name", "poi_latitude"])
+def test_feed_validator_rejects_missing_required_column(tmp_path, missing):
+    """Test that a CSV file without a required column fails the validation."""
+    columns = HEADER.strip().split(",")
+    values = ["E1", "Park", "1", "2", "park", ""]
+    index = columns.index(missing)
+    del columns[index], values[index]
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(",".join(columns) + "\n" + ",".join(values) + "\n")
+    with pytest.raises(ImportServiceError, match=missing):
+        FeedValidator([csv_path], workers=1).run()
+
+
+@pytest.mark.django_db
+def test_import_poi_file_dry_run(tmp_path, capsys, poi_factory):
+    """Test that --dry-run reports the outcome without writing anything."""
+    poi_factory(external_id="E1")
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text(HEADER + "E1,Park,1,2,park,\nE2,Cafe,x,2,cafe,\n")
+    with pytest.raises(CommandError, match="Validation failed: 1 invalid rows"):
+        call_command("import_poi_file", str(csv_path), "--dry-run", "--workers", "1")
+    captured = capsys.readouterr()
+    assert "rows: 2 | valid: 1 | invalid: 1" in captured.out
+    assert "Would create: 0 | would update: 1" in captured.out
+    assert POI.objects.count() == 1
+    assert not HistoricalImportData.objects.exists()
+
+    call_command("import_poi_file", str(csv_path), "--dry-run", "--max-errors", "50%")
+    assert "Validation passed" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_import_poi_file_dry_run_read_error(tmp_path):
+    """Test that a file the dry run cannot read fails the command."""
+    with pytest.raises(CommandError, match="Failed validating the files"):
+        call_command("import_poi_file", str(tmp_path / "missing.csv"), "--dry-run")
+
+    csv_path = tmp_path / "pois.csv"
+    csv_path.write_text("poi_id,poi_latitude,poi_longitude,poi_category\n")
+    with pytest.raises(CommandError, match="missing CSV columns poi_name"):
+        call_command("import_poi_file", str(csv_path), "--dry-run")
@@ -0,0 +1,190 @@
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from point_of_interest.caching import bump_data_version, get_data_version
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(client, create_user):
+    """The API requires a logged-in user (or a token)."""
+    client.force_login(create_user)
+    return client
+
+
+@pytest.mark.parametrize(
+    "name, args",
+    [("poi-list", []), ("poi-detail", ["E1"]), ("cluster-list", [])],
+)
+@pytest.mark.django_db
+def test_api_requires_authentication(settings, name, args):
+    """Test that anonymous requests without a valid token get a 401."""
+    settings.API_TOKENS = ["secret"]
+    anonymous = Client()
+    url = reverse(f"point_of_interest:{name}", args=args)
+    response = anonymous.get(url)
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"].startswith("Bearer")
+    assert anonymous.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+
+
+@pytest.mark.django_db
+def test_api_accepts_tokens_and_public_setting(settings, poi_factory):
+    """Test that a bearer token, or API_PUBLIC, lets anonymous clients in."""
+    poi_factory(external_id="E1")
+    settings.API_TOKENS = ["first", "second"]
+    anonymous = Client()
+    url = reverse("point_of_interest:poi-detail", args=["E1"])
+    response = anonymous.get(url, HTTP_AUTHORIZATION="Bearer second")
+    assert response.status_code == 200
+    assert response.json()["external_id"] == "E1"
+
+    settings.API_TOKENS = []
+    assert anonymous.get(url, HTTP_AUTHORIZATION="Bearer ").status_code == 401
+    settings.API_PUBLIC = True
+    assert anonymous.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_poi_list_filters_and_paginates(client, poi_factory):
+    """Test category/bbox filters and that the cursor walks every page once."""
+    for i in range(5):
+        poi_factory(external_id=f"P{i}", category="park", latitude=i, longitude=i)
+    poi_factory(external_id="C1", category="cafe", latitude=1, longitude=1)
+    url = reverse("point_of_interest:poi-list")
+
+    seen = []
+    params = {"category": "park", "bbox": "0,0,3,3", "limit": 2}
+    while True:
+        response = client.get(url, params)
+        assert response.status_code == 200
+        payload = response.json()
+        seen += [item["external_id"] for item in payload["results"]]
+        if payload["next_cursor"] is None:
+            break
+        params["cursor"] = payload["next_cursor"]
+    assert sorted(seen) == ["P0", "P1", "P2", "P3"]
+
+
+@pytest.mark.parametrize(
+    "params", [{"limit": "0"}, {"bbox": "1,2"}, {"cursor": "not-a-cursor"}]
+)
+@pytest.mark.django_db
+def test_poi_list_invalid_params(client, params):
+    response = client.get(reverse("point_of_interest:poi-list"), params)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_poi_detail_by_uuid_and_external_id(client, create_poi_instance):
+    for lookup in (create_poi_instance.pk, create_poi_instance.external_id):
+        url = reverse("point_of_interest:poi-detail", args=[lookup])
+        payload = client.get(url).json()
+        assert payload["id"] == str(create_poi_instance.pk)
+        assert payload["avg_rating"] == create_poi_instance.avg_rating
+    missing = reverse("point_of_interest:poi-detail", args=["unknown"])
+    assert client.get(missing).status_code == 404
+
+
+@pytest.mark.django_db
+def test_poi_detail_conditional_get(client, create_poi_instance):
+    """Test that the detail ETag follows updated_at."""
+    url = reverse("point_of_interest:poi-detail", args=[create_poi_instance.pk])
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    create_poi_instance.name = "Renamed"
+    create_poi_instance.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_poi_list_cached_until_data_version_changes(client, poi_factory):
+    """Test that list responses are served from cache until an import bumps the version."""
+    poi_factory(external_id="E1")
+    url = reverse("point_of_interest:poi-list")
+    first = client.get(url)
+    etag = first["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    poi_factory(external_id="E2")
+    assert len(client.get(url).json()["results"]) == 1
+
+    bump_data_version()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_poi_list_etag_follows_committed_data(
+    client, poi_factory, django_capture_on_commit_callbacks
+):
+    """Test that the list ETag survives the cache and changes with the data."""
+    url = reverse("point_of_interest:poi-list")
+    etag = client.get(url)["ETag"]
+    # Another process, or an expired cache, sees the same version.
+    cache.clear()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    version = get_data_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        poi_factory(external_id="E1")
+    assert get_data_version() != version
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_cluster_list_viewport(client, poi_factory):
+    """Test that clusters are served from the aggregates for the viewport."""
+    poi_factory(external_id="V1", category="park", latitude=48.20, longitude=16.37)
+    poi_factory(external_id="V2", category="cafe", latitude=48.21, longitude=16.38)
+    poi_factory(external_id="B1", category="park", latitude=52.52, longitude=13.40)
+    url = reverse("point_of_interest:cluster-list")
+
+    payload = client.get(url, {"zoom": 5, "bbox": "15,47,18,49"}).json()
+    assert payload["zoom"] == 4
+    assert [c["count"] for c in payload["clusters"]] == [2]
+    assert payload["clusters"][0]["latitude"] == pytest.approx(48.205)
+
+    params = {"zoom": 12, "bbox": "10,45,20,55", "category": "park"}
+    payload = client.get(url, params).json()
+    assert sorted(c["count"] for c in payload["clusters"]) == [1, 1]
+
+    params["category"] = "unknown"
+    assert client.get(url, params).json()["clusters"] == []
+
+
+@pytest.mark.django_db
+def test_cluster_list_across_antimeridian(client, poi_factory):
+    poi_factory(external_id="F1", latitude=-17.7, longitude=178.0)
+    poi_factory(external_id="S1", latitude=-13.8, longitude=-171.7)
+    poi_factory(external_id="G1", latitude=0.0, longitude=0.0)
+    url = reverse("point_of_interest:cluster-list")
+    payload = client.get(url, {"zoom": 2, "bbox": "170,-20,-170,-10"}).json()
+    assert sum(c["count"] for c in payload["clusters"]) == 2
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"bbox": "0,0,1,1"},
+        {"zoom": "-1", "bbox": "0,0,1,1"},
+        {"zoom": 4},
+        {"zoom": 4, "bbox": "0,1,1,0"},
+    ],
+)
+@pytest.mark.django_db
+def test_cluster_list_invalid_params(client, params):
+    response = client.get(reverse("point_of_interest:cluster-list"), params)
+    assert response.status_code == 400